@@ -1,23 +1,80 @@
-"""Python practice modules for the Learning 2025 curriculum."""
-
-from .dataset_summary import compute_numeric_summary, load_csv
-from .solid_design_principles import (
-    DiscountStrategy,
-    EmailNotifier,
-    FakeGateway,
-    NoDiscount,
-    Notifier,
-    OrderLine,
-    PaymentGateway,
-    PaymentService,
-    PercentageDiscount,
-    SMSNotifier,
-    calculate_order_total,
-)
+"""Python practice modules for the Learning 2025 curriculum.
+
+The names below are imported from their modules on first access, so
+``import python`` (and every ``python -m python.<module>`` command) stays
+cheap however much of the package a caller ends up using.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+# Type checkers treat this constant like ``typing.TYPE_CHECKING``; importing
+# ``typing`` itself would cost more than the rest of this module.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover - for type checkers and IDEs only
+    from typing import Any, List
+
+    from .columnar import ColumnarTable, load_columnar
+    from .columnar_file import convert_csv, load_columnar_file
+    from .dataset_summary import compute_numeric_summary, load_csv, summarise_categorical
+    from .grouping import summarise_grouped
+    from .multi_file import summarise_files
+    from .schema import Schema, infer_schema
+    from .streaming import NumericAccumulator
+    from .solid_design_principles import (
+        DiscountStrategy,
+        EmailNotifier,
+        FakeGateway,
+        NoDiscount,
+        Notifier,
+        OrderLine,
+        PaymentGateway,
+        PaymentService,
+        PercentageDiscount,
+        SMSNotifier,
+        calculate_order_total,
+    )
+
+_EXPORTS = {
+    "ColumnarTable": "columnar",
+    "load_columnar": "columnar",
+    "convert_csv": "columnar_file",
+    "load_columnar_file": "columnar_file",
+    "compute_numeric_summary": "dataset_summary",
+    "load_csv": "dataset_summary",
+    "summarise_categorical": "dataset_summary",
+    "summarise_grouped": "grouping",
+    "summarise_files": "multi_file",
+    "Schema": "schema",
+    "infer_schema": "schema",
+    "NumericAccumulator": "streaming",
+    "DiscountStrategy": "solid_design_principles",
+    "EmailNotifier": "solid_design_principles",
+    "FakeGateway": "solid_design_principles",
+    "NoDiscount": "solid_design_principles",
+    "Notifier": "solid_design_principles",
+    "OrderLine": "solid_design_principles",
+    "PaymentGateway": "solid_design_principles",
+    "PaymentService": "solid_design_principles",
+    "PercentageDiscount": "solid_design_principles",
+    "SMSNotifier": "solid_design_principles",
+    "calculate_order_total": "solid_design_principles",
+}
 
 __all__ = [
+    "ColumnarTable",
     "compute_numeric_summary",
+    "convert_csv",
+    "load_columnar",
+    "load_columnar_file",
     "load_csv",
+    "NumericAccumulator",
+    "Schema",
+    "infer_schema",
+    "summarise_categorical",
+    "summarise_grouped",
+    "summarise_files",
     "DiscountStrategy",
     "EmailNotifier",
     "FakeGateway",
@@ -30,3 +87,16 @@ __all__ = [
     "SMSNotifier",
     "calculate_order_total",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip this function
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
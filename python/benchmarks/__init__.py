@@ -0,0 +1 @@
+"""Throughput benchmarks for the dataset summary helpers."""
@@ -0,0 +1,167 @@
+"""Import-time benchmark for the package and the CLI's start-up path.
+
+Every CLI call pays for its imports before doing any work.  This benchmark
+imports each target module in a fresh interpreter under
+``python -X importtime``, parses the per-module timings CPython prints to
+stderr and reports the cumulative time of every target together with its
+most expensive imports::
+
+    python -m python.benchmarks.bench_imports --output imports.json \\
+        --max-ms 40 --baseline baseline.json
+
+The command exits with status 1 when a target takes longer than
+``--max-ms``, imports a module listed with ``--forbid`` (by default NumPy,
+which only the NumPy backend should load), or is more than
+``--tolerance`` slower than the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+TARGETS = ("python", "python.cli", "python.client")
+DEFAULT_MAX_MS = 60.0
+DEFAULT_FORBIDDEN = ("numpy",)
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEAT = 5
+DEFAULT_TOP = 10
+
+_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One line of ``-X importtime`` output; times are in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> List[ImportRecord]:
+    """Parse the ``import time: self | cumulative | name`` lines of ``text``."""
+
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        records.append(ImportRecord(stripped, int(fields[0]), int(fields[1]), (len(name) - len(stripped) - 1) // 2))
+    return records
+
+
+def _import_once(module: str) -> List[ImportRecord]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def measure(module: str, repeat: int = DEFAULT_REPEAT, top: int = DEFAULT_TOP) -> Dict[str, object]:
+    """Import ``module`` ``repeat`` times in new interpreters and keep the fastest run."""
+
+    _import_once(module)  # make sure bytecode caches are written
+    runs = [_import_once(module) for _ in range(repeat)]
+    best = min(runs, key=lambda records: records[-1].cumulative_us)
+    slowest = sorted(best, key=lambda record: record.self_us, reverse=True)[:top]
+    return {
+        "module": module,
+        "cumulative_ms": best[-1].cumulative_us / 1000,
+        "modules": sorted({record.module for record in best}),
+        "slowest": [{"module": record.module, "self_ms": record.self_us / 1000} for record in slowest],
+    }
+
+
+def check(
+    results: Sequence[Dict[str, object]],
+    max_ms: Optional[float] = DEFAULT_MAX_MS,
+    forbidden: Sequence[str] = DEFAULT_FORBIDDEN,
+) -> List[str]:
+    """Describe every target over ``max_ms`` or importing a ``forbidden`` module (or package)."""
+
+    problems = []
+    for entry in results:
+        if max_ms is not None and entry["cumulative_ms"] > max_ms:
+            problems.append(f"{entry['module']}: {entry['cumulative_ms']:.1f} ms exceeds the {max_ms:g} ms limit")
+        for name in forbidden:
+            if any(module == name or module.startswith(name + ".") for module in entry["modules"]):
+                problems.append(f"{entry['module']}: imports {name}")
+    return problems
+
+
+def compare(results: Sequence[Dict[str, object]], baseline: Sequence[Dict[str, object]], tolerance: float) -> List[str]:
+    """Describe every target whose import time grew beyond ``tolerance``."""
+
+    reference = {entry["module"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        previous = reference.get(entry["module"])
+        if not previous or not previous.get("cumulative_ms"):
+            continue
+        ratio = entry["cumulative_ms"] / previous["cumulative_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{entry['module']}: {entry['cumulative_ms']:.1f} ms vs baseline "
+                f"{previous['cumulative_ms']:.1f} ms ({(ratio - 1) * 100:.1f}% slower)"
+            )
+    return regressions
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the package and CLI")
+    parser.add_argument("--modules", nargs="+", default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Imports per module; the fastest is kept.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Slowest imports listed per module.")
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS, help="Fail above this cumulative time.")
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBIDDEN), help="Fail when these are imported.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against results stored earlier.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    results = []
+    for module in args.modules:
+        result = measure(module, args.repeat, args.top)
+        results.append(result)
+        slowest = ", ".join(f"{entry['module']} {entry['self_ms']:.1f}" for entry in result["slowest"][:3])
+        print(
+            f"{module:<24} {result['cumulative_ms']:8.1f} ms  {len(result['modules']):>4} modules  slowest: {slowest}",
+            file=sys.stderr,
+        )
+
+    report = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+
+    problems = check(results, args.max_ms, args.forbid)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        problems += compare(results, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entry point
+    sys.exit(main())
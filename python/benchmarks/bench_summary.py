@@ -0,0 +1,178 @@
+"""Benchmark suite for :mod:`python.dataset_summary` and the CLI.
+
+Each benchmark runs in a freshly spawned process so that its peak resident
+set size is not inflated by earlier runs.  Results are written as JSON and
+can be compared against a stored baseline::
+
+    python -m python.benchmarks.bench_summary --rows 10000 100000 \\
+        --output results.json --baseline baseline.json
+
+The command exits with status 1 when a benchmark's throughput drops more
+than ``--tolerance`` below the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..dataset_summary import compute_numeric_summary, load_csv, summarise_dataset
+from .datagen import DatasetSpec, write_dataset
+
+BENCHMARKS = ("load_csv", "compute_numeric_summary", "summarise_dataset", "cli")
+DEFAULT_TOLERANCE = 0.2
+
+
+def _peak_rss_kb(who: int = resource.RUSAGE_SELF) -> int:
+    peak = resource.getrusage(who).ru_maxrss
+    # macOS reports bytes, Linux kilobytes.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _workload(name: str, path: str) -> Callable[[], object]:
+    if name == "load_csv":
+        return lambda: load_csv(path)
+    rows = load_csv(path)
+    if name == "compute_numeric_summary":
+        return lambda: compute_numeric_summary(rows, "salary")
+    if name == "summarise_dataset":
+        return lambda: summarise_dataset(rows)
+    raise ValueError(f"Unknown benchmark '{name}'")
+
+
+def _run_case(name: str, path: str, trace_allocations: bool) -> Dict[str, Optional[float]]:
+    """Time one benchmark; executed inside a dedicated worker process."""
+
+    if name == "cli":
+        command = [sys.executable, "-m", "python.cli", "--csv", path, "--no-cache"]
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        return {"seconds": elapsed, "peak_rss_kb": _peak_rss_kb(resource.RUSAGE_CHILDREN), "allocated_peak_bytes": None}
+
+    workload = _workload(name, path)
+    start = time.perf_counter()
+    workload()
+    elapsed = time.perf_counter() - start
+    result: Dict[str, Optional[float]] = {
+        "seconds": elapsed,
+        "peak_rss_kb": _peak_rss_kb(),
+        "allocated_peak_bytes": None,
+    }
+    if trace_allocations:
+        # A second, traced run: tracemalloc slows the code down too much to
+        # share a run with the timing.
+        tracemalloc.start()
+        workload()
+        result["allocated_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmark(name: str, path: Path, rows: int, repeat: int = 1, trace_allocations: bool = False) -> Dict[str, object]:
+    """Run ``name`` against ``path`` ``repeat`` times and keep the fastest run."""
+
+    runs = []
+    context = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            runs.append(pool.submit(_run_case, name, str(path), trace_allocations).result())
+    best = min(runs, key=lambda run: run["seconds"])
+    return {
+        "benchmark": name,
+        "rows": rows,
+        "seconds": best["seconds"],
+        "rows_per_sec": rows / best["seconds"] if best["seconds"] else None,
+        "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+        "allocated_peak_bytes": best["allocated_peak_bytes"],
+    }
+
+
+def compare(results: Sequence[Dict[str, object]], baseline: Sequence[Dict[str, object]], tolerance: float) -> List[str]:
+    """Describe every benchmark whose throughput regressed beyond ``tolerance``."""
+
+    reference = {(entry["benchmark"], entry["rows"]): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        previous = reference.get((entry["benchmark"], entry["rows"]))
+        if not previous or not previous.get("rows_per_sec") or not entry.get("rows_per_sec"):
+            continue
+        ratio = entry["rows_per_sec"] / previous["rows_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{entry['benchmark']} @ {entry['rows']} rows: "
+                f"{entry['rows_per_sec']:.0f} rows/s vs baseline {previous['rows_per_sec']:.0f} "
+                f"({(1 - ratio) * 100:.1f}% slower)"
+            )
+    return regressions
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the dataset summary helpers")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--null-rate", type=float, default=0.0)
+    parser.add_argument("--extra-numeric", type=int, default=0)
+    parser.add_argument("--extra-text", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the fastest is kept.")
+    parser.add_argument("--trace-allocations", action="store_true", help="Also record tracemalloc peaks.")
+    parser.add_argument("--data-dir", type=Path, help="Keep generated CSV files here for reuse.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against results stored earlier.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = args.data_dir or Path(scratch)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        results = []
+        for rows in args.rows:
+            spec = DatasetSpec(rows, args.null_rate, args.extra_numeric, args.extra_text)
+            path = data_dir / f"employees-{rows}-{args.null_rate}-{args.extra_numeric}-{args.extra_text}.csv"
+            if not path.exists():
+                write_dataset(path, spec)
+            for name in args.benchmarks:
+                result = run_benchmark(name, path, rows, args.repeat, args.trace_allocations)
+                results.append(result)
+                print(
+                    f"{name:<24} {rows:>11,} rows  {result['seconds']:8.3f}s  "
+                    f"{result['rows_per_sec']:>12,.0f} rows/s  {result['peak_rss_kb']:>9,} KiB",
+                    file=sys.stderr,
+                )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": {"null_rate": args.null_rate, "extra_numeric": args.extra_numeric, "extra_text": args.extra_text},
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entry point
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Synthetic employee-style CSV files for benchmarks.
+
+The generated files share the schema of
+:func:`python.demo_data.small_employee_dataset` (``employee``,
+``department``, ``salary``, ``tenure_years``) and can be widened with
+extra numeric and text columns.  Rows are written as they are generated,
+so even 10^8 rows need only constant memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+BASE_COLUMNS = ["employee", "department", "salary", "tenure_years"]
+DEPARTMENTS = ["Engineering", "Data", "Analytics", "Finance", "Operations", "Sales"]
+_NAMES = ["Alicia", "Bala", "Chen", "Dana", "Esha", "Finn", "Gita", "Hugo", "Ines", "Jun"]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Shape of a generated dataset."""
+
+    rows: int
+    null_rate: float = 0.0
+    extra_numeric_columns: int = 0
+    extra_text_columns: int = 0
+    seed: int = 2025
+
+    def header(self) -> List[str]:
+        return (
+            BASE_COLUMNS
+            + [f"metric_{index}" for index in range(self.extra_numeric_columns)]
+            + [f"label_{index}" for index in range(self.extra_text_columns)]
+        )
+
+
+def write_dataset(path: str | Path, spec: DatasetSpec) -> Path:
+    """Write ``spec.rows`` random rows to ``path`` and return the path."""
+
+    if not 0 <= spec.null_rate < 1:
+        raise ValueError("null_rate must be in [0, 1)")
+
+    generator = random.Random(spec.seed)
+    output = Path(path)
+    with output.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(spec.header())
+        for index in range(spec.rows):
+            row = [
+                f"{generator.choice(_NAMES)} {index}",
+                generator.choice(DEPARTMENTS),
+                str(round(generator.gauss(72000, 9000))),
+                str(generator.randint(0, 30)),
+            ]
+            row.extend(f"{generator.random() * 1000:.3f}" for _ in range(spec.extra_numeric_columns))
+            row.extend(generator.choice(DEPARTMENTS).lower() for _ in range(spec.extra_text_columns))
+            if spec.null_rate:
+                row = [cell if generator.random() >= spec.null_rate else "" for cell in row]
+            writer.writerow(row)
+    return output
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate an employee-style CSV file")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--null-rate", type=float, default=0.0)
+    parser.add_argument("--extra-numeric", type=int, default=0)
+    parser.add_argument("--extra-text", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args(argv)
+    spec = DatasetSpec(args.rows, args.null_rate, args.extra_numeric, args.extra_text, args.seed)
+    write_dataset(args.path, spec)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entry point
+    main()
@@ -1,49 +1,616 @@
-"""Command line entry point for working with the practice dataset."""
+"""Command line entry point for working with the practice dataset.
+
+The CLI runs thousands of times a day from cron and shell pipelines, so
+it imports only the standard library up front.  Each code path imports
+the parts of the package it uses, so ``--help``, ``convert`` and
+``--connect`` never load the summary code (see
+:mod:`python.benchmarks.bench_imports`).
+"""
 
 from __future__ import annotations
 
-import argparse
-import json
-from pathlib import Path
-from typing import Iterable, Dict
+import sys
+
+TYPE_CHECKING = False  # see python/__init__.py
+if TYPE_CHECKING:  # pragma: no cover - for type checkers only
+    import argparse
+    from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+    from .columnar import ColumnarTable
+    from .dataset_summary import NumericSummary
+
+    T = TypeVar("T")
+
+
+# Options whose value may start with "-" (``--histogram-range -5:5``), which
+# argparse would otherwise take for another option.
+_SIGNED_VALUE_OPTIONS = ("--histogram-range",)
+
+
+def _attach_signed_values(argv: Sequence[str]) -> List[str]:
+    """Rewrite ``OPTION VALUE`` as ``OPTION=VALUE`` for :data:`_SIGNED_VALUE_OPTIONS`."""
+
+    attached: List[str] = []
+    values = iter(argv)
+    for token in values:
+        if token in _SIGNED_VALUE_OPTIONS:
+            value = next(values, None)
+            token = token if value is None else f"{token}={value}"
+        attached.append(token)
+    return attached
 
-from .dataset_summary import compute_numeric_summary, load_csv, summarise_dataset
-from .demo_data import small_employee_dataset
 
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    import argparse
+    from pathlib import Path
+
+    from .columnar_file import is_columnar_file
+    from .dataset_summary import BACKENDS, DEFAULT_TOP
+    from .filters import compile_filter
+    from .histograms import DEFAULT_BINS, DEFAULT_BINS_PER_DECADE, KINDS, HistogramSpec, parse_bounds
+    from .multi_file import expand_paths, is_pattern
+    from .quantiles import parse_percentiles
 
-def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Summarise numeric columns in a dataset")
     parser.add_argument(
         "--csv",
-        type=Path,
-        help="Optional path to a CSV file. If omitted a demo dataset is used.",
+        nargs="+",
+        metavar="PATH",
+        help="Optional CSV file(s) or glob patterns, plain or gzip/bzip2/xz compressed,"
+             " or a file written by the 'convert' command. If omitted a demo dataset is used."
+             " Several files are summarised concurrently, per file and combined.",
     )
     parser.add_argument(
         "--column",
         help="When provided, only this column is summarised."
              " Otherwise every numeric column is returned.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Summarise the rows in a single pass with constant memory per column.",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Load the CSV into typed columns, converting every cell only once.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Split the CSV into chunks and summarise them in this many processes."
+             " With several files, the number of files summarised at once.",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Scan the CSV through a memory map, converting only numeric fields.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep per-file progress next to the CSV and only parse appended rows.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="pure",
+        help="Statistics implementation; 'numpy' falls back to 'pure' when NumPy is missing.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-read the CSV instead of reusing a cached summary.",
+    )
+    parser.add_argument(
+        "--hash-content",
+        action="store_true",
+        help="Include a hash of the file contents in the cache key.",
+    )
+    parser.add_argument(
+        "--percentiles",
+        type=parse_percentiles,
+        default=[],
+        help="Comma separated percentiles to report besides the median, e.g. 50,90,99.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MIB",
+        help="Compute the exact median and percentiles of --column using at most this many MiB"
+             " for buffered values, spilling sorted runs to the temporary directory ($TMPDIR).",
+    )
+    parser.add_argument(
+        "--where",
+        help="Only summarise rows matching an expression,"
+             " e.g. \"department == 'Data' and tenure_years >= 3\".",
+    )
+    parser.add_argument(
+        "--histogram",
+        choices=KINDS,
+        help="Add a histogram to every numeric summary: 'linear' for equally wide bins,"
+             " 'log' for bins on a logarithmic scale.",
+    )
+    parser.add_argument(
+        "--bins",
+        type=int,
+        help=f"Number of linear bins (default: {DEFAULT_BINS}) or log bins per decade"
+             f" (default: {DEFAULT_BINS_PER_DECADE}).",
+    )
+    parser.add_argument(
+        "--histogram-range",
+        type=parse_bounds,
+        metavar="LOWER:UPPER",
+        help="Bounds of the linear bins, e.g. -5:5. By default they are taken from a sample of the rows.",
+    )
+    parser.add_argument(
+        "--correlations",
+        action="store_true",
+        help="Add the covariance and Pearson correlation with every other numeric column"
+             " to each numeric summary, computed in one extra pass with pairwise deletion.",
+    )
+    parser.add_argument(
+        "--categorical",
+        action="store_true",
+        help="Also report the distinct count and most frequent values of every text column,"
+             " under 'categorical' for mixed columns that also have a numeric summary."
+             " With --column, report that column this way instead of numerically.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        help="How many of the most frequent values --categorical reports (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        metavar="N",
+        help="Estimate the summaries from a random sample of about N rows, with confidence intervals."
+             " Plain CSV files are sampled in blocks at random offsets without reading the whole file.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed for --sample, to draw the same sample on every run.",
+    )
+    parser.add_argument(
+        "--block-stats",
+        action="store_true",
+        help="Report count, min and max from the block statistics of a converted file"
+             " without reading its data.",
+    )
+    parser.add_argument(
+        "--connect",
+        metavar="ADDRESS",
+        help="Run the command in a daemon started with 'serve', given its Unix socket path"
+             " or http://host:port, and print its answer.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time, rows and throughput per stage and peak memory to stderr.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        help="Write the per-stage profile as JSON to this file.",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        type=Path,
+        help="Write cProfile statistics of the summary to this file (read it with pstats).",
+    )
+    parser.add_argument(
+        "--group-by",
+        help="Comma separated columns; summaries are reported for every distinct key.",
+    )
+    parser.add_argument(
+        "--max-groups",
+        type=int,
+        help="Fail when --group-by produces more distinct keys than this.",
+    )
+    args = parser.parse_args(_attach_signed_values(sys.argv[1:] if argv is None else argv))
+    args.csv_files = None
+    args.tables = None
+    if args.csv and (len(args.csv) > 1 or is_pattern(args.csv[0])):
+        args.csv_files = expand_paths(args.csv)
+        args.csv = None
+        if not args.csv_files:
+            parser.error("no files match --csv")
+        if args.group_by or args.mmap or args.incremental or args.columnar:
+            parser.error("several --csv files cannot be combined with --group-by, --mmap, --incremental or --columnar")
+    elif args.csv:
+        args.csv = Path(args.csv[0])
+    args.binary = bool(args.csv) and args.csv.exists() and is_columnar_file(args.csv)
+    if args.binary and (args.workers or args.mmap or args.incremental):
+        parser.error("--workers, --mmap and --incremental need a CSV file, not a converted one")
+    if args.block_stats and not args.binary:
+        parser.error("--block-stats needs a file written by the 'convert' command")
+    if args.where:
+        if args.csv_files or args.workers or args.mmap or args.incremental or args.block_stats:
+            parser.error("--where cannot be combined with several files, --workers, --mmap, --incremental or --block-stats")
+        try:
+            args.where = compile_filter(args.where)
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.categorical and (args.csv_files or args.group_by or args.workers or args.mmap or args.incremental or args.block_stats):
+        parser.error("--categorical cannot be combined with several files, --group-by, --workers, --mmap, --incremental or --block-stats")
+    if args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.correlations and (args.csv_files or args.group_by or args.mmap or args.incremental or args.block_stats):
+        parser.error("--correlations cannot be combined with several files, --group-by, --mmap, --incremental or --block-stats")
+    if args.correlations and args.categorical and args.column:
+        parser.error("--correlations needs a numeric summary, but --categorical with --column reports the column as text")
+    if args.memory_budget is not None:
+        if args.memory_budget < 1 or not args.column:
+            parser.error("--memory-budget needs a positive size and --column")
+        if args.csv_files or args.group_by or args.workers or args.mmap or args.incremental or args.block_stats or args.categorical:
+            parser.error("--memory-budget cannot be combined with several files, --group-by, --workers, --mmap,"
+                         " --incremental, --block-stats or --categorical")
+    if args.seed is not None and args.sample is None:
+        parser.error("--seed needs --sample")
+    if args.sample is not None:
+        if args.sample < 1:
+            parser.error("--sample must be at least 1")
+        if (args.csv_files or args.group_by or args.workers or args.mmap or args.incremental or args.block_stats
+                or args.memory_budget is not None or args.streaming or args.correlations or args.categorical):
+            parser.error("--sample cannot be combined with several files, --group-by, --workers, --mmap, --incremental,"
+                         " --block-stats, --memory-budget, --streaming, --correlations or --categorical")
+    if (args.bins is not None or args.histogram_range) and not args.histogram:
+        parser.error("--bins and --histogram-range need --histogram")
+    if args.histogram:
+        if args.csv_files or args.group_by or args.mmap or args.incremental or args.block_stats:
+            parser.error("--histogram cannot be combined with several files, --group-by, --mmap, --incremental or --block-stats")
+        if args.categorical and args.column:
+            parser.error("--histogram needs a numeric summary, but --categorical with --column reports the column as text")
+        try:
+            args.histogram = HistogramSpec(args.histogram, args.bins, args.histogram_range)
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.group_by and (args.workers or args.mmap or args.incremental):
+        parser.error("--group-by cannot be combined with --workers, --mmap or --incremental")
+    if args.workers is not None and (args.workers < 1 or not (args.csv or args.csv_files)):
+        parser.error("--workers needs a positive count and a --csv file")
+    if (args.mmap or args.incremental) and not args.csv:
+        parser.error("--mmap and --incremental need a --csv file")
+    return args
+
 
+def _parse_convert_args(argv: Sequence[str]) -> argparse.Namespace:
+    import argparse
+    from pathlib import Path
 
-def _load_rows(args: argparse.Namespace) -> Iterable[Dict[str, str]]:
+    from .columnar_file import DEFAULT_BLOCK_ROWS
+
+    parser = argparse.ArgumentParser(
+        prog="convert",
+        description="Convert a CSV file into the binary columnar format for faster summaries",
+    )
+    parser.add_argument("source", type=Path, help="CSV file, optionally gzip/bzip2/xz compressed.")
+    parser.add_argument("destination", type=Path, help="Where to write the converted file.")
+    parser.add_argument(
+        "--block-rows",
+        type=int,
+        default=DEFAULT_BLOCK_ROWS,
+        help="Rows per block of statistics; must be a multiple of 8.",
+    )
+    args = parser.parse_args(argv)
+    if args.block_rows <= 0 or args.block_rows % 8:
+        parser.error("--block-rows must be a positive multiple of 8")
+    return args
+
+
+def _load(args: argparse.Namespace, kind: str, load: Callable[[], T], columns: Optional[Sequence[str]] = None) -> T:
+    """``load()``, or what the daemon, when it runs one, cached for the same ``kind`` and ``columns``."""
+
+    if args.tables is not None:
+        return args.tables.load(args.csv, kind, load, columns)
+    return load()
+
+
+def _load_table(args: argparse.Namespace, columns: Optional[Sequence[str]] = None) -> ColumnarTable:
+    """The CSV or converted file as a table, through the daemon's cache when it runs one."""
+
+    from .columnar import load_columnar
+    from .columnar_file import load_columnar_file
+
+    if args.binary:
+        return _load(args, "binary", lambda: load_columnar_file(args.csv))
+    return _load(args, "columnar", lambda: load_columnar(args.csv, columns), columns)
+
+
+def _load_rows(args: argparse.Namespace) -> Iterable[Dict[str, str]] | ColumnarTable:
+    from . import numpy_backend
+    from .columnar import ColumnarTable
+    from .dataset_summary import iter_csv, load_csv
+    from .demo_data import small_employee_dataset
+
+    if args.binary:
+        return _load_table(args)
+    # Only the requested column, plus any filter columns, is read when no
+    # grouping columns are needed.
+    columns = None
+    if args.column and not args.group_by:
+        columns = list(dict.fromkeys([args.column] + (args.where.columns if args.where else [])))
+    if args.csv and args.backend == "numpy" and not args.streaming and numpy_backend.is_available():
+        return _load(args, "numpy", lambda: numpy_backend.load_table(args.csv, columns=columns), columns)
+    if args.columnar:
+        return _load_table(args, columns) if args.csv else ColumnarTable.from_rows(small_employee_dataset())
     if args.csv:
-        return load_csv(args.csv)
+        return iter_csv(args.csv) if args.streaming else _load(args, "rows", lambda: load_csv(args.csv))
     return small_employee_dataset()
 
 
-def main() -> None:
-    args = _parse_args()
-    rows = list(_load_rows(args))
+def _summarise(args: argparse.Namespace) -> Dict[str, NumericSummary]:
+    if args.sample:
+        return _summarise_sample(args)
+    if args.workers:
+        from .parallel import summarise_csv_parallel
+
+        return summarise_csv_parallel(args.csv, args.column, args.workers, args.percentiles, args.histogram)
+    if args.mmap:
+        from .mmap_scanner import summarise_csv_mmap
+
+        return summarise_csv_mmap(args.csv, args.column, args.percentiles)
+    if args.incremental:
+        from .incremental import summarise_incremental
+
+        return summarise_incremental(args.csv, args.column, percentiles=args.percentiles)
+
+    from .columnar import ColumnarTable
+    from .dataset_summary import compute_numeric_summary, summarise_csv_column, summarise_dataset
+
+    # The daemon summarises the rows it keeps loaded instead, with the same result.
+    if args.column and args.csv and not (args.binary or args.columnar) and args.tables is None:
+        summary = summarise_csv_column(
+            args.csv,
+            args.column,
+            streaming=args.streaming,
+            backend=args.backend,
+            percentiles=args.percentiles,
+            filter=args.where,
+            histogram=args.histogram,
+            memory_budget=_budget_bytes(args),
+        )
+        return {args.column: summary}
 
+    rows = _load_rows(args)
+    if not args.streaming and not isinstance(rows, ColumnarTable):
+        rows = list(rows)
+
+    options = {
+        "streaming": args.streaming,
+        "backend": args.backend,
+        "percentiles": args.percentiles,
+        "filter": args.where,
+        "histogram": args.histogram,
+    }
     if args.column:
-        summary = compute_numeric_summary(rows, args.column)
-        serialisable = {args.column: summary.as_dict()}
+        return {args.column: compute_numeric_summary(rows, args.column, memory_budget=_budget_bytes(args), **options)}
+    return summarise_dataset(rows, **options)
+
+
+def _summarise_sample(args: argparse.Namespace) -> Dict[str, NumericSummary]:
+    from .columnar import ColumnarTable
+    from .dataset_summary import summarise_sample
+    from .sampling import sample_csv, sample_rows
+
+    if args.csv and not (args.binary or args.columnar):
+        sample = sample_csv(args.csv, args.sample, args.seed)
+        rows, population, population_error = sample.rows, sample.population, sample.population_error
+        block_rows = sample.block_rows
+    else:
+        everything = _stream_rows(args)
+        if not isinstance(everything, ColumnarTable):
+            everything = list(everything)
+        rows, population = sample_rows(everything, min(1.0, args.sample / max(len(everything), 1)), args.seed)
+        population_error, block_rows = 0.0, []
+    summaries = summarise_sample(
+        rows,
+        population,
+        percentiles=args.percentiles,
+        filter=args.where,
+        histogram=args.histogram,
+        population_error=population_error,
+        block_rows=block_rows,
+    )
+    if not args.column:
+        return summaries
+    if args.column not in summaries:
+        raise ValueError(f"Column '{args.column}' has no numeric values in the sample")
+    return {args.column: summaries[args.column]}
+
+
+def _budget_bytes(args: argparse.Namespace) -> Optional[int]:
+    return args.memory_budget * 2**20 if args.memory_budget is not None else None
+
+
+def _summarise_groups(args: argparse.Namespace) -> Dict[str, object]:
+    from .grouping import summarise_grouped
+
+    by = [name.strip() for name in args.group_by.split(",") if name.strip()]
+    columns = [args.column] if args.column else None
+    groups = summarise_grouped(
+        _load_rows(args),
+        by,
+        columns,
+        max_groups=args.max_groups,
+        percentiles=args.percentiles,
+        filter=args.where,
+    )
+    return {
+        "groups": [
+            {
+                "key": dict(zip(by, key)),
+                "summaries": {name: summary.as_dict() for name, summary in summaries.items()},
+            }
+            for key, summaries in sorted(groups.items(), key=lambda item: [str(part) for part in item[0]])
+        ]
+    }
+
+
+def _summarise_with_cache(args: argparse.Namespace) -> Dict[str, NumericSummary]:
+    if not args.csv or args.no_cache or args.sample:
+        return _summarise(args)
+    from .summary_cache import cached_summary
+
+    variant = "streaming" if args.streaming or args.workers or args.mmap or args.incremental else "exact"
+    if args.percentiles:
+        variant += ":" + ",".join(f"{percentile:g}" for percentile in args.percentiles)
+    if args.where:
+        variant += ":where=" + args.where.expression
+    if args.histogram:
+        spec = args.histogram
+        variant += f":histogram={spec.kind},{spec.bins or ''},{spec.bounds or ''}"
+    return cached_summary(
+        args.csv,
+        lambda: _summarise(args),
+        column=args.column,
+        variant=variant,
+        hash_content=args.hash_content,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        from .daemon import serve
+
+        serve(argv[1:])
+        return
+    connect = _split_connect(argv)
+    if connect is not None:
+        _run_client(*connect)
+        return
+    import json
+
+    if argv[:1] == ["convert"]:
+        from .columnar_file import convert_csv
+
+        convert_args = _parse_convert_args(argv[1:])
+        rows = convert_csv(convert_args.source, convert_args.destination, convert_args.block_rows)
+        print(json.dumps({"destination": str(convert_args.destination), "rows": rows}, indent=2, sort_keys=True))
+        return
+
+    import cProfile
+    from contextlib import nullcontext
+
+    from . import profiling
+
+    args = _parse_args(argv)
+    profiled = args.profile or args.profile_output or args.profile_dump
+    with profiling.profile() if profiled else nullcontext() as profiler:
+        hot_loop = cProfile.Profile() if args.profile_dump else None
+        if hot_loop is not None:
+            hot_loop.enable()
+        try:
+            serialisable = _run(args)
+        finally:
+            if hot_loop is not None:
+                hot_loop.disable()
+                hot_loop.dump_stats(str(args.profile_dump))
+        with profiling.stage("serialise"):
+            print(json.dumps(serialisable, indent=2, sort_keys=True))
+
+    if args.profile:
+        print(profiler.format(), file=sys.stderr)
+    if args.profile_output:
+        args.profile_output.write_text(json.dumps(profiler.report(), indent=2), encoding="utf-8")
+
+
+def _split_connect(argv: Sequence[str]) -> Optional[Tuple[str, List[str]]]:
+    """The ``--connect`` address and the remaining arguments, or ``None`` without one.
+
+    Both ``--connect ADDRESS`` and ``--connect=ADDRESS`` are accepted.
+    """
+
+    for index, token in enumerate(argv):
+        if token == "--connect" and index + 1 < len(argv):
+            return argv[index + 1], list(argv[:index]) + list(argv[index + 2:])
+        if token.startswith("--connect="):
+            return token.partition("=")[2], list(argv[:index]) + list(argv[index + 1:])
+    return None
+
+
+def _run_client(address: str, argv: Sequence[str]) -> None:
+    """Have the daemon at ``address`` run the command line ``argv``."""
+
+    import json
+
+    from .client import request
+
+    response = request(address, argv)
+    if response["status"] != "ok":
+        print(response["message"].rstrip(), file=sys.stderr)
+        raise SystemExit(response["exit"])
+    print(json.dumps(response["result"], indent=2, sort_keys=True))
+
+
+def _run(args: argparse.Namespace) -> Dict[str, object]:
+    if args.block_stats:
+        from .columnar_file import block_statistics
+
+        statistics = block_statistics(args.csv)
+        if args.column and args.column not in statistics:
+            available = ", ".join(sorted(statistics))
+            raise ValueError(f"Column '{args.column}' not present in file. Available columns: {available or 'none'}")
+        return {args.column: statistics[args.column]} if args.column else statistics
+    if args.csv_files:
+        from .multi_file import summarise_files
+
+        return summarise_files(args.csv_files, args.column, args.workers, args.percentiles).as_dict()
+    if args.group_by:
+        return _summarise_groups(args)
+    if args.categorical and args.column:
+        return _summarise_categorical(args)
+    summary = _summarise_with_cache(args)
+    result = {key: value.as_dict() for key, value in summary.items()}
+    if args.correlations:
+        _add_correlations(args, result)
+    if args.categorical:
+        # Mixed columns keep their numeric summary and report their text alongside it.
+        for name, entry in _summarise_categorical(args).items():
+            if name in result:
+                result[name]["categorical"] = entry
+            else:
+                result[name] = entry
+    return result
+
+
+def _stream_rows(args: argparse.Namespace, columns: Optional[Sequence[str]] = None) -> Iterable[Dict[str, str]] | ColumnarTable:
+    """Rows for the sections that are streamed whatever backend the numeric summaries use."""
+
+    from .dataset_summary import iter_csv
+    from .demo_data import small_employee_dataset
+
+    if args.binary:
+        return _load_table(args)
+    if args.csv:
+        return _load_table(args, columns) if args.columnar else iter_csv(args.csv)
+    return small_employee_dataset()
+
+
+def _summarise_categorical(args: argparse.Namespace) -> Dict[str, object]:
+    from .dataset_summary import summarise_categorical
+
+    columns = [args.column] if args.column else None
+    summaries = summarise_categorical(_stream_rows(args, columns), columns, top=args.top, filter=args.where)
+    return {name: summary.as_dict() for name, summary in summaries.items()}
+
+
+def _add_correlations(args: argparse.Namespace, result: Dict[str, Dict[str, object]]) -> None:
+    if args.workers:
+        from .parallel import correlate_csv_parallel
+
+        moments = correlate_csv_parallel(args.csv, args.workers)
     else:
-        summary = summarise_dataset(rows)
-        serialisable = {key: value.as_dict() for key, value in summary.items()}
+        from .dataset_summary import correlation_matrix
 
-    print(json.dumps(serialisable, indent=2, sort_keys=True))
+        moments = correlation_matrix(_stream_rows(args), filter=args.where)
+    columns = [name for name in moments.columns if name in result]
+    for name, entries in moments.as_dict(columns).items():
+        result[name]["correlations"] = entries
 
 
 if __name__ == "__main__":  # pragma: no cover - manual entry point
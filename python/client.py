@@ -0,0 +1,63 @@
+"""Client side of the summary daemon in :mod:`python.daemon`.
+
+``python -m python.cli --connect ADDRESS ...`` sends its command line
+through :func:`request`.  This module uses only the standard library,
+so the client does not import the summary code the daemon already holds.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+
+TYPE_CHECKING = False  # see python/__init__.py
+if TYPE_CHECKING:  # pragma: no cover - for type checkers only
+    from typing import Any, Dict, List, Optional, Sequence
+
+
+def request(address: str, argv: Sequence[str], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Send one command line to the daemon at ``address`` and return its response.
+
+    ``address`` is a Unix socket path or an ``http://host:port`` URL.
+    Relative ``--csv`` paths are resolved against the current directory.
+    """
+
+    payload = json.dumps({"argv": _absolute_paths(argv)}).encode("utf-8")
+    if address.startswith("http://"):
+        import http.client  # only HTTP clients pay for importing it
+        from urllib.parse import urlsplit
+
+        url = urlsplit(address)
+        connection = http.client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+        try:
+            connection.request("POST", url.path or "/", payload, {"Content-Type": "application/json"})
+            return json.loads(connection.getresponse().read())
+        finally:
+            connection.close()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(address)
+        client.sendall(payload + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        for chunk in iter(lambda: client.recv(1 << 16), b""):
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def _absolute_paths(argv: Sequence[str]) -> List[str]:
+    """Resolve the ``--csv`` arguments of a command line against the current directory."""
+
+    resolved = []
+    in_csv = False
+    for token in argv:
+        if token.startswith("-"):
+            in_csv = token == "--csv"
+            if token.startswith("--csv="):
+                token = "--csv=" + os.path.abspath(token[len("--csv="):])
+        elif in_csv:
+            token = os.path.abspath(token)
+        resolved.append(token)
+    return resolved
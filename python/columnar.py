@@ -0,0 +1,327 @@
+"""Columnar, typed storage for CSV data.
+
+:func:`python.dataset_summary.load_csv` keeps one dictionary of strings per
+row, which costs roughly ten times the size of the file and forces every
+summary call to convert the same strings again.  :func:`load_columnar`
+parses each cell exactly once instead:
+
+* numeric columns are stored as ``array('d')`` plus a validity bitmap
+  (bit ``i`` is set when row ``i`` holds a value), and
+* every other column is dictionary encoded: an ``array('i')`` of codes
+  pointing into a list of distinct strings, with ``-1`` marking blanks.
+
+A column starts out numeric and is demoted to a categorical column the
+first time a cell fails to convert.
+
+Tables give back the text of the file, never a reformatted number.  As
+long as every cell of a numeric column is written the way
+:func:`_format_number` would write its value the column holds only
+numbers; from the first cell that is not (``"02134"``, ``"3.50"``, an ID
+too long for a float) it also keeps the cells themselves, dictionary
+encoded, in :attr:`NumericColumn.text`.  Group keys, filters on text and
+a demoted column's dictionary therefore always see the original cells.
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import csv
+
+from . import profiling
+from .compression import open_text
+from .projection import iter_projected
+
+NULL_CODE = -1
+
+
+def _iter_bits(bitmap: bytearray, length: int) -> Iterator[bool]:
+    for index in range(length):
+        yield bool(bitmap[index >> 3] >> (index & 7) & 1)
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class NumericColumn:
+    """A float column stored contiguously with a validity bitmap.
+
+    ``text``, when set, holds the cells as written in the file; it is only
+    kept once a cell differs from the canonical form of its number.
+    """
+
+    kind = "numeric"
+
+    def __init__(
+        self,
+        values: Optional[array] = None,
+        validity: Optional[bytearray] = None,
+        text: Optional["CategoricalColumn"] = None,
+    ) -> None:
+        self.values = values if values is not None else array("d")
+        self.validity = validity if validity is not None else bytearray()
+        self.text = text
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, value: Optional[float], cell: Optional[str] = None) -> None:
+        """Append ``value``; ``cell`` is the text it was read from, given when that must be kept."""
+
+        index = len(self.values)
+        if cell is not None and self.text is None:
+            # Every earlier cell was canonical, so formatting restores it.
+            text = CategoricalColumn()
+            for earlier in range(index):
+                text.append(self.value_at(earlier))
+            self.text = text
+        if index & 7 == 0:
+            self.validity.append(0)
+        if value is None:
+            self.values.append(0.0)
+        else:
+            self.values.append(value)
+            self.validity[index >> 3] |= 1 << (index & 7)
+        if self.text is not None:
+            self.text.append(None if value is None else cell if cell is not None else _format_number(value))
+
+    def is_valid(self, index: int) -> bool:
+        return bool(self.validity[index >> 3] >> (index & 7) & 1)
+
+    def valid_values(self) -> Iterator[float]:
+        """Yield the non-null values in row order."""
+
+        return compress(self.values, _iter_bits(self.validity, len(self.values)))
+
+    def value_at(self, index: int) -> Optional[str]:
+        if not self.is_valid(index):
+            return None
+        return self.text.value_at(index) if self.text is not None else _format_number(self.values[index])
+
+
+class CategoricalColumn:
+    """A dictionary-encoded string column."""
+
+    kind = "categorical"
+
+    def __init__(self, codes: Optional[array] = None, dictionary: Optional[List[str]] = None) -> None:
+        self.codes = codes if codes is not None else array("i")
+        self.dictionary = dictionary if dictionary is not None else []
+        self._lookup = {value: code for code, value in enumerate(self.dictionary)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            self.codes.append(NULL_CODE)
+            return
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.codes.append(code)
+
+    def value_at(self, index: int) -> Optional[str]:
+        code = self.codes[index]
+        return None if code == NULL_CODE else self.dictionary[code]
+
+    def valid_values(self) -> Iterator[str]:
+        """Yield the decoded non-null values in row order."""
+
+        dictionary = self.dictionary
+        return (dictionary[code] for code in self.codes if code != NULL_CODE)
+
+
+Column = Union[NumericColumn, CategoricalColumn]
+
+
+class ColumnarTable:
+    """A set of equally long, named columns."""
+
+    def __init__(self, columns: Dict[str, Column], row_count: int) -> None:
+        self.columns = columns
+        self.row_count = row_count
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def rows(self) -> Iterator[Dict[str, Optional[str]]]:
+        """Rebuild dictionary rows for code that still expects them."""
+
+        columns = list(self.columns.items())
+        for index in range(self.row_count):
+            yield {name: column.value_at(index) for name, column in columns}
+
+    def numeric_values(self, column: str) -> Iterator[float]:
+        """Yield the numbers stored in ``column``.
+
+        Raises :class:`ValueError` when the column is missing or holds a
+        value that cannot be converted, mirroring
+        :func:`python.dataset_summary.compute_numeric_summary`.
+        """
+
+        if column not in self.columns:
+            available = ", ".join(sorted(self.columns))
+            raise ValueError(
+                f"Column '{column}' not present in table. "
+                f"Available columns: {available or 'none'}"
+            )
+
+        data = self.columns[column]
+        if isinstance(data, NumericColumn):
+            return data.valid_values()
+
+        numbers = []
+        for value in data.dictionary:
+            try:
+                numbers.append(float(value))
+            except ValueError as exc:
+                raise ValueError(f"Non-numeric value '{value}' in column '{column}'.") from exc
+        return (numbers[code] for code in data.codes if code != NULL_CODE)
+
+    def numeric_cells(self) -> Iterator[Tuple[str, Iterator[float]]]:
+        """Yield ``(column, values)`` for every column holding numbers.
+
+        Categorical columns contribute only the dictionary entries that
+        convert to numbers; each distinct entry is converted once.
+        """
+
+        for name, data in self.columns.items():
+            if isinstance(data, NumericColumn):
+                yield name, data.valid_values()
+                continue
+            numbers: List[Optional[float]] = []
+            for value in data.dictionary:
+                try:
+                    numbers.append(float(value))
+                except ValueError:
+                    numbers.append(None)
+            if any(number is not None for number in numbers):
+                selected = (numbers[code] for code in data.codes if code != NULL_CODE)
+                yield name, (number for number in selected if number is not None)
+
+    def select(self, mask: Sequence[bool]) -> "ColumnarTable":
+        """Return a new table holding the rows whose ``mask`` entry is true."""
+
+        columns: Dict[str, Column] = {}
+        for name, data in self.columns.items():
+            if isinstance(data, NumericColumn):
+                selected = NumericColumn()
+                bits = _iter_bits(data.validity, len(data))
+                for value, valid in compress(zip(data.values, bits), mask):
+                    selected.append(value if valid else None)
+                if data.text is not None:
+                    selected.text = _select_codes(data.text, mask)
+                columns[name] = selected
+            else:
+                columns[name] = _select_codes(data, mask)
+        return ColumnarTable(columns, sum(1 for keep in mask if keep))
+
+    @classmethod
+    def from_records(cls, header: Sequence[str], records: Iterable[Sequence[str]]) -> "ColumnarTable":
+        """Build a table from a header and positional records."""
+
+        builders = [_ColumnBuilder() for _ in header]
+        width = len(builders)
+        row_count = 0
+        for record in records:
+            row_count += 1
+            for index in range(width):
+                builders[index].append(record[index] if index < len(record) else "")
+        return cls({name: builder.column for name, builder in zip(header, builders)}, row_count)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, str]]) -> "ColumnarTable":
+        """Build a table from dictionary rows such as those from :func:`load_csv`."""
+
+        iterator = iter(rows)
+        first = next(iterator, None)
+        if first is None:
+            return cls({}, 0)
+        header = list(first)
+
+        def records() -> Iterator[List[str]]:
+            yield [first.get(name) or "" for name in header]
+            for row in iterator:
+                yield [row.get(name) or "" for name in header]
+
+        return cls.from_records(header, records())
+
+
+def _select_codes(column: CategoricalColumn, mask: Sequence[bool]) -> CategoricalColumn:
+    return CategoricalColumn(array("i", compress(column.codes, mask)), list(column.dictionary))
+
+
+class _ColumnBuilder:
+    """Accumulates one column, demoting it to categorical when needed."""
+
+    def __init__(self) -> None:
+        self.column: Column = NumericColumn()
+
+    def append(self, cell: str) -> None:
+        if cell == "":
+            self.column.append(None)
+            return
+        column = self.column
+        if isinstance(column, NumericColumn):
+            try:
+                value = float(cell)
+            except ValueError:
+                self._demote()
+            else:
+                # Plain integers, the common case, are recognised without formatting.
+                canonical = column.text is None and (
+                    (cell.isdigit() and cell.isascii() and (cell[0] != "0" or cell == "0") and value < 2.0**53)
+                    or cell == _format_number(value)
+                )
+                column.append(value, None if canonical else cell)
+                return
+        self.column.append(cell)
+
+    def _demote(self) -> None:
+        numeric = self.column
+        if numeric.text is not None:
+            self.column = numeric.text
+            return
+        categorical = CategoricalColumn()
+        for index in range(len(numeric)):
+            categorical.append(numeric.value_at(index))
+        self.column = categorical
+
+
+def load_columnar(path: str | Path, columns: Optional[Sequence[str]] = None) -> ColumnarTable:
+    """Load a CSV file into a :class:`ColumnarTable`, parsing each cell once.
+
+    With ``columns`` only those columns are read and stored (see
+    :mod:`python.projection`).
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if columns is not None:
+        with profiling.stage("convert"):
+            return ColumnarTable.from_records(list(columns), iter_projected(csv_path, columns))
+
+    with profiling.stage("open"):
+        handle = open_text(csv_path)
+    profiling.count("parse", bytes=csv_path.stat().st_size)
+    with handle, profiling.stage("convert"):
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        return ColumnarTable.from_records(header, profiling.track("parse", reader))
@@ -0,0 +1,364 @@
+"""A compact binary file format for :class:`~python.columnar.ColumnarTable`.
+
+Summarising the same CSV many times spends most of its time parsing
+text.  :func:`convert_csv` parses it once and writes every column as one
+contiguous section:
+
+* numeric columns as little-endian float64 values plus a validity bitmap
+  (bit ``i`` set when row ``i`` holds a value), and
+* text columns as int32 dictionary codes (``-1`` for blanks) plus a
+  section holding the dictionary of distinct strings as a JSON array.
+
+A numeric column whose cells are not all written in canonical form (see
+:mod:`python.columnar`) also stores the cells themselves as codes and a
+dictionary, so loading gives back the text of the CSV file.
+
+Rows are grouped into blocks of ``block_rows``; for every block and column
+the footer records the number of values and, for numeric columns, their
+minimum and maximum.  The footer only holds offsets and these statistics,
+never data, so :func:`block_statistics` answers count/min/max from a small
+read however many distinct strings the file holds, and
+:func:`load_columnar_file` memory-maps the file so that columns are used
+in place without parsing or copying.
+
+Layout::
+
+    b"NCOL" u32 version | column sections, 8-byte aligned | footer (JSON)
+    | u64 footer length | b"NCOL"
+
+The CSV is converted one block at a time and every block of every column
+is staged in a single temporary file, so converting needs memory for one
+block plus the text dictionaries, and one file descriptor however wide
+the file is.  Version 1 files, which kept dictionaries in the footer, and
+version 2 files, which only kept numbers for numeric columns, are still
+read.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+import struct
+import sys
+import tempfile
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .columnar import NULL_CODE, CategoricalColumn, Column, ColumnarTable, NumericColumn, _format_number
+from . import profiling
+from .compression import open_text
+
+MAGIC = b"NCOL"
+VERSION = 3
+_READABLE_VERSIONS = (1, 2, 3)
+DEFAULT_BLOCK_ROWS = 65536
+
+_HEADER = struct.Struct("<4sI")
+_TRAILER = struct.Struct("<Q4s")
+_COPY_CHUNK = 1 << 20
+
+
+def is_columnar_file(path: str | Path) -> bool:
+    """``True`` when ``path`` starts with the columnar file magic."""
+
+    with open(path, "rb") as handle:
+        return handle.read(len(MAGIC)) == MAGIC
+
+
+def _little_endian(data: array) -> bytes:
+    if sys.byteorder != "little":
+        data = array(data.typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+# (offset, length) of a piece of the staging file.
+_Piece = Tuple[int, int]
+
+
+class _Staging:
+    """One temporary file holding the blocks of every column until they are copied out."""
+
+    def __init__(self) -> None:
+        self.handle = tempfile.TemporaryFile()
+
+    def write(self, data: bytes) -> _Piece:
+        self.handle.seek(0, 2)
+        offset = self.handle.tell()
+        self.handle.write(data)
+        return offset, len(data)
+
+    def read(self, piece: _Piece) -> bytes:
+        self.handle.seek(piece[0])
+        return self.handle.read(piece[1])
+
+    def copy(self, pieces: List[_Piece], destination: IO[bytes]) -> List[int]:
+        """Append ``pieces`` to ``destination`` 8-byte aligned; return ``[offset, length]``."""
+
+        offset = _align(destination)
+        for start, length in pieces:
+            self.handle.seek(start)
+            while length:
+                chunk = self.handle.read(min(length, _COPY_CHUNK))
+                destination.write(chunk)
+                length -= len(chunk)
+        return [offset, destination.tell() - offset]
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+class _ColumnWriter:
+    """Stages one column's blocks in the shared staging file as they are appended."""
+
+    def __init__(self, staging: _Staging) -> None:
+        self.staging = staging
+        self.numeric = True
+        self.rows = 0
+        self.values: List[_Piece] = []
+        self.validity: List[_Piece] = []
+        self.codes: List[_Piece] = []
+        # Codes of the cells of a numeric column, once one is not canonical.
+        self.text: Optional[List[_Piece]] = None
+        self.dictionary: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self.blocks: List[Dict[str, Optional[float]]] = []
+
+    def append(self, block: Column) -> None:
+        if isinstance(block, NumericColumn) and self.numeric:
+            valid = list(block.valid_values())
+            if block.text is not None and self.text is None:
+                self.text = [self._stage_codes(self._formatted(pieces)) for pieces in zip(self.values, self.validity)]
+            if self.text is not None:
+                self.text.append(self._stage_codes(block.value_at(index) for index in range(len(block))))
+            self.values.append(self.staging.write(_little_endian(block.values)))
+            self.validity.append(self.staging.write(bytes(block.validity)))
+            self.blocks.append(
+                {"count": len(valid), "min": min(valid, default=None), "max": max(valid, default=None)}
+            )
+        else:
+            if self.numeric:
+                self._demote()
+            codes = array("i", (self._code(block.value_at(index)) for index in range(len(block))))
+            self.codes.append(self.staging.write(_little_endian(codes)))
+            self.blocks.append(
+                {"count": sum(code != NULL_CODE for code in codes), "min": None, "max": None}
+            )
+        self.rows += len(block)
+
+    def _code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_CODE
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        return code
+
+    def _stage_codes(self, cells: Iterable[Optional[str]]) -> _Piece:
+        return self.staging.write(_little_endian(array("i", (self._code(cell) for cell in cells))))
+
+    def _formatted(self, pieces: Tuple[_Piece, _Piece]) -> Iterator[Optional[str]]:
+        """The cells of a staged numeric block whose cells were all canonical."""
+
+        values = array("d")
+        values.frombytes(self.staging.read(pieces[0]))
+        if sys.byteorder != "little":
+            values.byteswap()
+        validity = self.staging.read(pieces[1])
+        for index, value in enumerate(values):
+            yield _format_number(value) if validity[index >> 3] >> (index & 7) & 1 else None
+
+    def _demote(self) -> None:
+        """Turn the numeric blocks staged so far into dictionary codes, one block at a time."""
+
+        self.numeric = False
+        if self.text is not None:
+            self.codes = self.text
+        else:
+            self.codes = [self._stage_codes(self._formatted(pieces)) for pieces in zip(self.values, self.validity)]
+        for block in self.blocks:
+            block["min"] = block["max"] = None
+        self.values, self.validity, self.text = [], [], None
+
+
+def _align(destination: IO[bytes]) -> int:
+    """Pad ``destination`` to a multiple of 8 bytes and return the new offset."""
+
+    destination.write(b"\0" * (-destination.tell() % 8))
+    return destination.tell()
+
+
+def _write_section(data: bytes, destination: IO[bytes]) -> List[int]:
+    """Append ``data`` to ``destination`` 8-byte aligned; return ``[offset, length]``."""
+
+    offset = _align(destination)
+    destination.write(data)
+    return [offset, len(data)]
+
+
+def convert_csv(
+    source: str | Path,
+    destination: str | Path,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> int:
+    """Convert a (possibly compressed) CSV file; return the number of rows.
+
+    ``block_rows`` must be a multiple of 8 so that the validity bitmaps of
+    consecutive blocks line up on byte boundaries.
+    """
+
+    if block_rows <= 0 or block_rows % 8:
+        raise ValueError("block_rows must be a positive multiple of 8")
+    csv_path = Path(source)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    with open_text(csv_path) as handle:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        # Blank lines are skipped, as csv.DictReader does.
+        records_left = (record for record in reader if record)
+        staging = _Staging()
+        writers = [_ColumnWriter(staging) for _ in header]
+        try:
+            row_count = 0
+            while True:
+                records = list(islice(records_left, block_rows))
+                if not records:
+                    break
+                table = ColumnarTable.from_records(header, records)
+                for name, writer in zip(header, writers):
+                    writer.append(table.columns[name])
+                row_count += table.row_count
+            _write_file(Path(destination), header, writers, staging, row_count, block_rows)
+        finally:
+            staging.close()
+    return row_count
+
+
+def _write_file(
+    path: Path,
+    header: List[str],
+    writers: List[_ColumnWriter],
+    staging: _Staging,
+    row_count: int,
+    block_rows: int,
+) -> None:
+    columns = []
+    with path.open("wb") as output:
+        output.write(_HEADER.pack(MAGIC, VERSION))
+        for name, writer in zip(header, writers):
+            entry: Dict[str, object] = {"name": name, "blocks": writer.blocks}
+            if writer.numeric:
+                entry["kind"] = NumericColumn.kind
+                entry["values"] = staging.copy(writer.values, output)
+                entry["validity"] = staging.copy(writer.validity, output)
+                if writer.text is not None:
+                    entry["text"] = {
+                        "codes": staging.copy(writer.text, output),
+                        "dictionary": _write_section(json.dumps(writer.dictionary).encode("utf-8"), output),
+                    }
+            else:
+                entry["kind"] = CategoricalColumn.kind
+                entry["codes"] = staging.copy(writer.codes, output)
+                entry["dictionary"] = _write_section(json.dumps(writer.dictionary).encode("utf-8"), output)
+            columns.append(entry)
+        footer = json.dumps(
+            {"row_count": row_count, "block_rows": block_rows, "columns": columns},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        output.write(footer)
+        output.write(_TRAILER.pack(len(footer), MAGIC))
+
+
+def _read_footer(handle: IO[bytes]) -> Dict[str, object]:
+    magic, version = _HEADER.unpack(handle.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a columnar summary file.")
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported columnar file version {version}.")
+    handle.seek(-_TRAILER.size, 2)
+    length, magic = _TRAILER.unpack(handle.read(_TRAILER.size))
+    if magic != MAGIC:
+        raise ValueError("Columnar file is truncated.")
+    handle.seek(-_TRAILER.size - length, 2)
+    return json.loads(handle.read(length).decode("utf-8"))
+
+
+def block_statistics(path: str | Path) -> Dict[str, Dict[str, Optional[float]]]:
+    """Per-column ``count``, ``min`` and ``max`` read from the footer only.
+
+    ``min`` and ``max`` are ``None`` for text columns and columns without
+    values.
+    """
+
+    with open(path, "rb") as handle:
+        footer = _read_footer(handle)
+    statistics = {}
+    for column in footer["columns"]:
+        blocks = column["blocks"]
+        minima = [block["min"] for block in blocks if block["min"] is not None]
+        maxima = [block["max"] for block in blocks if block["max"] is not None]
+        statistics[column["name"]] = {
+            "count": sum(block["count"] for block in blocks),
+            "min": min(minima, default=None),
+            "max": max(maxima, default=None),
+        }
+    return statistics
+
+
+def _section(view: memoryview, bounds: List[int], typecode: str):
+    offset, length = bounds
+    data = view[offset : offset + length]
+    if typecode == "B":
+        return data
+    if sys.byteorder != "little":
+        swapped = array(typecode, bytes(data))
+        swapped.byteswap()
+        return swapped
+    return data.cast(typecode)
+
+
+def _dictionary(view: memoryview, entry: List) -> List[str]:
+    if not entry or isinstance(entry[0], str):
+        return entry  # version 1 kept the strings in the footer
+    offset, length = entry
+    return json.loads(bytes(view[offset : offset + length]).decode("utf-8"))
+
+
+def load_columnar_file(path: str | Path) -> ColumnarTable:
+    """Memory-map a file written by :func:`convert_csv` as a :class:`ColumnarTable`.
+
+    Columns are read-only views into the mapping, which stays open for as
+    long as any of them is referenced.
+    """
+
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Columnar file not found: {file_path}")
+
+    with profiling.stage("open"), file_path.open("rb") as handle:
+        footer = _read_footer(handle)
+        view = memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    columns: Dict[str, Column] = {}
+    for column in footer["columns"]:
+        if column["kind"] == NumericColumn.kind:
+            text = column.get("text")
+            columns[column["name"]] = NumericColumn(
+                _section(view, column["values"], "d"),
+                _section(view, column["validity"], "B"),
+                None if text is None else CategoricalColumn(
+                    _section(view, text["codes"], "i"), _dictionary(view, text["dictionary"])
+                ),
+            )
+        else:
+            columns[column["name"]] = CategoricalColumn(
+                _section(view, column["codes"], "i"),
+                _dictionary(view, column["dictionary"]),
+            )
+    return ColumnarTable(columns, footer["row_count"])
@@ -0,0 +1,126 @@
+"""Transparent reading of gzip, bzip2 and xz compressed CSV files.
+
+The compression format is detected from the first bytes of the file, not
+from its name.  Compressed files are decompressed on the fly in a
+background thread: zlib, bz2 and lzma release the GIL while they work, so
+decompression overlaps with CSV parsing in the calling thread.  Chunks are
+handed over through a bounded queue, keeping memory use flat no matter
+how large the file is, and no temporary files are written.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, TextIO
+
+CHUNK_SIZE = 1 << 20
+QUEUE_CHUNKS = 4
+
+_MAGIC: Dict[bytes, str] = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+_OPENERS: Dict[str, Callable[[Path], BinaryIO]] = {
+    "gzip": lambda path: gzip.open(path, "rb"),
+    "bz2": lambda path: bz2.open(path, "rb"),
+    "xz": lambda path: lzma.open(path, "rb"),
+}
+
+
+def compression_of(head: bytes) -> Optional[str]:
+    """Name the compression format whose magic bytes start ``head``, if any."""
+
+    for magic, name in _MAGIC.items():
+        if head[: len(magic)] == magic:
+            return name
+    return None
+
+
+def detect_compression(path: str | Path) -> Optional[str]:
+    """Return ``"gzip"``, ``"bz2"`` or ``"xz"`` for compressed files, else ``None``."""
+
+    with open(path, "rb") as handle:
+        return compression_of(handle.read(max(len(magic) for magic in _MAGIC)))
+
+
+class _BackgroundReader(io.RawIOBase):
+    """Raw stream fed by a thread that reads ``source`` ahead of the consumer."""
+
+    def __init__(self, source: BinaryIO, chunk_size: int = CHUNK_SIZE, depth: int = QUEUE_CHUNKS) -> None:
+        super().__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._chunks: "queue.Queue[object]" = queue.Queue(maxsize=depth)
+        self._pending = memoryview(b"")
+        self._finished = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="csv-decompress", daemon=True)
+        self._thread.start()
+
+    def _produce(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self._chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except Exception as exc:  # re-raised in the consuming thread
+            self._put(exc)
+
+    def _put(self, item: object) -> None:
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending and not self._finished:
+            item = self._chunks.get()
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            if not item:
+                self._finished = True
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def open_binary(path: str | Path) -> BinaryIO:
+    """Open ``path`` for reading bytes, decompressing it if needed."""
+
+    csv_path = Path(path)
+    compression = detect_compression(csv_path)
+    if compression is None:
+        return csv_path.open("rb")
+    return io.BufferedReader(_BackgroundReader(_OPENERS[compression](csv_path)), CHUNK_SIZE)
+
+
+def open_text(path: str | Path) -> TextIO:
+    """Open a possibly compressed CSV file as UTF-8 text for :mod:`csv`, dropping a byte order mark."""
+
+    csv_path = Path(path)
+    if detect_compression(csv_path) is None:
+        return csv_path.open(newline="", encoding="utf-8-sig")
+    return io.TextIOWrapper(open_binary(csv_path), encoding="utf-8-sig", newline="")
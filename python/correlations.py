@@ -0,0 +1,137 @@
+"""Single-pass covariance and Pearson correlation matrices.
+
+:class:`CoMoments` keeps, for every pair of numeric columns, the count,
+means, sums of squared deviations and the co-moment of the rows where
+*both* values are present.  Rows with missing values therefore still
+contribute to every pair they can (pairwise deletion) rather than being
+dropped altogether.
+
+Updates use the bivariate form of Welford's algorithm, so there is no
+catastrophic cancellation as with ``sum(x*y) - sum(x)*sum(y)/n``.
+Partial results from chunks or worker processes combine exactly with
+:meth:`CoMoments.merge` (Chan et al.).
+
+Covariances are population covariances, matching the population
+standard deviation reported by :class:`~python.dataset_summary.NumericSummary`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# count, mean_x, mean_y, m2_x, m2_y, co-moment
+_PairState = List[float]
+
+
+class CoMoments:
+    """Streaming co-moments of every pair of columns, with pairwise deletion."""
+
+    def __init__(self) -> None:
+        self._pairs: Dict[Tuple[str, str], _PairState] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        """Every column seen so far, sorted by name."""
+
+        return sorted({name for pair in self._pairs for name in pair})
+
+    def add(self, values: Mapping[str, float]) -> None:
+        """Update every pair of columns present in one row."""
+
+        self.add_items(sorted(values.items()))
+
+    def add_items(self, items: List[Tuple[str, float]]) -> None:
+        """Like :meth:`add`, for ``(column, value)`` pairs already sorted by column."""
+
+        pairs = self._pairs
+        for first, (name_x, x) in enumerate(items):
+            for name_y, y in items[first:]:
+                state = pairs.get((name_x, name_y))
+                if state is None:
+                    state = pairs[(name_x, name_y)] = [0, 0.0, 0.0, 0.0, 0.0, 0.0]
+                count = state[0] + 1
+                delta_x = x - state[1]
+                delta_y = y - state[2]
+                mean_x = state[1] + delta_x / count
+                mean_y = state[2] + delta_y / count
+                state[0] = count
+                state[1] = mean_x
+                state[2] = mean_y
+                state[3] += delta_x * (x - mean_x)
+                state[4] += delta_y * (y - mean_y)
+                state[5] += delta_x * (y - mean_y)
+
+    def merge(self, other: "CoMoments") -> "CoMoments":
+        """Combine two partial results in place and return ``self``."""
+
+        for key, theirs in other._pairs.items():
+            ours = self._pairs.get(key)
+            if ours is None:
+                self._pairs[key] = list(theirs)
+                continue
+            count = ours[0] + theirs[0]
+            if not theirs[0]:
+                continue
+            delta_x = theirs[1] - ours[1]
+            delta_y = theirs[2] - ours[2]
+            weight = ours[0] * theirs[0] / count
+            ours[1] += delta_x * theirs[0] / count
+            ours[2] += delta_y * theirs[0] / count
+            ours[3] += theirs[3] + delta_x * delta_x * weight
+            ours[4] += theirs[4] + delta_y * delta_y * weight
+            ours[5] += theirs[5] + delta_x * delta_y * weight
+            ours[0] = count
+        return self
+
+    def _state(self, first: str, second: str) -> Optional[_PairState]:
+        if first <= second:
+            return self._pairs.get((first, second))
+        state = self._pairs.get((second, first))
+        if state is None:
+            return None
+        count, mean_y, mean_x, m2_y, m2_x, comoment = state
+        return [count, mean_x, mean_y, m2_x, m2_y, comoment]
+
+    def count(self, first: str, second: str) -> int:
+        """Number of rows where both columns hold a value."""
+
+        state = self._state(first, second)
+        return int(state[0]) if state else 0
+
+    def covariance(self, first: str, second: str) -> Optional[float]:
+        """Population covariance over the rows where both columns hold a value."""
+
+        state = self._state(first, second)
+        if not state:
+            return None
+        return state[5] / state[0]
+
+    def correlation(self, first: str, second: str) -> Optional[float]:
+        """Pearson correlation, or ``None`` when either column is constant."""
+
+        state = self._state(first, second)
+        if not state or state[3] <= 0 or state[4] <= 0:
+            return None
+        # Clamp the rounding error of nearly collinear columns.
+        return max(-1.0, min(1.0, state[5] / math.sqrt(state[3] * state[4])))
+
+    def as_dict(self, columns: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """``{column: {other: {"count", "covariance", "correlation"}}}`` for every pair.
+
+        ``columns`` limits the outer keys; every column is still listed as
+        ``other``.
+        """
+
+        everything = self.columns
+        return {
+            name: {
+                other: {
+                    "count": self.count(name, other),
+                    "covariance": self.covariance(name, other),
+                    "correlation": self.correlation(name, other),
+                }
+                for other in everything
+            }
+            for name in (everything if columns is None else columns)
+        }
@@ -0,0 +1,356 @@
+"""A long-running summary service with warm in-memory caches.
+
+Every ``python -m python.cli`` call pays for interpreter start-up, imports
+and parsing the file again.  ``python -m python.cli serve`` instead keeps a
+process running that answers the same command lines over a local Unix
+socket or HTTP, and ``--connect`` turns the CLI into a thin client of it::
+
+    python -m python.cli serve --socket /tmp/summaries.sock &
+    python -m python.cli --connect /tmp/summaries.sock --csv data.csv --column salary
+
+The service keeps two kinds of entries in one memory-bounded LRU
+(:class:`MemoryLRU`): files loaded exactly as the command line loads them
+(rows, or a :class:`~python.columnar.ColumnarTable` with ``--columnar``,
+``--backend numpy`` or a converted file), reused by every later request
+loading the same file the same way, and the JSON result of each command
+line.  Answers are therefore the same as those of the command line.  Entries carry the
+:class:`~python.summary_cache.FileFingerprint` of their files and are
+dropped and recomputed when a file's size or modification time changes.
+
+Connections are handled by a fixed pool of threads so that concurrent
+clients are served while a slow request is parsing a file.  Requests are a
+JSON object ``{"argv": [...]}``, one line over the Unix socket or the body
+of a ``POST`` over HTTP, and responses are ``{"status": "ok", "result":
+...}`` or ``{"status": "error", "exit": code, "message": ...}``; the
+client side is :mod:`python.client`.
+
+The service reads any file its user can read and has no authentication,
+so HTTP is only served on loopback addresses, and ``POST`` bodies must be
+sent as ``application/json``, which a web page cannot do across origins
+without the browser asking the server first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import io
+import ipaddress
+import json
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from . import cli
+from .columnar import CategoricalColumn, ColumnarTable, NumericColumn
+from .summary_cache import FileFingerprint
+
+DEFAULT_CACHE_BYTES = 256 * 2**20
+DEFAULT_WORKERS = 4
+
+# Options that write to the daemon's own stderr or files rather than the reply.
+_LOCAL_OPTIONS = ("--profile", "--profile-output", "--profile-dump")
+
+# argparse reports errors by printing and exiting, which touches process-wide
+# streams; parsing is cheap enough to serialise.
+_PARSE_LOCK = threading.Lock()
+
+
+class MemoryLRU:
+    """A thread-safe least-recently-used map bounded by the estimated size of its values.
+
+    Every entry carries a ``version``; looking a key up with a different
+    version drops the stale entry and misses.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, value: Any, size: int) -> None:
+        """Store ``value``, evicting old entries; values larger than the cache are not kept."""
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        self.size -= self._entries.pop(key)[2]
+
+
+def _table_bytes(table: ColumnarTable) -> int:
+    """Rough memory use of a table, for the cache budget."""
+
+    total = 0
+    for column in table.columns.values():
+        if isinstance(column, NumericColumn):
+            total += column.values.itemsize * len(column.values) + len(column.validity)
+            column = column.text  # the cells, when they are kept as written
+        if isinstance(column, CategoricalColumn):
+            # Each string is referenced from the dictionary and the lookup.
+            total += column.codes.itemsize * len(column.codes)
+            total += sum(sys.getsizeof(value) + 100 for value in column.dictionary)
+    return total
+
+
+def _rows_bytes(rows: List[Dict[str, str]]) -> int:
+    """Rough memory use of rows from :func:`~python.dataset_summary.load_csv`."""
+
+    # The key strings are shared by every row.
+    return sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in rows)
+
+
+class TableCache:
+    """Keeps what the CLI loads from a file in a :class:`MemoryLRU`.
+
+    Entries are keyed by file, ``kind`` of load (``"rows"``, ``"columnar"``,
+    ``"numpy"`` or ``"binary"``) and projected columns, so that a request
+    only ever sees what the same command line would have loaded itself.
+    """
+
+    def __init__(self, cache: MemoryLRU, refresh: bool = False) -> None:
+        self.cache = cache
+        self.refresh = refresh
+
+    def load(self, path: Path, kind: str, load: Callable[[], Any], columns: Optional[Sequence[str]] = None) -> Any:
+        fingerprint = FileFingerprint.of(path)
+        projection = tuple(columns) if columns is not None else None
+        if not self.refresh:
+            # A table of every column also answers requests for a few of them.
+            keys = [("table", kind, fingerprint.path, None), ("table", kind, fingerprint.path, projection)]
+            for key in dict.fromkeys(keys):
+                loaded = self.cache.get(key, fingerprint)
+                if loaded is not None:
+                    return loaded
+        loaded = load()
+        size = _table_bytes(loaded) if isinstance(loaded, ColumnarTable) else _rows_bytes(loaded)
+        self.cache.put(("table", kind, fingerprint.path, projection), fingerprint, loaded, size)
+        return loaded
+
+
+class SummaryService:
+    """Answers CLI command lines from warm caches."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.cache = MemoryLRU(max_bytes)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        argv = request.get("argv") if isinstance(request, dict) else None
+        if not isinstance(argv, list) or not all(isinstance(token, str) for token in argv):
+            return _error(2, "request must be an object with an 'argv' list of strings")
+        if argv[:1] in (["convert"], ["serve"]) or any(token.split("=")[0] in _LOCAL_OPTIONS for token in argv):
+            return _error(2, f"convert, serve and {', '.join(_LOCAL_OPTIONS)} are not available through the daemon")
+
+        output = io.StringIO()
+        try:
+            with _PARSE_LOCK, redirect_stdout(output), redirect_stderr(output):
+                args = cli._parse_args(argv)
+        except SystemExit as exc:
+            return _error(exc.code if isinstance(exc.code, int) else 2, output.getvalue())
+
+        try:
+            paths = [args.csv] if args.csv else list(args.csv_files or [])
+            version = tuple(FileFingerprint.of(path) for path in paths)
+            key = ("result", tuple(argv))
+            cacheable = not args.no_cache and not (args.sample and args.seed is None)
+            result = self.cache.get(key, version) if cacheable else None
+            if result is not None:
+                return {"status": "ok", "result": result, "cached": True}
+            if args.csv and not (args.workers or args.mmap or args.incremental or args.block_stats
+                                 or args.sample or args.memory_budget is not None):
+                args.tables = TableCache(self.cache, refresh=args.no_cache)
+            result = cli._run(args)
+        except Exception as exc:  # keep serving after a failed request
+            return _error(1, str(exc) or type(exc).__name__)
+        if cacheable:
+            self.cache.put(key, version, result, len(json.dumps(result)))
+        return {"status": "ok", "result": result, "cached": False}
+
+
+def _error(code: int, message: str) -> Dict[str, Any]:
+    return {"status": "error", "exit": code, "message": message}
+
+
+class _PooledMixIn:
+    """Serves connections on a fixed-size thread pool instead of a thread each."""
+
+    def __init__(self, *args: Any, service: SummaryService, workers: int = DEFAULT_WORKERS, **kwargs: Any) -> None:
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary")
+        super().__init__(*args, **kwargs)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.pool.submit(self._serve_connection, request, client_address)
+
+    def _serve_connection(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            response = _error(2, "request is not valid JSON")
+        else:
+            response = self.server.service.handle(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _HttpHandler(http.server.BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        if self.headers.get_content_type() != "application/json":
+            self._reply(415, _error(2, "request must be sent as application/json"))
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            response = _error(2, "request is not valid JSON")
+        else:
+            response = self.server.service.handle(request)
+        self._reply(200 if response["status"] == "ok" else 400, response)
+
+    def _reply(self, status: int, response: Dict[str, Any]) -> None:
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class UnixSummaryServer(_PooledMixIn, socketserver.UnixStreamServer):
+    """Serves JSON lines on a Unix socket."""
+
+
+class HttpSummaryServer(_PooledMixIn, http.server.HTTPServer):
+    """Serves ``POST`` requests with JSON bodies."""
+
+
+def is_loopback(host: str) -> bool:
+    """``True`` when ``host`` names this machine only (``localhost``, ``127.0.0.1``, ``::1``)."""
+
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def make_server(
+    service: SummaryService,
+    *,
+    socket_path: Optional[str | Path] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+    workers: int = DEFAULT_WORKERS,
+) -> socketserver.BaseServer:
+    """Bind a server on ``socket_path``, or over HTTP on ``host:port`` (0 picks a free port).
+
+    ``host`` must be a loopback address (see :func:`is_loopback`).
+    """
+
+    if (socket_path is None) == (port is None):
+        raise ValueError("give either socket_path or port")
+    if port is not None and not is_loopback(host):
+        raise ValueError(f"refusing to serve on non-loopback address '{host}': the service has no authentication")
+    if socket_path is not None:
+        path = Path(socket_path)
+        if path.is_socket():
+            path.unlink()  # left behind by a daemon that did not shut down cleanly
+        return UnixSummaryServer(str(path), _LineHandler, service=service, workers=workers)
+    return HttpSummaryServer((host, port), _HttpHandler, service=service, workers=workers)
+
+
+def parse_serve_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="serve",
+        description="Serve summaries from warm in-memory caches; query with --connect",
+    )
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", type=Path, help="Listen on this Unix socket.")
+    where.add_argument("--port", type=int, help="Listen for HTTP on this port (0 picks a free one).")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Loopback address to bind with --port (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Requests served concurrently (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--cache-mib",
+        type=int,
+        default=DEFAULT_CACHE_BYTES // 2**20,
+        help="Memory for cached tables and results (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.cache_mib < 1:
+        parser.error("--workers and --cache-mib must be positive")
+    if not is_loopback(args.host):
+        parser.error("--host must be a loopback address; the service has no authentication")
+    return args
+
+
+def serve(argv: Sequence[str]) -> None:
+    """Run the daemon described by the ``serve`` command line until interrupted."""
+
+    args = parse_serve_args(argv)
+    service = SummaryService(args.cache_mib * 2**20)
+    server = make_server(service, socket_path=args.socket, host=args.host, port=args.port, workers=args.workers)
+    if args.socket is not None:
+        address = str(args.socket)
+    else:
+        address = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    print(f"serving summaries on {address}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket is not None:
+            args.socket.unlink(missing_ok=True)
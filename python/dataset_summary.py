@@ -4,37 +4,177 @@ This module contains lightweight helpers that demonstrate how Python
 code in the Learning 2025 curriculum can be structured.  The functions
 favour readability over micro-optimisations and are suitable for
 beginners experimenting with unit tests and command line interfaces.
+
+Wrap calls in ``with profile() as profiler:`` to record the time spent
+opening, parsing, converting and aggregating (see :mod:`python.profiling`).
 """
 
 from __future__ import annotations
 
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import chain, islice
 from pathlib import Path
-from statistics import mean, median, pstdev
-from typing import Dict, Iterable, List
+from statistics import mean, pstdev
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import csv
+import random
+
+from . import numpy_backend, profiling
+from .columnar import NULL_CODE, CategoricalColumn, ColumnarTable, NumericColumn, _format_number, _iter_bits
+from .correlations import CoMoments
+from .external_quantiles import ExternalQuantiles
+from .compression import open_text
+from .filters import RowFilter, compile_filter, filter_table
+from .histograms import Histogram, HistogramSpec, histogram_from_dict
+from .profiling import profile  # noqa: F401 - the programmatic profiling hook
+from .projection import iter_projected
+from .quantiles import exact_percentiles, percentile_label, validate_percentiles
+from .sampling import DEFAULT_CONFIDENCE, Approximation, confidence_intervals, sample_rows, scaled_count
+from .schema import DEFAULT_SAMPLE_SIZE, MIXED, NUMERIC, TEXT, Schema, infer_schema, looks_numeric
+from .sketches import CategoricalAccumulator
+from .streaming import NumericAccumulator
+
+Rows = Union[Iterable[Dict[str, str]], ColumnarTable]
+
+BACKENDS = ("pure", "numpy")
+
+DEFAULT_TOP = 10
 
 
 @dataclass
 class NumericSummary:
-    """Describes simple descriptive statistics for a numeric feature."""
+    """Describes simple descriptive statistics for a numeric feature.
+
+    ``percentiles`` maps each requested percentile (0-100) to its value
+    and is serialised as ``p50``, ``p90`` and so on.  ``histogram`` is set
+    when one was requested (see :mod:`python.histograms`).
+
+    ``approximation`` is set when the statistics were estimated from a
+    sample of the rows (see :mod:`python.sampling`).  The serialised form
+    then carries ``"approximate": true`` and a ``"sample"`` section with
+    the confidence interval of every statistic.
+    """
 
     count: int
     mean: float
     median: float
     stdev: float
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    percentiles: Dict[float, float] = field(default_factory=dict)
+    histogram: Optional[Histogram] = None
+    approximation: Optional[Approximation] = None
 
     def as_dict(self) -> Dict[str, float]:
         """Represent the statistics as a serialisable dictionary."""
 
-        return {
+        data = {
             "count": self.count,
             "mean": self.mean,
             "median": self.median,
             "stdev": self.stdev,
         }
+        if self.minimum is not None:
+            data["min"] = self.minimum
+        if self.maximum is not None:
+            data["max"] = self.maximum
+        for percentile, value in sorted(self.percentiles.items()):
+            data[percentile_label(percentile)] = value
+        if self.histogram is not None:
+            data["histogram"] = self.histogram.as_dict()
+        if self.approximation is not None:
+            data["approximate"] = True
+            data["sample"] = self.approximation.as_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "NumericSummary":
+        """Rebuild a summary from the output of :meth:`as_dict`."""
+
+        return cls(
+            count=int(data["count"]),
+            mean=data["mean"],
+            median=data["median"],
+            stdev=data["stdev"],
+            minimum=data.get("min"),
+            maximum=data.get("max"),
+            percentiles={float(key[1:]): value for key, value in data.items() if key[:1] == "p"},
+            histogram=histogram_from_dict(data["histogram"]) if "histogram" in data else None,
+            approximation=Approximation.from_dict(data["sample"]) if "sample" in data else None,
+        )
+
+    @classmethod
+    def from_accumulator(
+        cls,
+        accumulator: NumericAccumulator,
+        percentiles: Sequence[float] = (),
+    ) -> "NumericSummary":
+        """Build a summary from a single-pass :class:`NumericAccumulator`.
+
+        Percentiles come from the accumulator's quantile sketch and carry
+        the same error bound as its median.
+        """
+
+        return cls(
+            count=accumulator.count,
+            mean=accumulator.mean,
+            median=accumulator.median,
+            stdev=accumulator.stdev,
+            minimum=accumulator.minimum,
+            maximum=accumulator.maximum,
+            percentiles={p: accumulator.sketch.quantile(p / 100) for p in percentiles},
+            histogram=accumulator.histogram,
+        )
+
+    @classmethod
+    def from_values(cls, values: List[float], percentiles: Sequence[float] = ()) -> "NumericSummary":
+        """Build an exact summary from a non-empty list, reordering it in place."""
+
+        middle, selected = exact_percentiles(values, percentiles)
+        return cls(
+            count=len(values),
+            mean=mean(values),
+            median=middle,
+            stdev=pstdev(values) if len(values) > 1 else 0.0,
+            minimum=min(values),
+            maximum=max(values),
+            percentiles=selected,
+        )
+
+
+@dataclass
+class CategoricalSummary:
+    """Distinct count and most frequent values of a text feature.
+
+    ``exact`` is ``False`` once a sketch had to approximate; see
+    :mod:`python.sketches` for the error bounds.
+    """
+
+    count: int
+    distinct: int
+    top: List[Tuple[str, int]] = field(default_factory=list)
+    exact: bool = True
+
+    def as_dict(self) -> Dict[str, object]:
+        """Represent the statistics as a serialisable dictionary."""
+
+        return {
+            "count": self.count,
+            "distinct": self.distinct,
+            "top": [{"value": value, "count": count} for value, count in self.top],
+            "exact": self.exact,
+        }
+
+    @classmethod
+    def from_accumulator(cls, accumulator: CategoricalAccumulator, top: int = DEFAULT_TOP) -> "CategoricalSummary":
+        return cls(
+            count=accumulator.count,
+            distinct=accumulator.distinct.estimate(),
+            top=accumulator.frequent.most_common(top),
+            exact=accumulator.is_exact,
+        )
 
 
 def load_csv(path: str | Path) -> List[Dict[str, str]]:
@@ -43,7 +183,8 @@ def load_csv(path: str | Path) -> List[Dict[str, str]]:
     Parameters
     ----------
     path:
-        File system path to a comma separated file.
+        File system path to a comma separated file.  gzip, bzip2 and xz
+        compressed files are detected and decompressed transparently.
 
     Returns
     -------
@@ -55,20 +196,321 @@ def load_csv(path: str | Path) -> List[Dict[str, str]]:
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    with csv_path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        return list(reader)
+    with profiling.stage("open"):
+        handle = open_text(csv_path)
+    profiling.count("parse", bytes=csv_path.stat().st_size)
+    with handle:
+        return list(profiling.track("parse", csv.DictReader(handle)))
+
+
+def iter_csv(path: str | Path) -> Iterator[Dict[str, str]]:
+    """Lazily yield the rows of a CSV file one dictionary at a time.
+
+    Unlike :func:`load_csv` the file is never held in memory as a whole,
+    which makes this the natural input for the ``streaming`` mode of the
+    summary functions.
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    with profiling.stage("open"):
+        handle = open_text(csv_path)
+    profiling.count("parse", bytes=csv_path.stat().st_size)
+    with handle:
+        yield from profiling.track("parse", csv.DictReader(handle))
 
 
-def compute_numeric_summary(rows: Iterable[Dict[str, str]], column: str) -> NumericSummary:
+def compute_numeric_summary(
+    rows: Rows,
+    column: str,
+    *,
+    streaming: bool = False,
+    backend: str = "pure",
+    percentiles: Sequence[float] = (),
+    filter: Optional[Union[str, RowFilter]] = None,
+    histogram: Optional[HistogramSpec] = None,
+    memory_budget: Optional[int] = None,
+) -> NumericSummary:
     """Compute descriptive statistics for a numeric column.
 
     Missing values and blank strings are ignored automatically.  The
     function raises a :class:`ValueError` when the column cannot be
-    located or none of the rows contain numeric values.
+    located or none of the rows contain numeric values.  ``rows`` may be
+    an iterable of dictionaries or a :class:`~python.columnar.ColumnarTable`.
+
+    With ``streaming=True`` the rows are consumed in a single pass using a
+    :class:`~python.streaming.NumericAccumulator`, so memory stays constant
+    no matter how many rows are supplied.  See :mod:`python.streaming` for
+    the error bound on the median.
+
+    ``backend="numpy"`` converts and reduces the column with NumPy when it
+    is installed (see :mod:`python.numpy_backend`) and silently falls back
+    to the pure Python implementation otherwise.  It has no effect on the
+    streaming mode.
+
+    ``percentiles`` (0-100) are reported in addition to the median.  They
+    are exact, read from a single sorted buffer, except in streaming
+    mode where they come from the quantile sketch.
+
+    ``filter`` restricts the summary to rows matching an expression such
+    as ``"department == 'Data' and tenure_years >= 3"`` (see
+    :mod:`python.filters`).  Rows are filtered as they stream past.
+
+    ``histogram`` adds a histogram of the column, built in the same pass
+    (see :mod:`python.histograms`).  Without explicit bounds, fixed-width
+    bins span the column's range, or in streaming mode the range of a
+    sample of the rows.
+
+    ``memory_budget`` (in bytes) computes an exact median and percentiles
+    in a single pass without holding the column in memory: values beyond
+    the budget are spilled to sorted temporary files (see
+    :mod:`python.external_quantiles`).  It takes precedence over
+    ``streaming`` and ``backend``.
+    """
+
+    use_numpy = _use_numpy(backend)
+    validate_percentiles(percentiles)
+    rows = _apply_filter(rows, filter)
+    if memory_budget is not None:
+        rows, histogram = sample_histogram(rows, histogram, column)
+        return _external_summary(_numeric_column_values(rows, column), column, percentiles, histogram, memory_budget)
+
+    if streaming:
+        accumulator = accumulate_column(rows, column, histogram)
+        if not accumulator.count:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+        return NumericSummary.from_accumulator(accumulator, percentiles)
+
+    if use_numpy:
+        with profiling.stage("convert"):
+            values = numpy_backend.column_array(rows, column)
+        if not values.size:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+        with profiling.stage("aggregate", rows=int(values.size)):
+            summary = NumericSummary(**numpy_backend.describe(values, percentiles))
+            if histogram is not None:
+                summary.histogram = histogram.build(column, values.tolist())
+            return summary
+
+    with profiling.stage("aggregate"):
+        cleaned_values = list(profiling.track("convert", _numeric_column_values(rows, column)))
+
+        if not cleaned_values:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+
+        return _summary_from_values(column, cleaned_values, percentiles, histogram)
+
+
+def summarise_csv_column(
+    path: str | Path,
+    column: str,
+    *,
+    streaming: bool = False,
+    backend: str = "pure",
+    percentiles: Sequence[float] = (),
+    filter: Optional[Union[str, RowFilter]] = None,
+    histogram: Optional[HistogramSpec] = None,
+    memory_budget: Optional[int] = None,
+) -> NumericSummary:
+    """Summarise one column of a CSV file without building row dictionaries.
+
+    The result matches :func:`compute_numeric_summary` applied to
+    :func:`load_csv`, but only ``column`` is extracted from each record
+    (see :mod:`python.projection`), so time and memory depend on the
+    column rather than on the width of the file.  With a ``filter`` the
+    columns it references are read as well.  ``histogram`` and
+    ``memory_budget`` behave as in :func:`compute_numeric_summary`.
+    """
+
+    use_numpy = _use_numpy(backend)
+    validate_percentiles(percentiles)
+    row_filter = compile_filter(filter) if filter is not None else None
+    if memory_budget is not None:
+        if histogram is not None and histogram.needs_sample:
+            sample = list(islice(_projected_numbers(path, column, row_filter), DEFAULT_SAMPLE_SIZE))
+            histogram = histogram.sampled({column: sample})
+        values = _projected_numbers(path, column, row_filter)
+        return _external_summary(values, column, percentiles, histogram, memory_budget)
+    if use_numpy and not streaming:
+        columns = [column] + (row_filter.columns if row_filter else [])
+        table = numpy_backend.load_table(path, columns=list(dict.fromkeys(columns)))
+        return compute_numeric_summary(
+            table, column, backend=backend, percentiles=percentiles, filter=row_filter, histogram=histogram
+        )
+
+    if streaming:
+        accumulator = accumulate_csv_column(path, column, row_filter, histogram)
+        if not accumulator.count:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+        return NumericSummary.from_accumulator(accumulator, percentiles)
+
+    with profiling.stage("aggregate"):
+        cleaned_values = list(profiling.track("convert", _projected_numbers(path, column, row_filter)))
+        if not cleaned_values:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+        return _summary_from_values(column, cleaned_values, percentiles, histogram)
+
+
+def accumulate_csv_column(
+    path: str | Path,
+    column: str,
+    row_filter: Optional[RowFilter] = None,
+    histogram: Optional[HistogramSpec] = None,
+) -> NumericAccumulator:
+    """Stream one column of a CSV file into a :class:`NumericAccumulator`.
+
+    Like :func:`accumulate_column`, an empty accumulator is returned
+    rather than raising, but only ``column`` (and the columns used by
+    ``row_filter``) is read from each record.  Fixed-width histogram
+    bounds are sampled from the start of the file.
+    """
+
+    if histogram is not None and histogram.needs_sample:
+        sample = list(islice(_projected_numbers(path, column, row_filter), DEFAULT_SAMPLE_SIZE))
+        histogram = histogram.sampled({column: sample})
+    accumulator = NumericAccumulator(histogram=histogram.create(column) if histogram else None)
+    with profiling.stage("aggregate"):
+        for value in profiling.track("convert", _projected_numbers(path, column, row_filter)):
+            accumulator.add(value)
+    return accumulator
+
+
+def _projected_numbers(path: str | Path, column: str, row_filter: Optional[RowFilter] = None) -> Iterator[float]:
+    if row_filter is None:
+        values: Iterable[str] = (value for (value,) in iter_projected(path, [column]))
+    else:
+        records = iter_projected(path, [column] + row_filter.columns)
+        values = (record[0] for record in records if row_filter.test(record[1:]))
+    for value in values:
+        if value == "":
+            continue
+        try:
+            yield float(value)
+        except ValueError as exc:
+            raise ValueError(f"Non-numeric value '{value}' in column '{column}'.") from exc
+
+
+def _apply_filter(rows: Rows, row_filter: Optional[Union[str, RowFilter]]) -> Rows:
+    if row_filter is None:
+        return rows
+    row_filter = compile_filter(row_filter)
+    if isinstance(rows, ColumnarTable):
+        return filter_table(rows, row_filter)
+    return (row for row in rows if row_filter(row))
+
+
+def _use_numpy(backend: str) -> bool:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+    return backend == "numpy" and numpy_backend.is_available()
+
+
+def accumulate_column(rows: Rows, column: str, histogram: Optional[HistogramSpec] = None) -> NumericAccumulator:
+    """Stream ``column`` into a :class:`NumericAccumulator`.
+
+    The same validation as :func:`compute_numeric_summary` applies, but an
+    empty accumulator is returned rather than raising so that partial
+    results (for example from different chunks of a file) can be merged.
+    ``histogram`` adds a histogram to the accumulator; see
+    :func:`sample_histogram` for how missing bounds are chosen.
+    """
+
+    rows, histogram = sample_histogram(rows, histogram, column)
+    accumulator = NumericAccumulator(histogram=histogram.create(column) if histogram else None)
+    with profiling.stage("aggregate"):
+        for value in profiling.track("convert", _numeric_column_values(rows, column)):
+            accumulator.add(value)
+    return accumulator
+
+
+def accumulate_dataset(
+    rows: Rows,
+    rejected: Optional[Dict[str, str]] = None,
+    schema: Optional[Schema] = None,
+    histogram: Optional[HistogramSpec] = None,
+) -> Dict[str, NumericAccumulator]:
+    """Stream every numeric-looking column into its own accumulator.
+
+    When ``rejected`` is given it receives the first non-numeric value
+    seen in each column, which is enough to apply the validation of
+    :func:`compute_numeric_summary` to the result later on.  ``schema``
+    behaves as in :func:`summarise_dataset` and ``histogram`` as in
+    :func:`accumulate_column`.
+    """
+
+    if histogram is not None:
+        rows, histogram = sample_histogram(rows, histogram)
+        accumulators: Dict[str, NumericAccumulator] = {}
+        with profiling.stage("aggregate"):
+            for column, number in profiling.track("convert", _numeric_cells(rows, rejected, schema)):
+                accumulator = accumulators.get(column)
+                if accumulator is None:
+                    accumulator = accumulators[column] = NumericAccumulator(histogram=histogram.create(column))
+                accumulator.add(number)
+        return accumulators
+
+    accumulators = defaultdict(NumericAccumulator)
+    with profiling.stage("aggregate"):
+        for column, number in profiling.track("convert", _numeric_cells(rows, rejected, schema)):
+            accumulators[column].add(number)
+    return dict(accumulators)
+
+
+def sample_histogram(
+    rows: Rows,
+    histogram: Optional[HistogramSpec],
+    column: Optional[str] = None,
+) -> Tuple[Rows, Optional[HistogramSpec]]:
+    """Fix missing fixed-width histogram bounds from a sample of ``rows``.
+
+    The sample is the first rows plus, for sequences, rows drawn at random
+    from the rest, as for :func:`~python.schema.infer_schema`.  Iterators
+    are not consumed: the returned rows replay the sampled ones.  Tables
+    are small enough to use every value.  Only ``column`` is sampled when
+    it is given.
     """
 
-    cleaned_values = []
+    if histogram is None or not histogram.needs_sample:
+        return rows, histogram
+    if isinstance(rows, ColumnarTable):
+        if column is not None:
+            return rows, histogram.sampled({column: list(rows.numeric_values(column))})
+        return rows, histogram.sampled({name: list(values) for name, values in rows.numeric_cells()})
+
+    if isinstance(rows, Sequence):
+        sample = list(rows[:DEFAULT_SAMPLE_SIZE])
+        remaining = len(rows) - len(sample)
+        if remaining > 0:
+            picks = random.Random(0).sample(range(len(sample), len(rows)), min(DEFAULT_SAMPLE_SIZE, remaining))
+            sample.extend(rows[index] for index in picks)
+    else:
+        iterator = iter(rows)
+        sample = list(islice(iterator, DEFAULT_SAMPLE_SIZE))
+        rows = chain(sample, iterator)
+
+    values: Dict[str, List[float]] = defaultdict(list)
+    types: Dict[str, str] = {}
+    for row in sample:
+        if column is None:
+            for name, number in _row_numbers(row, types):
+                values[name].append(number)
+            continue
+        try:
+            values[column].append(float(row.get(column)))
+        except (TypeError, ValueError):
+            continue
+    return rows, histogram.sampled(values)
+
+
+def _numeric_column_values(rows: Rows, column: str) -> Iterator[float]:
+    """Yield the cleaned numeric values of ``column``, validating every row."""
+
+    if isinstance(rows, ColumnarTable):
+        yield from rows.numeric_values(column)
+        return
+
     for index, row in enumerate(rows):
         if column not in row:
             available = ", ".join(sorted(row.keys()))
@@ -82,50 +524,396 @@ def compute_numeric_summary(rows: Iterable[Dict[str, str]], column: str) -> Nume
             continue
 
         try:
-            cleaned_values.append(float(value))
+            yield float(value)
         except (TypeError, ValueError) as exc:  # defensive: values might not cast cleanly
             raise ValueError(f"Non-numeric value '{value}' in column '{column}'.") from exc
 
-    if not cleaned_values:
-        raise ValueError(f"Column '{column}' does not contain any numeric values.")
 
-    return NumericSummary(
-        count=len(cleaned_values),
-        mean=mean(cleaned_values),
-        median=median(cleaned_values),
-        stdev=pstdev(cleaned_values) if len(cleaned_values) > 1 else 0.0,
-    )
+def summarise_dataset(
+    rows: Rows,
+    *,
+    streaming: bool = False,
+    backend: str = "pure",
+    schema: Optional[Schema] = None,
+    percentiles: Sequence[float] = (),
+    filter: Optional[Union[str, RowFilter]] = None,
+    histogram: Optional[HistogramSpec] = None,
+    sample_fraction: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, NumericSummary]:
+    """Produce summaries for every numeric-looking column in ``rows``.
 
+    Non-numeric columns are skipped (see :func:`summarise_categorical`
+    for those) and the output is indexed by column name.  This mirrors the
+    type of exploratory analysis performed in the *Applied Data Analysis*
+    module.  ``streaming=True`` keeps one constant-size accumulator per
+    column instead of a list of values, and ``backend`` and
+    ``percentiles`` behave as in :func:`compute_numeric_summary`.
 
-def summarise_dataset(rows: Iterable[Dict[str, str]]) -> Dict[str, NumericSummary]:
-    """Produce summaries for every numeric-looking column in ``rows``.
+    Column types are inferred from a sample of the rows (see
+    :func:`~python.schema.infer_schema`) unless a ``schema`` is supplied,
+    for example one cached from an earlier run.  A supplied schema is
+    updated in place when values turn out not to fit it.
 
-    Non-numeric columns are skipped and the output is indexed by column
-    name.  This mirrors the type of exploratory analysis performed in the
-    *Applied Data Analysis* module.
+    ``filter`` and ``histogram`` behave as in :func:`compute_numeric_summary`.
+
+    ``sample_fraction`` (0-1) estimates the summaries from a uniform
+    random sample of that share of the rows, drawn reproducibly when a
+    ``seed`` is given; see :func:`summarise_sample`.
     """
 
+    use_numpy = _use_numpy(backend)
+    validate_percentiles(percentiles)
+    if sample_fraction is not None:
+        sample, population = sample_rows(rows, sample_fraction, seed)
+        return summarise_sample(
+            sample, population, schema=schema, percentiles=percentiles, filter=filter, histogram=histogram
+        )
+    rows = _apply_filter(rows, filter)
+    if streaming:
+        return {
+            column: NumericSummary.from_accumulator(accumulator, percentiles)
+            for column, accumulator in accumulate_dataset(rows, schema=schema, histogram=histogram).items()
+        }
+
+    if use_numpy:
+        with profiling.stage("convert"):
+            arrays = numpy_backend.dataset_arrays(rows, schema)
+        with profiling.stage("aggregate"):
+            summaries = {}
+            for column, values in arrays.items():
+                summaries[column] = NumericSummary(**numpy_backend.describe(values, percentiles))
+                if histogram is not None:
+                    summaries[column].histogram = histogram.build(column, values.tolist())
+            return summaries
+
     numeric_columns: Dict[str, List[float]] = defaultdict(list)
+    with profiling.stage("aggregate"):
+        for column, number in profiling.track("convert", _numeric_cells(rows, schema=schema)):
+            numeric_columns[column].append(number)
 
-    for row in rows:
-        for key, value in row.items():
-            if value in (None, ""):
-                continue
-            try:
-                numeric_columns[key].append(float(value))
-            except (TypeError, ValueError):
-                # Ignore columns that cannot be converted to numbers.
+        summaries: Dict[str, NumericSummary] = {}
+        for column, values in numeric_columns.items():
+            if not values:
                 continue
+            summaries[column] = _summary_from_values(column, values, percentiles, histogram)
+
+    return summaries
+
 
-    summaries: Dict[str, NumericSummary] = {}
+def summarise_sample(
+    sample: Rows,
+    population: int,
+    *,
+    schema: Optional[Schema] = None,
+    percentiles: Sequence[float] = (),
+    filter: Optional[Union[str, RowFilter]] = None,
+    histogram: Optional[HistogramSpec] = None,
+    confidence: float = DEFAULT_CONFIDENCE,
+    population_error: float = 0.0,
+    block_rows: Sequence[int] = (),
+) -> Dict[str, NumericSummary]:
+    """Estimate the summaries of ``population`` rows from a uniform ``sample`` of them.
+
+    Every summary carries an :class:`~python.sampling.Approximation` with
+    ``confidence`` intervals for its statistics.  ``count`` is scaled up to
+    the population; the other statistics are those of the sample, and so
+    is the histogram.  ``filter`` is applied to the sample, so counts
+    estimate the matching rows of the population.  When the sample holds
+    every row the summaries are exact and carry no approximation.
+    ``population_error`` is the standard error of an estimated
+    ``population`` and ``block_rows`` the sizes of the blocks of
+    consecutive rows the sample was drawn in (see
+    :class:`~python.sampling.CsvSample`); the intervals account for rows
+    of one block being alike.
+    """
+
+    validate_percentiles(percentiles)
+    if not isinstance(sample, ColumnarTable):
+        sample = list(sample)
+    sampled_rows = len(sample)
+    if sampled_rows >= population:
+        return summarise_dataset(sample, schema=schema, percentiles=percentiles, filter=filter, histogram=histogram)
+
+    numeric_columns: Dict[str, List[float]] = defaultdict(list)
+    value_blocks: Dict[str, List[int]] = defaultdict(list)
+    if block_rows:
+        if schema is None:
+            schema = infer_schema(sample)
+        start = 0
+        for block, size in enumerate(block_rows):
+            rows = sample[start : start + size]
+            start += size
+            for column, number in _numeric_cells(_apply_filter(rows, filter), schema=schema):
+                numeric_columns[column].append(number)
+                value_blocks[column].append(block)
+    else:
+        for column, number in _numeric_cells(_apply_filter(sample, filter), schema=schema):
+            numeric_columns[column].append(number)
+    summaries = {}
     for column, values in numeric_columns.items():
         if not values:
             continue
-        summaries[column] = NumericSummary(
-            count=len(values),
-            mean=mean(values),
-            median=median(values),
-            stdev=pstdev(values) if len(values) > 1 else 0.0,
+        # Before the summary reorders the values they are matched with their blocks.
+        intervals = confidence_intervals(
+            values,
+            sampled_rows,
+            population,
+            percentiles,
+            confidence,
+            population_error,
+            block_rows,
+            value_blocks.get(column),
         )
-
+        summary = _summary_from_values(column, values, percentiles, histogram)
+        summary.approximation = Approximation(sampled_rows, population, confidence, intervals)
+        summary.count = scaled_count(summary.count, sampled_rows, population)
+        summaries[column] = summary
     return summaries
+
+
+def accumulate_correlations(rows: Rows, schema: Optional[Schema] = None) -> CoMoments:
+    """Stream the co-moments of every pair of numeric-looking columns.
+
+    Columns are chosen as in :func:`summarise_dataset`; a pair only uses
+    the rows where both of its values are present.
+    """
+
+    moments = CoMoments()
+    with profiling.stage("aggregate"):
+        if isinstance(rows, ColumnarTable):
+            numeric = [(name, column) for name, column in sorted(rows.columns.items()) if isinstance(column, NumericColumn)]
+            cells = [list(zip(column.values, _iter_bits(column.validity, len(column)))) for _, column in numeric]
+            for row in zip(*cells):
+                moments.add_items([(name, value) for (name, _), (value, valid) in zip(numeric, row) if valid])
+            return moments
+
+        if schema is None:
+            rows, schema = _infer_schema(rows)
+        types = schema.columns
+        for row in profiling.track("convert", rows):
+            moments.add_items(sorted(_row_numbers(row, types)))
+    return moments
+
+
+def correlation_matrix(
+    rows: Rows,
+    *,
+    schema: Optional[Schema] = None,
+    filter: Optional[Union[str, RowFilter]] = None,
+) -> CoMoments:
+    """Covariances and Pearson correlations between all numeric columns, in one pass.
+
+    Missing values are handled by pairwise deletion; see
+    :mod:`python.correlations`.  ``schema`` and ``filter`` behave as in
+    :func:`summarise_dataset`.
+    """
+
+    return accumulate_correlations(_apply_filter(rows, filter), schema)
+
+
+def _external_summary(
+    values: Iterable[float],
+    column: str,
+    percentiles: Sequence[float],
+    histogram: Optional[HistogramSpec],
+    memory_budget: int,
+) -> NumericSummary:
+    """Exact summary of ``values`` with the quantiles found out of core."""
+
+    accumulator = NumericAccumulator(histogram=histogram.create(column) if histogram else None)
+    with ExternalQuantiles(memory_budget) as spill:
+        with profiling.stage("aggregate"):
+            for value in profiling.track("convert", values):
+                accumulator.add(value)
+                spill.add(value)
+            if not spill.count:
+                raise ValueError(f"Column '{column}' does not contain any numeric values.")
+            quantiles = spill.quantiles([0.5] + [percentile / 100 for percentile in percentiles])
+    return NumericSummary(
+        count=accumulator.count,
+        mean=accumulator.mean,
+        median=quantiles[0],
+        stdev=accumulator.stdev,
+        minimum=accumulator.minimum,
+        maximum=accumulator.maximum,
+        percentiles=dict(zip(percentiles, quantiles[1:])),
+        histogram=accumulator.histogram,
+    )
+
+
+def _summary_from_values(
+    column: str,
+    values: List[float],
+    percentiles: Sequence[float],
+    histogram: Optional[HistogramSpec],
+) -> NumericSummary:
+    summary = NumericSummary.from_values(values, percentiles)
+    if histogram is not None:
+        summary.histogram = histogram.build(column, values)
+    return summary
+
+
+def accumulate_categorical(
+    rows: Rows,
+    columns: Optional[Sequence[str]] = None,
+    schema: Optional[Schema] = None,
+) -> Dict[str, CategoricalAccumulator]:
+    """Stream text columns into mergeable :class:`~python.sketches.CategoricalAccumulator` objects.
+
+    By default every column the schema does not classify as numeric is
+    included; ``columns`` names the columns explicitly instead, numeric or
+    not.  Blank cells are skipped.  Dictionary-encoded columns of a
+    :class:`~python.columnar.ColumnarTable` are counted by code, so each
+    distinct value is hashed only once.
+    """
+
+    if isinstance(rows, ColumnarTable):
+        return _accumulate_table_categories(rows, columns)
+
+    if columns is None:
+        if schema is None:
+            rows, schema = _infer_schema(rows)
+        selected = [name for name, kind in schema.columns.items() if kind != NUMERIC]
+    else:
+        selected = list(columns)
+    accumulators = {column: CategoricalAccumulator() for column in selected}
+    with profiling.stage("aggregate"):
+        for index, row in enumerate(rows):
+            for column, accumulator in accumulators.items():
+                value = row.get(column)
+                if value is None and columns is not None and column not in row:
+                    available = ", ".join(sorted(key for key in row if isinstance(key, str)))
+                    raise ValueError(
+                        f"Column '{column}' not present in row {index}. "
+                        f"Available columns: {available or 'none'}"
+                    )
+                if value:
+                    accumulator.add(value)
+    return accumulators
+
+
+def _accumulate_table_categories(
+    table: ColumnarTable,
+    columns: Optional[Sequence[str]],
+) -> Dict[str, CategoricalAccumulator]:
+    if columns is None:
+        columns = [name for name, column in table.columns.items() if isinstance(column, CategoricalColumn)]
+    for column in columns:
+        if column not in table:
+            available = ", ".join(sorted(table.columns))
+            raise ValueError(
+                f"Column '{column}' not present in table. Available columns: {available or 'none'}"
+            )
+
+    accumulators = {}
+    with profiling.stage("aggregate"):
+        for name in columns:
+            column = table[name]
+            if isinstance(column, NumericColumn) and column.text is not None:
+                column = column.text  # count the cells as written
+            accumulator = accumulators[name] = CategoricalAccumulator()
+            if isinstance(column, CategoricalColumn):
+                dictionary = column.dictionary
+                for code, count in Counter(column.codes).items():
+                    if code != NULL_CODE and dictionary[code]:
+                        accumulator.add(dictionary[code], count)
+            else:
+                for value, count in Counter(column.valid_values()).items():
+                    accumulator.add(_format_number(value), count)
+    return accumulators
+
+
+def summarise_categorical(
+    rows: Rows,
+    columns: Optional[Sequence[str]] = None,
+    *,
+    top: int = DEFAULT_TOP,
+    schema: Optional[Schema] = None,
+    filter: Optional[Union[str, RowFilter]] = None,
+) -> Dict[str, CategoricalSummary]:
+    """Distinct counts and the ``top`` most frequent values of text columns.
+
+    Memory per column is bounded whatever the number of distinct values;
+    see :func:`accumulate_categorical` for how columns are chosen and
+    :mod:`python.sketches` for the error bounds.  ``schema`` and
+    ``filter`` behave as in :func:`summarise_dataset`.
+    """
+
+    if top < 1:
+        raise ValueError("top must be at least 1")
+    rows = _apply_filter(rows, filter)
+    return {
+        column: CategoricalSummary.from_accumulator(accumulator, top)
+        for column, accumulator in accumulate_categorical(rows, columns, schema).items()
+        if accumulator.count
+    }
+
+
+def _numeric_cells(
+    rows: Rows,
+    rejected: Optional[Dict[str, str]] = None,
+    schema: Optional[Schema] = None,
+) -> Iterator[Tuple[str, float]]:
+    """Yield ``(column, value)`` for every cell that converts to a number.
+
+    Columns the schema does not expect to be numeric are screened with
+    :func:`~python.schema.looks_numeric` first, so text never reaches
+    :func:`float`.  Values that contradict the schema mark the column as
+    mixed, which keeps the result identical to converting every cell.
+    """
+
+    if isinstance(rows, ColumnarTable):
+        for column, values in rows.numeric_cells():
+            for value in values:
+                yield column, value
+        return
+
+    if schema is None:
+        rows, schema = _infer_schema(rows)
+    types = schema.columns
+    for row in rows:
+        yield from _row_numbers(row, types, rejected)
+
+
+def _row_numbers(
+    row: Dict[str, str],
+    types: Dict[str, str],
+    rejected: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[str, float]]:
+    """Yield ``(column, value)`` for the numeric cells of a single row."""
+
+    for key, value in row.items():
+        if value in (None, ""):
+            continue
+        kind = types.get(key)
+        if kind is None:
+            kind = NUMERIC
+            if isinstance(key, str):
+                types[key] = kind
+        if kind != NUMERIC and isinstance(value, str) and not looks_numeric(value):
+            if rejected is not None:
+                rejected.setdefault(key, value)
+            continue
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            # Ignore columns that cannot be converted to numbers.
+            if kind == NUMERIC and key in types:
+                types[key] = MIXED
+            if rejected is not None:
+                rejected.setdefault(key, value)
+            continue
+        if kind == TEXT:
+            types[key] = MIXED
+        yield key, number
+
+
+def _infer_schema(rows: Iterable[Dict[str, str]]) -> Tuple[Iterable[Dict[str, str]], Schema]:
+    """Infer a schema without consuming one-shot iterators."""
+
+    if isinstance(rows, Sequence):
+        return rows, infer_schema(rows)
+    iterator = iter(rows)
+    head = list(islice(iterator, DEFAULT_SAMPLE_SIZE))
+    return chain(head, iterator), infer_schema(head, reservoir_size=0)
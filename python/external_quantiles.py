@@ -0,0 +1,184 @@
+"""Exact quantiles of columns that do not fit in memory.
+
+The exact summaries in :mod:`python.dataset_summary` keep every value in a
+Python list, roughly 32 bytes per float.  :class:`ExternalQuantiles`
+instead buffers values as packed ``float64`` and, whenever the buffer
+reaches the memory budget, sorts it and appends it to a temporary file as
+a sorted run.  Disk space, not memory, then bounds the column size, and
+all runs share that one file, so the number of runs is not limited by open
+file descriptors.
+
+Ranks are found without merging the runs.  The file is memory-mapped once,
+every run is a slice of the mapping, and the value of rank ``k`` is
+located by bisecting the float64 value range.
+Each step counts the values ``<= x`` in every run with a binary search.
+Floats order like their sign-adjusted 64-bit patterns, so at most 64 steps
+are needed.  Each step reads ``O(runs * log(run length))`` values, so a
+query costs milliseconds regardless of the number of rows, and the answer
+is always an actual value of the column.
+
+NaN has no rank and is rejected.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_right
+from typing import IO, Iterable, List, Optional, Sequence, Tuple
+
+from .quantiles import _ranks, interpolate
+
+DEFAULT_MEMORY_BUDGET = 64 * 2**20
+# Sorting a buffer briefly needs a list of float objects next to the
+# packed values: 8 bytes packed + 8 for the list slot + 24 per float.
+_BYTES_PER_VALUE = 40
+_MIN_BUFFER = 1024
+
+_DOUBLE = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+_SIGN = 1 << 63
+
+
+def _key(value: float) -> int:
+    """Map a float to an integer with the same ordering."""
+
+    bits = _INT64.unpack(_DOUBLE.pack(value))[0]
+    return bits if bits >= 0 else -(bits & (_SIGN - 1)) - 1
+
+
+def _value(key: int) -> float:
+    bits = key if key >= 0 else (-(key + 1)) | -_SIGN
+    return _DOUBLE.unpack(_INT64.pack(bits))[0]
+
+
+class ExternalQuantiles:
+    """Collects floats under a memory budget and answers exact quantiles.
+
+    ``memory_budget`` is in bytes; ``directory`` is where runs are spilled
+    (the default temporary directory otherwise).  Use as a context
+    manager, or call :meth:`close`, to delete the runs.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, directory: Optional[str] = None) -> None:
+        if memory_budget <= 0:
+            raise ValueError("memory_budget must be positive")
+        self.count = 0
+        self._capacity = max(memory_budget // _BYTES_PER_VALUE, _MIN_BUFFER)
+        self._directory = directory
+        self._buffer = array("d")
+        self._buffer_sorted = True
+        self._file: Optional[IO[bytes]] = None
+        # (first value, number of values) of every run in the file.
+        self._runs: List[Tuple[int, int]] = []
+        self._mapping: Optional[mmap.mmap] = None
+        self._maps: List[Sequence[float]] = []
+
+    def __enter__(self) -> "ExternalQuantiles":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def spilled_runs(self) -> int:
+        """Number of sorted runs written to disk so far."""
+
+        return len(self._runs)
+
+    def add(self, value: float) -> None:
+        if value != value:
+            raise ValueError("NaN has no rank")
+        self._buffer.append(value)
+        self._buffer_sorted = False
+        self.count += 1
+        if len(self._buffer) >= self._capacity:
+            self._spill()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def _spill(self) -> None:
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self._directory)
+        ordered = array("d", sorted(self._buffer))
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts only
+            ordered.byteswap()
+        self._file.seek(0, 2)
+        start = self._file.tell() // ordered.itemsize
+        ordered.tofile(self._file)
+        self._file.flush()
+        self._runs.append((start, len(ordered)))
+        self._buffer = array("d")
+
+    def _sorted_runs(self) -> List[Sequence[float]]:
+        if len(self._maps) != len(self._runs):
+            # Runs were spilled since the file was last mapped: map it again.
+            self._unmap()
+            assert self._file is not None
+            self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            values = memoryview(self._mapping).cast("d")
+            for start, length in self._runs:
+                view: Sequence[float] = values[start : start + length]
+                if sys.byteorder != "little":  # pragma: no cover - big-endian hosts only
+                    swapped = array("d", view)
+                    swapped.byteswap()
+                    view = swapped
+                self._maps.append(view)
+            values.release()
+        if not self._buffer_sorted:
+            self._buffer = array("d", sorted(self._buffer))
+            self._buffer_sorted = True
+        # The unspilled remainder takes part as one more, in-memory, run.
+        return self._maps + [self._buffer] if self._buffer else self._maps
+
+    def value_at(self, rank: int) -> float:
+        """The value at 0-based ``rank`` in sorted order."""
+
+        if not 0 <= rank < self.count:
+            raise IndexError("rank out of range")
+        runs = self._sorted_runs()
+        low = min(_key(run[0]) for run in runs if len(run))
+        high = max(_key(run[-1]) for run in runs if len(run))
+        # Smallest key whose value has more than ``rank`` values <= it.
+        while low < high:
+            middle = (low + high) // 2
+            pivot = _value(middle)
+            if sum(bisect_right(run, pivot) for run in runs) <= rank:
+                low = middle + 1
+            else:
+                high = middle
+        # -0.0 == 0.0, so the search can stop on -0.0 for a column of zeros.
+        return _value(low) + 0.0
+
+    def quantiles(self, quantiles: Sequence[float]) -> List[float]:
+        """Exact quantiles (0-1), interpolated like :func:`~python.quantiles.select_quantiles`."""
+
+        if not self.count:
+            raise ValueError("cannot compute quantiles of an empty column")
+        results = []
+        for q in quantiles:
+            lower, upper, fraction = _ranks(self.count, q)
+            low_value = self.value_at(lower)
+            results.append(interpolate(low_value, self.value_at(upper) if upper != lower else low_value, fraction))
+        return results
+
+    def _unmap(self) -> None:
+        for view in self._maps:
+            if isinstance(view, memoryview):
+                view.release()
+        self._maps = []
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def close(self) -> None:
+        self._unmap()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._runs = []
@@ -0,0 +1,302 @@
+"""A small, safe expression language for filtering rows.
+
+Expressions use Python syntax but only a tiny subset of it::
+
+    department == 'Data' and tenure_years >= 3
+    not (salary < 50000 or `team name` in ('Ops', 'Sales'))
+    bonus is null
+
+Supported are ``and``, ``or``, ``not``, parentheses, the comparisons
+``== != < <= > >=`` (chains such as ``1 <= x < 5`` included), ``in`` /
+``not in`` with a tuple or list of literals, and ``is null`` /
+``is not null``.  One side of every comparison must be a column and the
+other a string or number literal.  Column names that are not identifiers
+are written in backticks.  Nothing is ever evaluated by Python itself:
+the parsed tree is checked against this whitelist and compiled into
+closures.
+
+Comparisons are typed by their literal.  A number literal compares the
+column as a float, a string literal compares the text as written in the
+file, so ``zip == '02134'`` does not match ``2134``.  Each referenced
+column is converted at most once per row, however many predicates use
+it.  Blank cells, and cells that do not convert to a number, make every
+numeric comparison false (``not`` still inverts the result).
+
+:meth:`RowFilter.mask` evaluates an expression over a whole
+:class:`~python.columnar.ColumnarTable`.  Numeric columns are compared
+value by value, while text columns evaluate each predicate once per
+dictionary entry and then just look codes up.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+import re
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .columnar import ColumnarTable, NumericColumn, _iter_bits
+
+Literal = Union[float, str]
+# Evaluates a predicate given the raw cells and their numeric conversions.
+Predicate = Callable[[Sequence[Optional[str]], Sequence[Optional[float]]], bool]
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+# Used when the literal is written on the left: ``3 < x`` is ``x > 3``.
+_FLIPPED = {ast.Eq: ast.Eq, ast.NotEq: ast.NotEq, ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE}
+_NULL_NAMES = frozenset({"null", "None"})
+_QUOTED = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|`([^`]*)`""")
+
+
+def _to_number(value: Optional[str]) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RowFilter:
+    """A compiled filter expression; call it with a row to test the row."""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self._placeholders: Dict[str, str] = {}
+        source = _QUOTED.sub(self._replace_backticks, expression)
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Invalid filter expression: {expression}") from exc
+
+        self.columns: List[str] = []
+        self._numeric: List[bool] = []
+        self._predicate, self._masker = self._compile(tree.body)
+        self._numeric_positions = [index for index, numeric in enumerate(self._numeric) if numeric]
+
+    def _replace_backticks(self, match: "re.Match[str]") -> str:
+        if match.group(1) is not None:
+            return match.group(1)
+        placeholder = f"__column_{len(self._placeholders)}__"
+        self._placeholders[placeholder] = match.group(2)
+        return placeholder
+
+    # -- evaluation ------------------------------------------------------
+
+    def __call__(self, row: Mapping[str, Optional[str]]) -> bool:
+        try:
+            cells = [row[column] for column in self.columns]
+        except KeyError as exc:
+            available = ", ".join(sorted(key for key in row if isinstance(key, str)))
+            raise ValueError(
+                f"Filter column '{exc.args[0]}' not present in row. "
+                f"Available columns: {available or 'none'}"
+            ) from None
+        return self.test(cells)
+
+    def test(self, cells: Sequence[Optional[str]]) -> bool:
+        """Evaluate the filter on the raw values of :attr:`columns`, in order."""
+
+        numbers: List[Optional[float]] = [None] * len(cells)
+        for index in self._numeric_positions:
+            numbers[index] = _to_number(cells[index])
+        return self._predicate(cells, numbers)
+
+    def mask(self, table: ColumnarTable) -> List[bool]:
+        """Evaluate the filter for every row of ``table`` at once."""
+
+        for column in self.columns:
+            if column not in table:
+                available = ", ".join(sorted(table.columns))
+                raise ValueError(
+                    f"Filter column '{column}' not present in table. "
+                    f"Available columns: {available or 'none'}"
+                )
+        return self._masker(table)
+
+    # -- compilation -----------------------------------------------------
+
+    def _column(self, name: str, numeric: bool) -> int:
+        name = self._placeholders.get(name, name)
+        if name not in self.columns:
+            self.columns.append(name)
+            self._numeric.append(False)
+        index = self.columns.index(name)
+        self._numeric[index] = self._numeric[index] or numeric
+        return index
+
+    def _unsupported(self, node: ast.AST) -> ValueError:
+        return ValueError(f"Unsupported syntax in filter expression: {ast.unparse(node)}")
+
+    def _compile(self, node: ast.AST) -> Tuple[Predicate, Callable[[ColumnarTable], List[bool]]]:
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value) for value in node.values]
+            predicates = [predicate for predicate, _ in parts]
+            maskers = [masker for _, masker in parts]
+            if isinstance(node.op, ast.And):
+                return (
+                    lambda cells, numbers: all(predicate(cells, numbers) for predicate in predicates),
+                    lambda table: _combine([masker(table) for masker in maskers], all),
+                )
+            return (
+                lambda cells, numbers: any(predicate(cells, numbers) for predicate in predicates),
+                lambda table: _combine([masker(table) for masker in maskers], any),
+            )
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            predicate, masker = self._compile(node.operand)
+            return (
+                lambda cells, numbers: not predicate(cells, numbers),
+                lambda table: [not value for value in masker(table)],
+            )
+        if isinstance(node, ast.Compare):
+            parts = []
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                parts.append(self._comparison(left, op, right, node))
+                left = right
+            if len(parts) == 1:
+                return parts[0]
+            predicates = [predicate for predicate, _ in parts]
+            maskers = [masker for _, masker in parts]
+            return (
+                lambda cells, numbers: all(predicate(cells, numbers) for predicate in predicates),
+                lambda table: _combine([masker(table) for masker in maskers], all),
+            )
+        raise self._unsupported(node)
+
+    def _comparison(
+        self,
+        left: ast.AST,
+        op: ast.cmpop,
+        right: ast.AST,
+        node: ast.AST,
+    ) -> Tuple[Predicate, Callable[[ColumnarTable], List[bool]]]:
+        if isinstance(op, (ast.Is, ast.IsNot)):
+            if not (isinstance(left, ast.Name) and _is_null(right)):
+                raise self._unsupported(node)
+            index = self._column(left.id, numeric=False)
+            name = self.columns[index]
+            wanted_null = isinstance(op, ast.Is)
+            return (
+                lambda cells, numbers: (cells[index] in (None, "")) is wanted_null,
+                lambda table: [(value is None) is wanted_null for value in _cells(table, name)],
+            )
+
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not isinstance(left, ast.Name) or not isinstance(right, (ast.Tuple, ast.List, ast.Set)):
+                raise self._unsupported(node)
+            literals = [_literal(element) for element in right.elts]
+            if any(literal is None for literal in literals):
+                raise self._unsupported(node)
+            numeric = all(isinstance(literal, float) for literal in literals)
+            members = frozenset(literals if numeric else (_as_text(literal) for literal in literals))
+            test: Callable[[Literal], bool]
+            if isinstance(op, ast.In):
+                test = members.__contains__
+            else:
+                test = lambda value: value not in members  # noqa: E731
+            return self._typed(left.id, numeric, test)
+
+        compare = _COMPARISONS.get(type(op))
+        if compare is None:
+            raise self._unsupported(node)
+        if isinstance(left, ast.Name) and _literal(right) is not None:
+            name, literal = left.id, _literal(right)
+        elif isinstance(right, ast.Name) and _literal(left) is not None:
+            name, literal = right.id, _literal(left)
+            compare = _COMPARISONS[_FLIPPED[type(op)]]
+        else:
+            raise self._unsupported(node)
+        return self._typed(name, isinstance(literal, float), lambda value: compare(value, literal))
+
+    def _typed(
+        self,
+        name: str,
+        numeric: bool,
+        test: Callable[[Literal], bool],
+    ) -> Tuple[Predicate, Callable[[ColumnarTable], List[bool]]]:
+        index = self._column(name, numeric)
+        column = self.columns[index]
+        if numeric:
+            def predicate(cells: Sequence[Optional[str]], numbers: Sequence[Optional[float]]) -> bool:
+                value = numbers[index]
+                return value is not None and test(value)
+        else:
+            def predicate(cells: Sequence[Optional[str]], numbers: Sequence[Optional[float]]) -> bool:
+                value = cells[index]
+                return value is not None and value != "" and test(value)
+        return predicate, lambda table: _column_mask(table, column, numeric, test)
+
+
+def compile_filter(expression: Union[str, RowFilter]) -> RowFilter:
+    """Compile ``expression``; already compiled filters are returned unchanged."""
+
+    return expression if isinstance(expression, RowFilter) else RowFilter(expression)
+
+
+def filter_table(table: ColumnarTable, row_filter: RowFilter) -> ColumnarTable:
+    """Return the rows of ``table`` that satisfy ``row_filter``."""
+
+    return table.select(row_filter.mask(table))
+
+
+def _is_null(node: ast.AST) -> bool:
+    return (isinstance(node, ast.Name) and node.id in _NULL_NAMES) or (
+        isinstance(node, ast.Constant) and node.value is None
+    )
+
+
+def _literal(node: ast.AST) -> Optional[Literal]:
+    sign = None
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        sign = -1.0 if isinstance(node.op, ast.USub) else 1.0
+        node = node.operand
+    if not isinstance(node, ast.Constant) or isinstance(node.value, bool):
+        return None
+    if isinstance(node.value, (int, float)):
+        return (sign or 1.0) * float(node.value)
+    if isinstance(node.value, str) and sign is None:
+        return node.value
+    return None
+
+
+def _as_text(literal: Literal) -> str:
+    if isinstance(literal, str):
+        return literal
+    return str(int(literal)) if literal.is_integer() else repr(literal)
+
+
+def _combine(masks: List[List[bool]], reducer: Callable[[Tuple[bool, ...]], bool]) -> List[bool]:
+    return [reducer(values) for values in zip(*masks)]
+
+
+def _cells(table: ColumnarTable, name: str) -> List[Optional[str]]:
+    column = table[name]
+    return [column.value_at(index) for index in range(len(table))]
+
+
+def _column_mask(table: ColumnarTable, name: str, numeric: bool, test: Callable[[Literal], bool]) -> List[bool]:
+    column = table[name]
+    if isinstance(column, NumericColumn):
+        if numeric:
+            return [
+                bool(valid) and test(value)
+                for value, valid in zip(column.values, _iter_bits(column.validity, len(column)))
+            ]
+        return [value is not None and test(value) for value in _cells(table, name)]
+
+    # Evaluate once per distinct value, then look every row up by its code.
+    if numeric:
+        numbers = [_to_number(value) for value in column.dictionary]
+        outcomes = [number is not None and test(number) for number in numbers]
+    else:
+        outcomes = [value != "" and test(value) for value in column.dictionary]
+    outcomes.append(False)  # blanks are stored as NULL_CODE, i.e. -1
+    return [outcomes[code] for code in column.codes]
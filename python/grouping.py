@@ -0,0 +1,145 @@
+"""Per-group numeric summaries computed with a single hash aggregation.
+
+Filtering the rows for every group and calling
+:func:`~python.dataset_summary.compute_numeric_summary` once per group
+reads the data once per group.  :func:`summarise_grouped` reads it once:
+each row is routed by its key to a dictionary of streaming
+:class:`~python.streaming.NumericAccumulator` objects.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .columnar import ColumnarTable
+from .dataset_summary import NumericSummary, Rows, _apply_filter, _infer_schema, _row_numbers
+from .filters import RowFilter
+from .schema import Schema
+from .streaming import NumericAccumulator
+
+GroupKey = Tuple[Optional[str], ...]
+
+
+def summarise_grouped(
+    rows: Rows,
+    by: Sequence[str],
+    columns: Optional[Sequence[str]] = None,
+    *,
+    max_groups: Optional[int] = None,
+    schema: Optional[Schema] = None,
+    percentiles: Sequence[float] = (),
+    filter: Optional[Union[str, RowFilter]] = None,
+) -> Dict[GroupKey, Dict[str, NumericSummary]]:
+    """Summarise numeric columns for every distinct combination of ``by`` values.
+
+    Parameters
+    ----------
+    rows:
+        Dictionary rows or a :class:`~python.columnar.ColumnarTable`.
+        Keys are the cells as written whatever the storage, so ``"02134"``
+        and ``"2134"`` stay apart; blank key cells of a table are keyed as
+        ``""`` like those of CSV rows.
+    by:
+        One or more grouping columns; the result is keyed by tuples of
+        their values in the same order.
+    columns:
+        Columns to summarise.  They are validated like
+        :func:`~python.dataset_summary.compute_numeric_summary`.  By default
+        every numeric-looking column other than the grouping columns is
+        summarised, like :func:`~python.dataset_summary.summarise_dataset`.
+    max_groups:
+        Raise :class:`ValueError` as soon as more distinct keys than this
+        are seen, protecting against accidentally grouping by an ID column.
+    percentiles:
+        Extra percentiles (0-100) estimated from each group's sketch.
+    filter:
+        Only rows matching this expression are grouped (see
+        :mod:`python.filters`).
+    """
+
+    if not by:
+        raise ValueError("At least one grouping column is required.")
+    rows = _apply_filter(rows, filter)
+    grouping = tuple(by)
+    if isinstance(rows, ColumnarTable):
+        rows = _blank_keys(rows.rows(), grouping)
+    if columns is None and schema is None:
+        rows, schema = _infer_schema(rows)
+
+    groups: Dict[GroupKey, Dict[str, NumericAccumulator]] = {}
+    for index, row in enumerate(rows):
+        key = _group_key(row, grouping, index)
+        accumulators = groups.get(key)
+        if accumulators is None:
+            if max_groups is not None and len(groups) >= max_groups:
+                raise ValueError(f"More than {max_groups} groups for {', '.join(grouping)}.")
+            accumulators = groups[key] = {}
+
+        if columns is None:
+            for column, number in _row_numbers(row, schema.columns):
+                if column not in grouping:
+                    _accumulator(accumulators, column).add(number)
+        else:
+            for column in columns:
+                number = _strict_value(row, column, index)
+                if number is not None:
+                    _accumulator(accumulators, column).add(number)
+
+    return {key: _summaries(accumulators, columns, percentiles) for key, accumulators in groups.items()}
+
+
+def _blank_keys(rows: Iterable[Dict[str, Optional[str]]], by: Tuple[str, ...]) -> Iterator[Dict[str, str]]:
+    """Replace the ``None`` tables use for blank key cells by the ``""`` of CSV rows."""
+
+    for row in rows:
+        for column in by:
+            if column in row and row[column] is None:
+                row[column] = ""
+        yield row
+
+
+def _group_key(row: Dict[str, str], by: Tuple[str, ...], index: int) -> GroupKey:
+    try:
+        return tuple(row[column] for column in by)
+    except KeyError as exc:
+        available = ", ".join(sorted(row.keys()))
+        raise ValueError(
+            f"Grouping column '{exc.args[0]}' not present in row {index}. "
+            f"Available columns: {available or 'none'}"
+        ) from None
+
+
+def _strict_value(row: Dict[str, str], column: str, index: int) -> Optional[float]:
+    if column not in row:
+        available = ", ".join(sorted(row.keys()))
+        raise ValueError(
+            f"Column '{column}' not present in row {index}. "
+            f"Available columns: {available or 'none'}"
+        )
+    value = row[column]
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Non-numeric value '{value}' in column '{column}'.") from exc
+
+
+def _accumulator(accumulators: Dict[str, NumericAccumulator], column: str) -> NumericAccumulator:
+    accumulator = accumulators.get(column)
+    if accumulator is None:
+        accumulator = accumulators[column] = NumericAccumulator()
+    return accumulator
+
+
+def _summaries(
+    accumulators: Dict[str, NumericAccumulator],
+    columns: Optional[Iterable[str]],
+    percentiles: Sequence[float],
+) -> Dict[str, NumericSummary]:
+    names: List[str] = list(columns) if columns is not None else list(accumulators)
+    return {
+        name: NumericSummary.from_accumulator(accumulators[name], percentiles)
+        for name in names
+        if name in accumulators and accumulators[name].count
+    }
@@ -0,0 +1,302 @@
+"""Streaming, mergeable histograms of numeric columns.
+
+Two kinds of histogram are available:
+
+* :class:`FixedWidthHistogram` splits ``[lower, upper]`` into equally wide
+  bins.  Values outside the range are counted as ``underflow`` and
+  ``overflow`` rather than dropped.
+* :class:`LogHistogram` uses bins whose edges are powers of ten, split
+  into ``bins_per_decade`` steps, with separate bins for negative values
+  and a counter for zeros.  It needs no bounds, which suits long-tailed
+  columns such as salaries.
+
+Both keep a fixed amount of state, are filled in the same pass as a
+:class:`~python.streaming.NumericAccumulator` and can be merged.  Merging
+fixed-width histograms needs identical bins, so every chunk or worker of
+one summary must be created from the same :class:`HistogramSpec`.  When a
+spec has no explicit bounds the summary functions fix them per column
+from a sample of the rows before the first value is added (see
+:meth:`HistogramSpec.sampled`).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+LINEAR = "linear"
+LOG = "log"
+KINDS = (LINEAR, LOG)
+
+DEFAULT_BINS = 20
+DEFAULT_BINS_PER_DECADE = 5
+
+Bin = Tuple[float, float, int]
+
+
+class FixedWidthHistogram:
+    """Counts of values in ``bins`` equally wide bins between two bounds.
+
+    The last bin includes ``upper``.  NaN is counted as overflow.
+    """
+
+    kind = LINEAR
+
+    def __init__(self, lower: float, upper: float, bins: int = DEFAULT_BINS) -> None:
+        if not (math.isfinite(lower) and math.isfinite(upper) and lower < upper):
+            raise ValueError("histogram bounds must be finite with lower < upper")
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        self.lower = lower
+        self.upper = upper
+        self.counts = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+        self._scale = bins / (upper - lower)
+
+    def add(self, value: float) -> None:
+        if value < self.lower:
+            self.underflow += 1
+        elif value < self.upper:
+            # min() guards against rounding just below upper.
+            self.counts[min(int((value - self.lower) * self._scale), len(self.counts) - 1)] += 1
+        elif value == self.upper:
+            self.counts[-1] += 1
+        else:
+            self.overflow += 1
+
+    def merge(self, other: "FixedWidthHistogram") -> "FixedWidthHistogram":
+        """Add the counts of ``other`` in place and return ``self``."""
+
+        if not isinstance(other, FixedWidthHistogram) or (other.lower, other.upper, len(other.counts)) != (
+            self.lower,
+            self.upper,
+            len(self.counts),
+        ):
+            raise ValueError("cannot merge histograms with different bins")
+        self.counts = [left + right for left, right in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def bins(self) -> List[Bin]:
+        """``(lower, upper, count)`` for every bin, in order."""
+
+        width = (self.upper - self.lower) / len(self.counts)
+        edges = [self.lower + index * width for index in range(len(self.counts))] + [self.upper]
+        return [(edges[index], edges[index + 1], count) for index, count in enumerate(self.counts)]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "kind": self.kind,
+            "bins": [{"lower": lower, "upper": upper, "count": count} for lower, upper, count in self.bins()],
+            "underflow": self.underflow,
+            "overflow": self.overflow,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> "FixedWidthHistogram":
+        bins = data["bins"]
+        histogram = cls(bins[0]["lower"], bins[-1]["upper"], len(bins))
+        histogram.counts = [entry["count"] for entry in bins]
+        histogram.underflow = data["underflow"]
+        histogram.overflow = data["overflow"]
+        return histogram
+
+
+class LogHistogram:
+    """Counts of values in logarithmic bins, ``bins_per_decade`` per power of ten.
+
+    Bin ``i`` of either sign holds magnitudes in
+    ``[10 ** (i / bins_per_decade), 10 ** ((i + 1) / bins_per_decade))``.
+    Infinities are counted as underflow or overflow, NaN as overflow.
+    """
+
+    kind = LOG
+
+    def __init__(self, bins_per_decade: int = DEFAULT_BINS_PER_DECADE) -> None:
+        if bins_per_decade < 1:
+            raise ValueError("bins_per_decade must be >= 1")
+        self.bins_per_decade = bins_per_decade
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, value: float) -> None:
+        if value > 0:
+            if value == math.inf:
+                self.overflow += 1
+                return
+            store = self.positive
+        elif value < 0:
+            if value == -math.inf:
+                self.underflow += 1
+                return
+            store = self.negative
+            value = -value
+        elif value == 0:
+            self.zero += 1
+            return
+        else:
+            self.overflow += 1
+            return
+        index = math.floor(math.log10(value) * self.bins_per_decade)
+        store[index] = store.get(index, 0) + 1
+
+    def merge(self, other: "LogHistogram") -> "LogHistogram":
+        """Add the counts of ``other`` in place and return ``self``."""
+
+        if not isinstance(other, LogHistogram) or other.bins_per_decade != self.bins_per_decade:
+            raise ValueError("cannot merge histograms with different bins")
+        for store, extra in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in extra.items():
+                store[index] = store.get(index, 0) + count
+        self.zero += other.zero
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def _edge(self, index: int) -> float:
+        return 10.0 ** (index / self.bins_per_decade)
+
+    def bins(self) -> List[Bin]:
+        """``(lower, upper, count)`` for every non-empty bin, from negative to positive."""
+
+        result = [
+            (-self._edge(index + 1), -self._edge(index), self.negative[index])
+            for index in sorted(self.negative, reverse=True)
+        ]
+        if self.zero:
+            result.append((0.0, 0.0, self.zero))
+        result.extend(
+            (self._edge(index), self._edge(index + 1), self.positive[index]) for index in sorted(self.positive)
+        )
+        return result
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "kind": self.kind,
+            "bins_per_decade": self.bins_per_decade,
+            "bins": [{"lower": lower, "upper": upper, "count": count} for lower, upper, count in self.bins()],
+            "underflow": self.underflow,
+            "overflow": self.overflow,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> "LogHistogram":
+        histogram = cls(data["bins_per_decade"])
+        for entry in data["bins"]:
+            lower, upper, count = entry["lower"], entry["upper"], entry["count"]
+            if lower == upper == 0:
+                histogram.zero = count
+            elif lower > 0:
+                histogram.positive[round(math.log10(lower) * histogram.bins_per_decade)] = count
+            else:
+                histogram.negative[round(math.log10(-upper) * histogram.bins_per_decade)] = count
+        histogram.underflow = data["underflow"]
+        histogram.overflow = data["overflow"]
+        return histogram
+
+
+Histogram = Union[FixedWidthHistogram, LogHistogram]
+
+
+def histogram_from_dict(data: Mapping[str, object]) -> Histogram:
+    """Rebuild a histogram from the output of its ``as_dict``."""
+
+    if data.get("kind") == LOG:
+        return LogHistogram.from_dict(data)
+    return FixedWidthHistogram.from_dict(data)
+
+
+@dataclass(frozen=True)
+class HistogramSpec:
+    """Describes the histogram to build for every summarised column.
+
+    ``bins`` is the number of bins of a ``"linear"`` histogram, or the
+    number of bins per decade of a ``"log"`` one.  ``bounds`` applies to
+    every column; ``column_bounds`` holds per-column bounds, normally
+    filled in by :meth:`sampled`.
+    """
+
+    kind: str = LINEAR
+    bins: Optional[int] = None
+    bounds: Optional[Tuple[float, float]] = None
+    column_bounds: Optional[Dict[str, Tuple[float, float]]] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in KINDS:
+            raise ValueError(f"Unknown histogram kind '{self.kind}'. Choose one of: {', '.join(KINDS)}")
+        if self.bins is not None and self.bins < 1:
+            raise ValueError("bins must be >= 1")
+        if self.bounds is not None and not self.bounds[0] < self.bounds[1]:
+            raise ValueError("histogram bounds must satisfy lower < upper")
+
+    @property
+    def needs_sample(self) -> bool:
+        """``True`` when bin bounds still have to be taken from the data."""
+
+        return self.kind == LINEAR and self.bounds is None and self.column_bounds is None
+
+    def sampled(self, samples: Mapping[str, Iterable[float]]) -> "HistogramSpec":
+        """Fix per-column bounds to the range of a sample of each column.
+
+        Columns without finite values in the sample get the bounds
+        ``(0, 1)``, so histograms created from the result always merge.
+        A constant sample is widened by 1, or by a width relative to its
+        magnitude where adding 1 would not change it.
+        """
+
+        column_bounds = dict(self.column_bounds or {})
+        for column, values in samples.items():
+            finite = [value for value in values if math.isfinite(value)]
+            if finite and column not in column_bounds:
+                lower, upper = min(finite), max(finite)
+                column_bounds[column] = (lower, upper) if lower < upper else _widened(lower)
+        return replace(self, column_bounds=column_bounds)
+
+    def create(self, column: str) -> Histogram:
+        """An empty histogram for ``column``."""
+
+        if self.kind == LOG:
+            return LogHistogram(self.bins or DEFAULT_BINS_PER_DECADE)
+        lower, upper = self.bounds or (self.column_bounds or {}).get(column, (0.0, 1.0))
+        return FixedWidthHistogram(lower, upper, self.bins or DEFAULT_BINS)
+
+    def build(self, column: str, values: Sequence[float]) -> Histogram:
+        """A histogram of ``values``, with bounds from their full range if needed."""
+
+        spec = self.sampled({column: values}) if self.needs_sample else self
+        histogram = spec.create(column)
+        for value in values:
+            histogram.add(value)
+        return histogram
+
+
+def _widened(value: float) -> Tuple[float, float]:
+    """Bounds with ``lower < upper`` around a constant ``value``."""
+
+    width = max(1.0, abs(value) * 2.0**-40)
+    upper = value + width
+    return (value, upper) if math.isfinite(upper) else (value - width, value)
+
+
+def parse_bounds(text: str) -> Tuple[float, float]:
+    """Parse ``"LOWER:UPPER"`` as used by the ``--histogram-range`` option."""
+
+    lower, separator, upper = text.partition(":")
+    try:
+        bounds = (float(lower), float(upper))
+    except ValueError:
+        bounds = None
+    if (
+        not separator
+        or bounds is None
+        or not all(math.isfinite(bound) for bound in bounds)
+        or not bounds[0] < bounds[1]
+    ):
+        raise ValueError(f"Invalid histogram range '{text}'. Expected finite LOWER:UPPER with LOWER < UPPER.")
+    return bounds
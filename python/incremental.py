@@ -0,0 +1,253 @@
+"""Incremental summaries of append-only CSV files.
+
+Log-style CSV files only ever grow at the end.  Rather than re-reading the
+whole file on every run, :func:`summarise_incremental` keeps a small state
+file next to the CSV recording
+
+* the byte offset of the last complete record that was processed,
+* the header and the mergeable per-column
+  :class:`~python.streaming.NumericAccumulator` state, and
+* hashes of the first and last processed blocks.
+
+A later run checks the two hashes; when they still match only the bytes
+after the stored offset are parsed and merged in.  If the prefix changed
+(the file was rewritten or truncated) the state is discarded and the file
+is scanned from the start.
+"""
+
+from __future__ import annotations
+
+import base64
+import codecs
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .compression import detect_compression
+from .dataset_summary import NumericSummary, accumulate_dataset
+from .streaming import NumericAccumulator
+
+STATE_SUFFIX = ".summary-state.json"
+STATE_VERSION = 1
+_HASH_BLOCK = 64 * 1024
+_READ_BLOCK = 8 * 1024 * 1024
+
+
+def default_state_path(path: str | Path) -> Path:
+    csv_path = Path(path)
+    return csv_path.with_name(csv_path.name + STATE_SUFFIX)
+
+
+@dataclass
+class IncrementalState:
+    """Progress through one CSV file plus the aggregates collected so far."""
+
+    offset: int = 0
+    header: List[str] = field(default_factory=list)
+    first_block_hash: str = ""
+    last_block_hash: str = ""
+    accumulators: Dict[str, NumericAccumulator] = field(default_factory=dict)
+    rejected: Dict[str, str] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": STATE_VERSION,
+                "offset": self.offset,
+                "header": self.header,
+                "first_block_hash": self.first_block_hash,
+                "last_block_hash": self.last_block_hash,
+                "accumulators": {
+                    name: base64.b64encode(accumulator.to_bytes()).decode("ascii")
+                    for name, accumulator in self.accumulators.items()
+                },
+                "rejected": self.rejected,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "IncrementalState":
+        data = json.loads(text)
+        if data.get("version") != STATE_VERSION:
+            raise ValueError("unsupported incremental state version")
+        return cls(
+            offset=data["offset"],
+            header=data["header"],
+            first_block_hash=data["first_block_hash"],
+            last_block_hash=data["last_block_hash"],
+            accumulators={
+                name: NumericAccumulator.from_bytes(base64.b64decode(encoded))
+                for name, encoded in data["accumulators"].items()
+            },
+            rejected=data["rejected"],
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["IncrementalState"]:
+        try:
+            return cls.from_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, path: Path) -> None:
+        # A temporary file of its own per run, so that concurrent runs never
+        # write into each other's file before it replaces the state.
+        handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as output:
+                output.write(self.to_json())
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+
+def _block_hashes(handle, offset: int) -> Tuple[str, str]:
+    handle.seek(0)
+    first = hashlib.sha256(handle.read(min(_HASH_BLOCK, offset))).hexdigest()
+    start = max(0, offset - _HASH_BLOCK)
+    handle.seek(start)
+    last = hashlib.sha256(handle.read(offset - start)).hexdigest()
+    return first, last
+
+
+def _prefix_unchanged(handle, size: int, state: IncrementalState) -> bool:
+    if state.offset > size:
+        return False
+    return _block_hashes(handle, state.offset) == (state.first_block_hash, state.last_block_hash)
+
+
+def _last_record_end(data: bytes) -> int:
+    """Offset just past the last newline in ``data`` that ends a record."""
+
+    position = last = 0
+    in_quotes = 0
+    while True:
+        newline = data.find(b"\n", position)
+        if newline == -1:
+            return last
+        in_quotes ^= data.count(b'"', position, newline) & 1
+        position = newline + 1
+        if not in_quotes:
+            last = position
+
+
+def _complete_records(handle, offset: int) -> Iterator[Tuple[bytes, Optional[int]]]:
+    """Yield ``(records, end_offset)`` pieces that end on record boundaries.
+
+    A trailing partial record is yielded last with ``end_offset`` of
+    ``None``: it is summarised but not committed to the state, because
+    more of it may still be appended.
+    """
+
+    handle.seek(offset)
+    pending = b""
+    while True:
+        block = handle.read(_READ_BLOCK)
+        if not block:
+            break
+        pending += block
+        cut = _last_record_end(pending)
+        if cut:
+            offset += cut
+            yield pending[:cut], offset
+            pending = pending[cut:]
+    if pending:
+        yield pending, None
+
+
+def summarise_incremental(
+    path: str | Path,
+    column: Optional[str] = None,
+    state_path: str | Path | None = None,
+    percentiles: Sequence[float] = (),
+) -> Dict[str, NumericSummary]:
+    """Summarise ``path``, parsing only bytes appended since the last run.
+
+    The result matches :func:`~python.dataset_summary.compute_numeric_summary`
+    when ``column`` is given and :func:`~python.dataset_summary.summarise_dataset`
+    otherwise, with medians and ``percentiles`` following the bound in
+    :mod:`python.streaming`.
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if detect_compression(csv_path) is not None:
+        raise ValueError(f"Incremental summaries need an uncompressed CSV file: {csv_path}")
+    state_file = Path(state_path) if state_path is not None else default_state_path(csv_path)
+
+    with csv_path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        state = IncrementalState.load(state_file)
+        if state is None or not _prefix_unchanged(handle, size, state):
+            state = IncrementalState()
+
+        header = state.header
+        tail: Dict[str, NumericAccumulator] = {}
+        rejected = state.rejected
+        for piece, end in _complete_records(handle, state.offset):
+            # The tail may stop inside a multi-byte character that is still
+            # being written; the incremental decoder leaves those bytes out.
+            # The piece holding the header may open with a byte order mark.
+            decoder = codecs.getincrementaldecoder("utf-8" if header else "utf-8-sig")()
+            text = io.StringIO(decoder.decode(piece, final=end is not None), newline="")
+            reader = csv.DictReader(text, fieldnames=header or None)
+            if end is None:
+                rejected = dict(state.rejected)
+                tail = accumulate_dataset(reader, rejected)
+            else:
+                _merge_into(state.accumulators, accumulate_dataset(reader, state.rejected))
+                state.offset = end
+            header = header or list(reader.fieldnames or [])
+            if end is not None:
+                state.header = header
+
+        state.first_block_hash, state.last_block_hash = _block_hashes(handle, state.offset)
+
+    state.save(state_file)
+    # The state is persisted; the uncommitted tail only affects this result.
+    _merge_into(state.accumulators, tail)
+    return _summaries(state.accumulators, header, rejected, column, percentiles)
+
+
+def _merge_into(target: Dict[str, NumericAccumulator], source: Dict[str, NumericAccumulator]) -> None:
+    for name, accumulator in source.items():
+        if name in target:
+            target[name].merge(accumulator)
+        else:
+            target[name] = accumulator
+
+
+def _summaries(
+    accumulators: Dict[str, NumericAccumulator],
+    header: List[str],
+    rejected: Dict[str, str],
+    column: Optional[str],
+    percentiles: Sequence[float],
+) -> Dict[str, NumericSummary]:
+    if column is None:
+        return {
+            name: NumericSummary.from_accumulator(accumulator, percentiles)
+            for name, accumulator in accumulators.items()
+            if accumulator.count
+        }
+
+    if column not in header:
+        available = ", ".join(sorted(header))
+        raise ValueError(
+            f"Column '{column}' not present in file header. "
+            f"Available columns: {available or 'none'}"
+        )
+    if column in rejected:
+        raise ValueError(f"Non-numeric value '{rejected[column]}' in column '{column}'.")
+    accumulator = accumulators.get(column)
+    if accumulator is None or not accumulator.count:
+        raise ValueError(f"Column '{column}' does not contain any numeric values.")
+    return {column: NumericSummary.from_accumulator(accumulator, percentiles)}
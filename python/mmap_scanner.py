@@ -0,0 +1,252 @@
+"""Memory-mapped scanning of numeric CSV columns.
+
+:func:`python.dataset_summary.load_csv` decodes the whole file and builds
+a string for every field.  The scanner below maps the file into memory
+instead, locates field boundaries directly in the raw bytes and converts
+only the requested fields, handing :class:`memoryview` slices straight to
+:func:`float`.  Files that are already in the page cache are therefore
+never copied into Python strings.
+
+Records are split on commas in the raw bytes.  Only records with a field
+that opens with a quote are decoded and parsed with the :mod:`csv`
+module, which also finds newlines inside their quoted fields, so results
+never differ from it; a quote inside an unquoted field is plain text.  A
+UTF-8 byte order mark is skipped, as :func:`~python.compression.open_text`
+does.  Compressed files cannot be scanned in place and are read through the
+:mod:`csv` module as a whole.
+
+Outside strict mode, columns are classified once from a sample of rows
+with :func:`~python.schema.infer_schema`.  Cells of text columns are
+screened with a cheap byte test before :func:`float`, so text never
+raises an exception per cell.
+"""
+
+from __future__ import annotations
+
+import csv
+import mmap
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .compression import compression_of, open_text
+from .dataset_summary import NumericSummary, accumulate_column, accumulate_dataset, iter_csv
+from .schema import DEFAULT_SAMPLE_SIZE, NUMERIC, Schema, infer_schema, looks_numeric
+from .streaming import NumericAccumulator
+
+_BOM = b"\xef\xbb\xbf"
+_NUMERIC_STARTS = frozenset(bytes([byte]) for byte in b"0123456789+-.")
+_SPECIAL_VALUES = frozenset({b"inf", b"infinity", b"nan"})
+
+
+def needs_csv_fallback(data: bytes | mmap.mmap) -> bool:
+    """Return ``True`` when the bytes cannot be scanned in place at all."""
+
+    return compression_of(data[:6]) is not None
+
+
+def scan_numeric_columns(
+    path: str | Path,
+    columns: Optional[Iterable[str]] = None,
+    *,
+    strict: bool = False,
+) -> Dict[str, NumericAccumulator]:
+    """Accumulate numeric columns of ``path`` without decoding the file.
+
+    ``columns`` limits the fields that are converted; by default every
+    column is tried.  With ``strict=True`` a non-numeric value raises a
+    :class:`ValueError` like :func:`~python.dataset_summary.compute_numeric_summary`,
+    otherwise such cells are skipped like
+    :func:`~python.dataset_summary.summarise_dataset`.
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if csv_path.stat().st_size == 0:
+        return {}
+
+    with csv_path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if needs_csv_fallback(mapped):
+            return _scan_with_csv_module(csv_path, columns, strict)
+        schema = None if strict else _sample_schema(csv_path)
+        view = memoryview(mapped)
+        try:
+            return _scan_mapped(mapped, view, columns, strict, schema)
+        finally:
+            view.release()
+
+
+def _sample_schema(path: Path) -> Schema:
+    """Column types from the first rows, as the :mod:`csv` based summaries infer them."""
+
+    with open_text(path) as handle:
+        return infer_schema(list(islice(csv.DictReader(handle), DEFAULT_SAMPLE_SIZE)), reservoir_size=0)
+
+
+def _record(mapped: mmap.mmap, start: int, size: int) -> Tuple[int, int, Optional[List[str]]]:
+    """Return the end of the record at ``start`` and the start of the next one.
+
+    A record with a field that opens with a quote is parsed by :mod:`csv`,
+    which also finds its end, and its fields are returned as well; quotes
+    inside unquoted fields, such as ``12" long``, are plain text.
+    """
+
+    end = mapped.find(b"\n", start)
+    if end == -1:
+        end = size
+    if mapped[start:start + 1] == b'"' or mapped.find(b',"', start, end) != -1:
+        fields, next_start = _parse_record(mapped, start, size)
+        return next_start, next_start, fields
+    next_start = end + 1
+    if end > start and mapped[end - 1] == 0x0D:  # strip "\r" of CRLF endings
+        end -= 1
+    return end, next_start, None
+
+
+def _parse_record(mapped: mmap.mmap, start: int, size: int) -> Tuple[List[str], int]:
+    """Parse the record at ``start`` with :mod:`csv`; return its fields and the start of the next one."""
+
+    position = start
+
+    def lines() -> Iterator[str]:
+        # csv asks for another line only while a quoted field is open.
+        nonlocal position
+        while position < size:
+            end = mapped.find(b"\n", position)
+            end = size if end == -1 else end + 1
+            line = mapped[position:end]
+            position = end
+            yield line.decode("utf-8")
+
+    return next(csv.reader(lines()), []), position
+
+
+def _scan_mapped(
+    mapped: mmap.mmap,
+    view: memoryview,
+    columns: Optional[Iterable[str]],
+    strict: bool,
+    schema: Optional[Schema],
+) -> Dict[str, NumericAccumulator]:
+    size = len(mapped)
+    # A UTF-8 byte order mark is not part of the first column name.
+    first = len(_BOM) if mapped[:len(_BOM)] == _BOM else 0
+    header_end, start, header = _record(mapped, first, size)
+    if header is None:
+        header = bytes(view[first:header_end]).decode("utf-8").split(",")
+
+    wanted = header if columns is None else list(columns)
+    _check_columns(wanted, header)
+    # Maps field position -> column name for the fields we convert.
+    positions = {header.index(name): name for name in wanted}
+    last_position = max(positions, default=-1)
+    accumulators = {name: NumericAccumulator() for name in wanted}
+    # Fields that are screened before conversion: columns the schema does
+    # not expect to be numeric, and those that turned out not to be.
+    types = schema.columns if schema is not None else {}
+    screened = {position for position, name in positions.items() if types.get(name, NUMERIC) != NUMERIC}
+
+    while start < size:
+        end, next_start, fields = _record(mapped, start, size)
+        if fields is not None:
+            for position, name in positions.items():
+                if position < len(fields) and fields[position]:
+                    _add_field(accumulators[name], fields[position], name, strict, position, screened)
+            start = next_start
+            continue
+        field_start = start
+        for position in range(last_position + 1 if end > start else 0):
+            if field_start > end:
+                break
+            comma = mapped.find(b",", field_start, end)
+            field_end = end if comma == -1 else comma
+            name = positions.get(position)
+            if name is not None and field_end > field_start:
+                _add_field(accumulators[name], view[field_start:field_end], name, strict, position, screened)
+            field_start = field_end + 1
+        start = next_start
+
+    if strict:
+        return accumulators
+    return {name: accumulator for name, accumulator in accumulators.items() if accumulator.count}
+
+
+def _looks_numeric(field: Union[str, memoryview]) -> bool:
+    """:func:`~python.schema.looks_numeric` for raw bytes; non-ASCII is left to :func:`float`."""
+
+    if isinstance(field, str):
+        return looks_numeric(field)
+    stripped = bytes(field).strip()
+    first = stripped[:1]
+    return first in _NUMERIC_STARTS or first >= b"\x80" or stripped.lower() in _SPECIAL_VALUES
+
+
+def _add_field(
+    accumulator: NumericAccumulator,
+    field: Union[str, memoryview],
+    column: str,
+    strict: bool,
+    position: int,
+    screened: Set[int],
+) -> None:
+    if position in screened and not _looks_numeric(field):
+        return
+    try:
+        accumulator.add(float(field))
+    except ValueError:
+        if strict:
+            value = field if isinstance(field, str) else bytes(field).decode("utf-8", "replace")
+            if isinstance(field, memoryview):
+                # The traceback keeps this frame alive; release the slice so
+                # the memory map can still be closed while the error propagates.
+                field.release()
+            raise ValueError(f"Non-numeric value '{value}' in column '{column}'.") from None
+        screened.add(position)
+
+
+def _check_columns(wanted: List[str], header: List[str]) -> None:
+    missing = [name for name in wanted if name not in header]
+    if missing:
+        available = ", ".join(sorted(header))
+        raise ValueError(
+            f"Column '{missing[0]}' not present in file header. "
+            f"Available columns: {available or 'none'}"
+        )
+
+
+def _scan_with_csv_module(
+    path: Path,
+    columns: Optional[Iterable[str]],
+    strict: bool,
+) -> Dict[str, NumericAccumulator]:
+    wanted = None if columns is None else list(columns)
+    if strict and wanted is not None:
+        return {name: accumulate_column(iter_csv(path), name) for name in wanted}
+    accumulators = accumulate_dataset(iter_csv(path))
+    if wanted is None:
+        return accumulators
+    return {name: accumulators[name] for name in wanted if name in accumulators}
+
+
+def summarise_csv_mmap(
+    path: str | Path,
+    column: Optional[str] = None,
+    percentiles: Sequence[float] = (),
+) -> Dict[str, NumericSummary]:
+    """Summarise ``path`` with :func:`scan_numeric_columns`.
+
+    The result matches :func:`~python.dataset_summary.compute_numeric_summary`
+    when ``column`` is given and :func:`~python.dataset_summary.summarise_dataset`
+    otherwise, with medians and ``percentiles`` following the bound in
+    :mod:`python.streaming`.
+    """
+
+    if column is None:
+        accumulators = scan_numeric_columns(path)
+        return {name: NumericSummary.from_accumulator(acc, percentiles) for name, acc in accumulators.items()}
+
+    accumulator = scan_numeric_columns(path, [column], strict=True)[column]
+    if not accumulator.count:
+        raise ValueError(f"Column '{column}' does not contain any numeric values.")
+    return {column: NumericSummary.from_accumulator(accumulator, percentiles)}
@@ -0,0 +1,158 @@
+"""Summaries across many CSV files processed concurrently.
+
+Partitioned exports (``data/2026-10-*/part-*.csv``) are summarised file by
+file in a bounded pool of worker processes.  Every worker streams its file
+into :class:`~python.streaming.NumericAccumulator` objects; the parent
+turns each file's accumulators into per-file summaries and merges them
+into a combined summary, so rows are never concatenated or shipped
+between processes.  Medians and percentiles follow the error bound
+documented in :mod:`python.streaming`.
+
+A file that cannot be read, is truncated or fails validation, or whose
+worker process dies, is reported with an error message instead of
+aborting the whole run.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .dataset_summary import NumericSummary, accumulate_csv_column, accumulate_dataset, iter_csv
+from .quantiles import validate_percentiles
+from .streaming import NumericAccumulator
+
+_GLOB_CHARACTERS = frozenset("*?[")
+
+
+def is_pattern(text: str) -> bool:
+    """``True`` when ``text`` contains glob wildcards and is not an existing path.
+
+    Names such as ``data[2024].csv`` contain wildcard characters; when a
+    file of that name exists it is taken literally.
+    """
+
+    return not _GLOB_CHARACTERS.isdisjoint(text) and not Path(text).exists()
+
+
+def expand_paths(patterns: Iterable[str]) -> List[Path]:
+    """Expand glob patterns (``**`` included) into a sorted, de-duplicated list.
+
+    Plain paths are kept even when they do not exist so that they show up
+    as per-file errors rather than disappearing silently.
+    """
+
+    paths: Dict[Path, None] = {}
+    for pattern in patterns:
+        if is_pattern(pattern):
+            paths.update(dict.fromkeys(Path(match) for match in sorted(glob.glob(pattern, recursive=True))))
+        else:
+            paths[Path(pattern)] = None
+    return list(paths)
+
+
+@dataclass
+class FileResult:
+    """Outcome for one file: either summaries or an error message."""
+
+    path: Path
+    summaries: Dict[str, NumericSummary] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, object]:
+        if self.error is not None:
+            return {"path": str(self.path), "error": self.error}
+        return {
+            "path": str(self.path),
+            "summaries": {name: summary.as_dict() for name, summary in self.summaries.items()},
+        }
+
+
+@dataclass
+class MultiFileSummary:
+    """Per-file results plus the summary of all readable files together."""
+
+    files: List[FileResult]
+    combined: Dict[str, NumericSummary]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "files": [result.as_dict() for result in self.files],
+            "combined": {name: summary.as_dict() for name, summary in self.combined.items()},
+        }
+
+
+def _accumulate_file(path: str, column: Optional[str]) -> Dict[str, NumericAccumulator]:
+    if column is not None:
+        accumulator = accumulate_csv_column(path, column)
+        if not accumulator.count:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+        return {column: accumulator}
+    return accumulate_dataset(iter_csv(path))
+
+
+def _summaries(
+    accumulators: Dict[str, NumericAccumulator],
+    percentiles: Sequence[float],
+) -> Dict[str, NumericSummary]:
+    return {
+        name: NumericSummary.from_accumulator(accumulator, percentiles)
+        for name, accumulator in accumulators.items()
+        if accumulator.count
+    }
+
+
+def _submit(pool: ProcessPoolExecutor, path: str, column: Optional[str]) -> Future:
+    """Submit one file; once a worker has died the pool is broken and the file fails with it."""
+
+    try:
+        return pool.submit(_accumulate_file, path, column)
+    except BrokenProcessPool as exc:
+        failed: Future = Future()
+        failed.set_exception(exc)
+        return failed
+
+
+def summarise_files(
+    paths: Sequence[str | Path],
+    column: Optional[str] = None,
+    workers: Optional[int] = None,
+    percentiles: Sequence[float] = (),
+) -> MultiFileSummary:
+    """Summarise every file in ``paths`` with at most ``workers`` processes.
+
+    ``column`` restricts the work to one column with the validation of
+    :func:`~python.dataset_summary.compute_numeric_summary`, applied per
+    file; otherwise every numeric-looking column is summarised like
+    :func:`~python.dataset_summary.summarise_dataset`.
+    """
+
+    validate_percentiles(percentiles)
+    if not paths:
+        raise ValueError("At least one CSV file is required.")
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    files: List[FileResult] = []
+    merged: Dict[str, NumericAccumulator] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [_submit(pool, str(path), column) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                accumulators = future.result()
+            except Exception as exc:  # truncated archives, crashed workers: keep the other files
+                files.append(FileResult(Path(path), error=str(exc) or type(exc).__name__))
+                continue
+            # Summarise before merging: merge() updates the left operand.
+            files.append(FileResult(Path(path), _summaries(accumulators, percentiles)))
+            for name, accumulator in accumulators.items():
+                if name in merged:
+                    merged[name].merge(accumulator)
+                else:
+                    merged[name] = accumulator
+
+    return MultiFileSummary(files, _summaries(merged, percentiles))
@@ -0,0 +1,375 @@
+"""Optional NumPy implementation of the summary statistics.
+
+NumPy is not a dependency of this repository.  When it is installed the
+summary functions in :mod:`python.dataset_summary` can be asked to use it
+with ``backend="numpy"``: numeric columns are converted to ``float64``
+arrays in bulk and reduced with vectorised operations (``np.partition``
+for the median and percentiles) instead of :mod:`statistics` over Python lists.  When it is
+missing, :func:`is_available` returns ``False`` and callers fall back to
+the pure Python code.
+
+Bulk conversion relies on NumPy's own string parser.  Should it reject a
+chunk that :func:`float` would accept, the chunk is retried with
+:func:`float` so results never depend on the backend.
+"""
+
+from __future__ import annotations
+
+import csv
+from array import array
+from itertools import chain, islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .columnar import (
+    CategoricalColumn,
+    Column,
+    ColumnarTable,
+    NULL_CODE,
+    NumericColumn,
+    _format_number,
+)
+from . import profiling
+from .compression import open_text
+from .projection import iter_projected
+from .quantiles import interpolate
+from .schema import DEFAULT_SAMPLE_SIZE, NUMERIC, Schema, infer_schema, looks_numeric
+
+# Importing NumPy takes longer than the rest of the package together, so
+# it only happens when the NumPy backend is first asked for.
+np = None
+_checked = False
+
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def is_available() -> bool:
+    """Return ``True`` when NumPy can be imported, importing it on first use.
+
+    Every other function here needs NumPy and may only be called after
+    this one returned ``True``.
+    """
+
+    global np, _checked
+    if not _checked:
+        try:  # pragma: no cover - depends on the environment
+            import numpy as np
+        except ImportError:  # pragma: no cover - depends on the environment
+            np = None
+        _checked = True
+    return np is not None
+
+
+def describe(values: "np.ndarray", percentiles: Sequence[float] = ()) -> Dict[str, object]:
+    """Return :class:`~python.dataset_summary.NumericSummary` fields for ``values``.
+
+    The median and percentiles select their ranks with a single
+    ``np.partition`` call in linear time rather than sorting.
+    """
+
+    count = int(values.size)
+    quantiles = [0.5] + [percentile / 100 for percentile in percentiles]
+    positions = [q * (count - 1) for q in quantiles]
+    ranks = sorted({int(np.floor(p)) for p in positions} | {int(np.ceil(p)) for p in positions})
+    partitioned = np.partition(values, ranks)
+    selected = []
+    for position in positions:
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        low, high = partitioned[lower], partitioned[upper]
+        selected.append(interpolate(float(low), float(high), position - lower))
+
+    return {
+        "count": count,
+        "mean": float(values.mean()),
+        "median": selected[0],
+        "stdev": float(values.std()) if count > 1 else 0.0,
+        "minimum": float(values.min()),
+        "maximum": float(values.max()),
+        "percentiles": dict(zip(percentiles, selected[1:])),
+    }
+
+
+def _convert(cells: List[str]) -> Optional["np.ndarray"]:
+    """Convert non-blank strings in bulk; ``None`` if any cell is rejected."""
+
+    try:
+        return np.array(cells, dtype=np.str_).astype(np.float64)
+    except ValueError:
+        pass
+    try:
+        return np.array([float(cell) for cell in cells], dtype=np.float64)
+    except ValueError:
+        return None
+
+
+def _convert_lenient(cells: List[str]) -> "np.ndarray":
+    """Convert the cells that parse, skipping those that do not."""
+
+    converted = _convert(cells)
+    if converted is not None:
+        return converted
+    cells = [cell for cell in cells if looks_numeric(cell)]
+    converted = _convert(cells)
+    if converted is not None:
+        return converted
+    numbers = []
+    for cell in cells:
+        try:
+            numbers.append(float(cell))
+        except ValueError:
+            continue
+    return np.array(numbers, dtype=np.float64)
+
+
+def _first_rejected(cells: Iterable[str]) -> str:
+    for cell in cells:
+        try:
+            float(cell)
+        except ValueError:
+            return cell
+    raise AssertionError("no rejected cell")  # pragma: no cover
+
+
+def _validity_mask(column: NumericColumn) -> "np.ndarray":
+    bits = np.unpackbits(np.frombuffer(bytes(column.validity), dtype=np.uint8), bitorder="little")
+    return bits[: len(column)].astype(bool)
+
+
+def _table_array(data: Column, column: str, strict: bool) -> "np.ndarray":
+    if isinstance(data, NumericColumn):
+        values = np.frombuffer(data.values, dtype=np.float64)
+        return values[_validity_mask(data)]
+
+    codes = np.frombuffer(data.codes, dtype=np.int32)
+    codes = codes[codes != NULL_CODE]
+    converted = _convert(data.dictionary)
+    if converted is not None:
+        return converted[codes]
+    if strict:
+        value = _first_rejected(data.dictionary)
+        raise ValueError(f"Non-numeric value '{value}' in column '{column}'.")
+
+    parsed, usable = [], []
+    for value in data.dictionary:
+        try:
+            parsed.append(float(value))
+            usable.append(True)
+        except ValueError:
+            parsed.append(0.0)
+            usable.append(False)
+    codes = codes[np.array(usable, dtype=bool)[codes]]
+    return np.array(parsed, dtype=np.float64)[codes]
+
+
+def column_array(rows, column: str) -> "np.ndarray":
+    """Return the numeric values of ``column`` as a ``float64`` array.
+
+    Validation matches :func:`~python.dataset_summary.compute_numeric_summary`.
+    """
+
+    if isinstance(rows, ColumnarTable):
+        if column not in rows:
+            rows.numeric_values(column)  # raises the standard error
+        return _table_array(rows[column], column, strict=True)
+
+    cells = []
+    for index, row in enumerate(rows):
+        if column not in row:
+            available = ", ".join(sorted(row.keys()))
+            raise ValueError(
+                f"Column '{column}' not present in row {index}. "
+                f"Available columns: {available or 'none'}"
+            )
+        value = row[column]
+        if value not in (None, ""):
+            cells.append(value)
+
+    converted = _convert(cells)
+    if converted is None:
+        raise ValueError(f"Non-numeric value '{_first_rejected(cells)}' in column '{column}'.")
+    return converted
+
+
+def dataset_arrays(rows, schema: Optional[Schema] = None) -> Dict[str, "np.ndarray"]:
+    """Return an array for every column holding at least one number.
+
+    Cells of columns that ``schema`` (inferred from the first rows when not
+    given) does not classify as numeric are screened with
+    :func:`~python.schema.looks_numeric`, so text is never converted.
+    """
+
+    if isinstance(rows, ColumnarTable):
+        arrays = {name: _table_array(data, name, strict=False) for name, data in rows.columns.items()}
+        return {name: values for name, values in arrays.items() if values.size}
+
+    if schema is None:
+        rows = iter(rows)
+        head = list(islice(rows, DEFAULT_SAMPLE_SIZE))
+        schema = infer_schema(head, reservoir_size=0)
+        rows = chain(head, rows)
+    screened = {name for name, kind in schema.columns.items() if kind != NUMERIC}
+    cells: Dict[str, List[str]] = {}
+    for row in rows:
+        for key, value in row.items():
+            if value in (None, "") or (key in screened and not looks_numeric(value)):
+                continue
+            cells.setdefault(key, []).append(value)
+
+    arrays = {name: _convert_lenient(values) for name, values in cells.items() if isinstance(name, str)}
+    return {name: values for name, values in arrays.items() if values.size}
+
+
+def _written_canonically(cells: "np.ndarray", values: "np.ndarray") -> bool:
+    """Whether every cell provably reads as :func:`~python.columnar._format_number` writes its value.
+
+    ``False`` may also mean "not checked" (non-ASCII text); the cells are
+    then kept as text, which is always correct.
+    """
+
+    if not cells.size:
+        return True
+    characters = cells.view(np.uint32).reshape(cells.size, -1)
+    if characters.max() >= 128:
+        return False
+    # Plain decimals with few enough digits are recognised from their
+    # characters alone; only the other cells are formatted and compared.
+    plain = (((characters >= 48) & (characters <= 57)) | (characters == 46) | (characters == 45)
+             | (characters == 0)).all(axis=1)
+    body = np.char.lstrip(cells, "-")  # float() accepted the cells, so at most one sign
+    magnitude = np.abs(values)
+    leading_zero = np.char.startswith(body, "0") & ~np.char.startswith(body, "0.") & (cells != "0")
+    # repr() is positional from 1e-4 to 1e16 and, with at most 15 significant
+    # digits, uses exactly the digits of the cell.
+    decimal = (~np.char.endswith(body, "0") & ~np.char.endswith(body, ".") & ~np.char.startswith(body, ".")
+               & (np.char.str_len(body) <= 16) & (magnitude >= 1e-4) & (magnitude < 1e16))
+    proven = plain & ~leading_zero & np.where(np.char.find(body, ".") >= 0, decimal, magnitude < 2.0**53)
+    if proven.all():
+        return True
+    others, written = values[~proven], cells[~proven]
+    integral = np.isfinite(others) & (others == np.trunc(others))
+    if integral.any():
+        if list(map(_format_number, others[integral].tolist())) != written[integral].tolist():
+            return False
+        others, written = others[~integral], written[~integral]
+    return list(map(repr, others.tolist())) == written.tolist()
+
+
+def _append_cells(column: CategoricalColumn, cells: "np.ndarray") -> None:
+    """Append ``cells`` (``""`` for blanks), looking each distinct one up once."""
+
+    distinct, first, inverse = np.unique(cells, return_index=True, return_inverse=True)
+    codes = np.empty(len(distinct), dtype=np.intc)
+    # New entries join the dictionary in the order they appear, as with append().
+    for index in np.argsort(first).tolist():
+        cell = str(distinct[index])
+        if not cell:
+            codes[index] = NULL_CODE
+            continue
+        code = column._lookup.get(cell)
+        if code is None:
+            code = column._lookup[cell] = len(column.dictionary)
+            column.dictionary.append(cell)
+        codes[index] = code
+    column.codes.frombytes(codes[inverse.reshape(-1)].tobytes())
+
+
+class _ChunkedColumn:
+    """Builds one column of a table chunk by chunk.
+
+    Like :class:`~python.columnar.NumericColumn`, the cells themselves are
+    kept as text from the first chunk that is not written canonically.
+    """
+
+    def __init__(self) -> None:
+        self.values: List["np.ndarray"] = []
+        self.masks: List["np.ndarray"] = []
+        self.text: Optional[CategoricalColumn] = None
+        self.categorical: Optional[CategoricalColumn] = None
+
+    def extend(self, cells: List[str]) -> None:
+        if self.categorical is None:
+            raw = np.array(cells, dtype=np.str_)
+            mask = raw != ""
+            converted = _convert(raw[mask].tolist())
+            if converted is not None:
+                if self.text is None and not _written_canonically(raw[mask], converted):
+                    self.text = self._formatted()
+                if self.text is not None:
+                    _append_cells(self.text, raw)
+                values = np.zeros(len(cells), dtype=np.float64)
+                values[mask] = converted
+                self.values.append(values)
+                self.masks.append(mask)
+                return
+            self._demote()
+        for cell in cells:
+            self.categorical.append(cell or None)
+
+    def _formatted(self) -> CategoricalColumn:
+        """The chunks so far, all written canonically, as text."""
+
+        text = CategoricalColumn()
+        for values, mask in zip(self.values, self.masks):
+            for value, valid in zip(values.tolist(), mask.tolist()):
+                text.append(_format_number(value) if valid else None)
+        return text
+
+    def _demote(self) -> None:
+        self.categorical = self.text if self.text is not None else self._formatted()
+        self.values, self.masks, self.text = [], [], None
+
+    def finish(self) -> Column:
+        if self.categorical is not None:
+            return self.categorical
+        values = np.concatenate(self.values) if self.values else np.empty(0)
+        mask = np.concatenate(self.masks) if self.masks else np.empty(0, dtype=bool)
+        packed = array("d")
+        packed.frombytes(values.astype(np.float64).tobytes())
+        validity = bytearray(np.packbits(mask, bitorder="little").tobytes())
+        return NumericColumn(packed, validity, self.text)
+
+
+def load_table(
+    path: str | Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    columns: Optional[Sequence[str]] = None,
+) -> ColumnarTable:
+    """Load a CSV into a :class:`ColumnarTable`, converting numbers per chunk.
+
+    Records are read ``chunk_rows`` at a time and each column of the chunk
+    is converted with a single NumPy call instead of one :func:`float` per
+    cell.  With ``columns`` only those columns are read (see
+    :mod:`python.projection`).
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if columns is not None:
+        return _build_table(list(columns), iter_projected(csv_path, columns), chunk_rows)
+
+    with profiling.stage("open"):
+        handle = open_text(csv_path)
+    profiling.count("parse", bytes=csv_path.stat().st_size)
+    with handle:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        # Blank lines are skipped, as csv.DictReader does.
+        records = (record for record in reader if record)
+        return _build_table(header, profiling.track("parse", records), chunk_rows)
+
+
+def _build_table(header: List[str], records: Iterable[Sequence[str]], chunk_rows: int) -> ColumnarTable:
+    builders = [_ChunkedColumn() for _ in header]
+    records = iter(records)
+    row_count = 0
+    while True:
+        chunk = list(islice(records, chunk_rows))
+        if not chunk:
+            break
+        row_count += len(chunk)
+        with profiling.stage("convert"):
+            for index, builder in enumerate(builders):
+                builder.extend([record[index] if index < len(record) else "" for record in chunk])
+
+    return ColumnarTable({name: builder.finish() for name, builder in zip(header, builders)}, row_count)
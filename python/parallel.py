@@ -0,0 +1,333 @@
+"""Multi-process summaries of large CSV files.
+
+The file is cut into fixed-size byte ranges, many more than there are
+workers, every range is parsed and aggregated in a worker process, and
+the resulting :class:`~python.streaming.NumericAccumulator` objects are
+merged into one result per column.  Workers stream their range through
+:mod:`csv` rather than reading it into memory, so memory use does not
+grow with the size of the file.
+
+A range owns the records that start after the first record boundary at
+or past its start offset.  Each worker finds that boundary itself: it
+decides whether the offset lies inside a quoted field from the first
+quote after it whose neighbours tell an opening from a closing quote,
+then skips to the next newline outside quotes.  Adjacent workers apply
+the same rule to their shared offset, so every record is read exactly
+once and newlines inside quoted values stay intact.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .compression import detect_compression
+from .correlations import CoMoments
+from .dataset_summary import (
+    NumericSummary,
+    accumulate_column,
+    accumulate_correlations,
+    accumulate_dataset,
+    iter_csv,
+    sample_histogram,
+)
+from .histograms import HistogramSpec
+from .schema import DEFAULT_SAMPLE_SIZE
+from .streaming import NumericAccumulator
+
+_BLOCK_SIZE = 1 << 20
+DEFAULT_CHUNK_BYTES = 64 << 20
+# Files are split into at least one chunk per worker, but not below this.
+_MIN_CHUNK_BYTES = 1 << 20
+# How far past a chunk's start offset to look for a quote that shows
+# whether the offset is inside a quoted field.
+_RESYNC_BYTES = 1 << 20
+_DELIMITERS = (b",", b"\n", b"\r")
+
+
+def find_record_boundaries(path: str | Path, targets: Sequence[int]) -> List[int]:
+    """Return, for each target offset, the start of the next full record.
+
+    A boundary is the position just after a newline that lies outside a
+    quoted field.  Targets that fall inside the same record collapse to a
+    single boundary, so the result may be shorter than ``targets``.
+    """
+
+    boundaries: List[int] = []
+    pending = iter(sorted(targets))
+    target = next(pending, None)
+    position = 0
+    in_quotes = 0
+
+    with open(path, "rb") as handle:
+        while target is not None:
+            block = handle.read(_BLOCK_SIZE)
+            if not block:
+                break
+            cursor = 0
+            while target is not None:
+                start = max(target - position, cursor)
+                newline = block.find(b"\n", start) if start < len(block) else -1
+                if newline == -1:
+                    break
+                in_quotes ^= block.count(b'"', cursor, newline) & 1
+                cursor = newline + 1
+                if not in_quotes:
+                    boundary = position + cursor
+                    boundaries.append(boundary)
+                    while target is not None and target < boundary:
+                        target = next(pending, None)
+            in_quotes ^= block.count(b'"', cursor) & 1
+            position += len(block)
+
+    return boundaries
+
+
+def plan_chunks(path: str | Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Read the header and split the rest of the file into byte ranges.
+
+    Ranges are ``chunk_bytes`` long and need not start on a record; see
+    :func:`find_record_start` for how workers align them.
+    """
+
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be positive")
+    size = os.path.getsize(path)
+    # Header only, without a trailing newline, when there is no boundary.
+    data_start = next(iter(find_record_boundaries(path, [0])), size)
+
+    with open(path, "rb") as handle:
+        header_bytes = handle.read(data_start)
+    header = next(csv.reader(io.StringIO(header_bytes.decode("utf-8-sig"), newline="")), [])
+
+    edges = list(range(data_start, size, chunk_bytes)) + [size]
+    ranges = [(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+    return header, ranges
+
+
+def _chunk_size(path: Path, workers: int, chunk_bytes: int) -> int:
+    """``chunk_bytes``, reduced so that small files still give every worker a chunk."""
+
+    return min(chunk_bytes, max(_MIN_CHUNK_BYTES, -(-os.path.getsize(path) // workers)))
+
+
+def _quoted_at(handle: BinaryIO, offset: int) -> bool:
+    """Guess whether ``offset`` lies inside a quoted field.
+
+    A quote preceded by a delimiter and followed by field text opens a
+    field; one preceded by field text and followed by a delimiter closes
+    it.  The parity of the quotes before the first such quote gives the
+    state at ``offset``.  Without one, ``offset`` is taken to be outside
+    quotes, which holds unless a quoted field is longer than the window.
+    """
+
+    handle.seek(offset - 1)
+    window = handle.read(_RESYNC_BYTES + 2)
+    index = window.find(b'"', 1)
+    while index != -1:
+        before, after = window[index - 1:index], window[index + 1:index + 2]
+        flips = window.count(b'"', 1, index) & 1
+        if before in _DELIMITERS and after not in _DELIMITERS + (b'"', b""):
+            return bool(flips)
+        if after in _DELIMITERS + (b"",) and before not in _DELIMITERS + (b'"',):
+            return not flips
+        index = window.find(b'"', index + 1)
+    return False
+
+
+def find_record_start(handle: BinaryIO, offset: int) -> int:
+    """Return the start of the first record after a newline at or past ``offset``.
+
+    ``handle`` is a binary file positioned anywhere and ``offset`` lies
+    past the header.  The end of the file is returned when no record
+    starts after ``offset``.
+    """
+
+    in_quotes = _quoted_at(handle, offset)
+    handle.seek(offset)
+    position = offset
+    while True:
+        block = handle.read(_BLOCK_SIZE)
+        if not block:
+            return position
+        cursor = 0
+        while True:
+            newline = block.find(b"\n", cursor)
+            if newline == -1:
+                in_quotes ^= bool(block.count(b'"', cursor) & 1)
+                break
+            in_quotes ^= bool(block.count(b'"', cursor, newline) & 1)
+            cursor = newline + 1
+            if not in_quotes:
+                return position + cursor
+        position += len(block)
+
+
+class _RangeReader(io.RawIOBase):
+    """Reads at most ``length`` bytes of ``handle`` from its current position."""
+
+    def __init__(self, handle: BinaryIO, length: int) -> None:
+        self._handle = handle
+        self._remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        count = self._handle.readinto(memoryview(buffer)[:size]) or 0
+        self._remaining -= count
+        return count
+
+
+def _chunk_rows(path: str, header: List[str], start: int, end: int, aligned: bool) -> Iterator[Dict[str, str]]:
+    """Stream the records owned by a range; ``aligned`` marks the first range, which starts on a record."""
+
+    with open(path, "rb", buffering=0) as handle:
+        size = os.fstat(handle.fileno()).st_size
+        first = start if aligned else find_record_start(handle, start)
+        last = end if end >= size else find_record_start(handle, end)
+        if last <= first:
+            return
+        handle.seek(first)
+        text = io.TextIOWrapper(io.BufferedReader(_RangeReader(handle, last - first)), encoding="utf-8", newline="")
+        yield from csv.DictReader(text, fieldnames=header)
+
+
+def _summarise_chunk(
+    path: str,
+    header: List[str],
+    start: int,
+    end: int,
+    aligned: bool,
+    column: Optional[str],
+    histogram: Optional[HistogramSpec] = None,
+) -> Dict[str, NumericAccumulator]:
+    rows = _chunk_rows(path, header, start, end, aligned)
+    if column is not None:
+        return {column: accumulate_column(rows, column, histogram)}
+    return accumulate_dataset(rows, histogram=histogram)
+
+
+def summarise_csv_parallel(
+    path: str | Path,
+    column: Optional[str] = None,
+    workers: Optional[int] = None,
+    percentiles: Sequence[float] = (),
+    histogram: Optional[HistogramSpec] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Dict[str, NumericSummary]:
+    """Summarise a CSV file using a pool of worker processes.
+
+    ``column`` restricts the work to one column with the same validation
+    as :func:`~python.dataset_summary.compute_numeric_summary`; otherwise
+    every numeric-looking column is summarised like
+    :func:`~python.dataset_summary.summarise_dataset`.  Medians and
+    ``percentiles`` follow the error bound documented in
+    :mod:`python.streaming`.
+
+    The file is split into ranges of at most ``chunk_bytes``, smaller
+    when that leaves a worker idle.
+
+    Missing ``histogram`` bounds are sampled from the start of the file
+    once, before the workers start, so that their histograms merge.
+
+    Compressed files cannot be split at byte offsets and are streamed
+    through a single decompressor in this process instead.
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if detect_compression(csv_path) is not None:
+        rows = iter_csv(csv_path)
+        if column is not None:
+            accumulators = {column: accumulate_column(rows, column, histogram)}
+        else:
+            accumulators = accumulate_dataset(rows, histogram=histogram)
+        return _summaries(accumulators, column, percentiles)
+
+    workers = workers or os.cpu_count() or 1
+    header, ranges = plan_chunks(csv_path, _chunk_size(csv_path, workers, chunk_bytes))
+    if column is not None and column not in header:
+        available = ", ".join(sorted(header))
+        raise ValueError(
+            f"Column '{column}' not present in file header. "
+            f"Available columns: {available or 'none'}"
+        )
+    if histogram is not None and histogram.needs_sample:
+        _, histogram = sample_histogram(list(islice(iter_csv(csv_path), DEFAULT_SAMPLE_SIZE)), histogram, column)
+
+    merged: Dict[str, NumericAccumulator] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_summarise_chunk, str(csv_path), header, start, end, index == 0, column, histogram)
+            for index, (start, end) in enumerate(ranges)
+        ]
+        for future in futures:
+            for name, accumulator in future.result().items():
+                if name in merged:
+                    merged[name].merge(accumulator)
+                else:
+                    merged[name] = accumulator
+
+    return _summaries(merged, column, percentiles)
+
+
+def _correlate_chunk(path: str, header: List[str], start: int, end: int, aligned: bool) -> CoMoments:
+    return accumulate_correlations(_chunk_rows(path, header, start, end, aligned))
+
+
+def correlate_csv_parallel(
+    path: str | Path,
+    workers: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> CoMoments:
+    """Co-moments of all numeric columns of a CSV file, chunked as in :func:`summarise_csv_parallel`.
+
+    The partial :class:`~python.correlations.CoMoments` of the chunks are
+    merged exactly, so the result matches a single pass.
+    """
+
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if detect_compression(csv_path) is not None:
+        return accumulate_correlations(iter_csv(csv_path))
+
+    workers = workers or os.cpu_count() or 1
+    header, ranges = plan_chunks(csv_path, _chunk_size(csv_path, workers, chunk_bytes))
+    moments = CoMoments()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_correlate_chunk, str(csv_path), header, start, end, index == 0)
+            for index, (start, end) in enumerate(ranges)
+        ]
+        for future in futures:
+            moments.merge(future.result())
+    return moments
+
+
+def _summaries(
+    merged: Dict[str, NumericAccumulator],
+    column: Optional[str],
+    percentiles: Sequence[float],
+) -> Dict[str, NumericSummary]:
+    if column is not None:
+        accumulator = merged.get(column)
+        if accumulator is None or not accumulator.count:
+            raise ValueError(f"Column '{column}' does not contain any numeric values.")
+        return {column: NumericSummary.from_accumulator(accumulator, percentiles)}
+
+    return {
+        name: NumericSummary.from_accumulator(accumulator, percentiles)
+        for name, accumulator in merged.items()
+        if accumulator.count
+    }
@@ -0,0 +1,73 @@
+"""Exact quantiles from a single sort.
+
+:func:`statistics.median` sorts a full copy of its input for every call.
+:func:`select_quantiles` instead sorts one buffer in place, once, and
+reads every requested rank from it, so asking for p50, p90 and p99 costs
+the same as asking for the median alone.  A selection algorithm would
+touch fewer values, but written in Python it is several times slower
+than the C sort behind :meth:`list.sort`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+def parse_percentiles(text: str) -> List[float]:
+    """Parse a comma separated list such as ``"50,90,99.9"``."""
+
+    values = [float(part) for part in text.split(",") if part.strip()]
+    validate_percentiles(values)
+    return values
+
+
+def validate_percentiles(percentiles: Iterable[float]) -> None:
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Percentile {percentile} must be between 0 and 100.")
+
+
+def percentile_label(percentile: float) -> str:
+    """Name used for a percentile in serialised output, e.g. ``"p99.9"``."""
+
+    return f"p{percentile:g}"
+
+
+def interpolate(low: float, high: float, fraction: float) -> float:
+    """Linear interpolation that averages exactly like :func:`statistics.median`."""
+
+    if fraction == 0.5:
+        return (low + high) / 2
+    if fraction == 0 or low == high:
+        return low  # exact, even for infinite values
+    return low + (high - low) * fraction
+
+
+def _ranks(count: int, q: float) -> Tuple[int, int, float]:
+    position = q * (count - 1)
+    lower = math.floor(position)
+    return lower, math.ceil(position), position - lower
+
+
+def select_quantiles(buffer: List[float], quantiles: Sequence[float]) -> List[float]:
+    """Return the requested quantiles (0-1) of ``buffer``, sorting it in place.
+
+    Values between two ranks are linearly interpolated, so the 0.5
+    quantile matches :func:`statistics.median`.
+    """
+
+    count = len(buffer)
+    if count == 0:
+        raise ValueError("cannot compute quantiles of an empty buffer")
+
+    buffer.sort()
+    positions = [_ranks(count, q) for q in quantiles]
+    return [interpolate(buffer[lower], buffer[upper], fraction) for lower, upper, fraction in positions]
+
+
+def exact_percentiles(buffer: List[float], percentiles: Sequence[float]) -> Tuple[float, Dict[float, float]]:
+    """Return the median and the requested percentiles (0-100) of ``buffer``."""
+
+    values = select_quantiles(buffer, [0.5] + [percentile / 100 for percentile in percentiles])
+    return values[0], dict(zip(percentiles, values[1:]))
@@ -0,0 +1,341 @@
+"""Uniform row samples for fast, approximate summaries.
+
+Exploring a huge file rarely needs exact answers.  The helpers here draw
+a uniform sample of rows and compute confidence intervals for statistics
+estimated from it, which
+:func:`~python.dataset_summary.summarise_dataset` and the ``--sample``
+option report instead of the exact values:
+
+* :func:`sample_rows` samples rows already in memory, or streams an
+  iterator with Bernoulli sampling.
+* :func:`sample_csv` samples a CSV file.  Plain files are sampled in
+  blocks of consecutive records starting at random byte offsets, so only
+  a small part of the file is read.  Rows after long lines are a little
+  more likely to be picked, which is negligible unless row lengths vary
+  wildly.  The number of rows in the file is estimated from the average
+  length of the sampled ones.  Compressed files, files with quoted line
+  breaks and files not much larger than the sample are read in full
+  into a reservoir instead.
+
+Intervals use normal approximations with a finite population
+correction.  Rows of one block are not independent draws -- in a file
+sorted by a column they hold nearly equal values -- so errors are
+estimated from the block totals, as for any cluster sample: the mean and
+the standard deviation are ratio estimates over blocks, and medians and
+percentiles use Woodruff intervals, which turn an interval for the share
+of values below the estimate into ranks.  Rows sampled one by one are
+blocks of one row.  The true minimum and maximum can only lie below and
+above the sampled ones, so their intervals are open on one side.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import math
+import random
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from statistics import NormalDist, stdev
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from .columnar import ColumnarTable
+from .compression import detect_compression, open_text
+from .quantiles import percentile_label
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_BLOCK_ROWS = 16
+
+# Files with fewer rows than this multiple of the sample are read in full.
+_FULL_READ_FACTOR = 4
+_HEAD_BYTES = 1 << 16
+
+T = TypeVar("T")
+Interval = Tuple[Optional[float], Optional[float]]
+
+
+@dataclass
+class CsvSample:
+    """Sampled rows of a CSV file and the (estimated) number of rows in it.
+
+    ``population_error`` is the standard error of ``population`` in rows,
+    zero when the rows were counted.  ``block_rows`` holds the number of
+    rows of each block of consecutive rows, in the order of ``rows``; it
+    is empty when rows were sampled one by one.
+    """
+
+    rows: List[Dict[str, str]]
+    population: int
+    exhaustive: bool
+    population_error: float = 0.0
+    block_rows: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Approximation:
+    """How an approximate summary was estimated, with its confidence intervals.
+
+    ``intervals`` maps statistic names, as serialised by
+    :meth:`~python.dataset_summary.NumericSummary.as_dict`, to
+    ``(lower, upper)`` bounds; ``None`` means unbounded.
+    """
+
+    sampled_rows: int
+    population_rows: int
+    confidence: float = DEFAULT_CONFIDENCE
+    intervals: Dict[str, Interval] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "sampled_rows": self.sampled_rows,
+            "population_rows": self.population_rows,
+            "confidence": self.confidence,
+            "intervals": {name: list(bounds) for name, bounds in self.intervals.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Approximation":
+        return cls(
+            sampled_rows=int(data["sampled_rows"]),
+            population_rows=int(data["population_rows"]),
+            confidence=float(data["confidence"]),
+            intervals={name: tuple(bounds) for name, bounds in data["intervals"].items()},
+        )
+
+
+def reservoir_sample(items: Iterable[T], size: int, rng: random.Random) -> Tuple[List[T], int]:
+    """Uniform sample of at most ``size`` items and the number of items seen.
+
+    Uses Li's "Algorithm L", which draws random numbers only for the items
+    it keeps, so long inputs are skipped through cheaply.
+    """
+
+    iterator = iter(items)
+    reservoir = list(islice(iterator, size))
+    seen = len(reservoir)
+    if seen < size or size == 0:
+        return reservoir, seen + sum(1 for _ in iterator)
+    weight = math.exp(math.log(rng.random()) / size)
+    while True:
+        skip = math.floor(math.log(rng.random()) / math.log(1 - weight))
+        skipped = sum(1 for _ in islice(iterator, skip))
+        seen += skipped
+        item = next(iterator, None) if skipped == skip else None
+        if skipped < skip or item is None:
+            return reservoir, seen
+        seen += 1
+        reservoir[rng.randrange(size)] = item
+        weight *= math.exp(math.log(rng.random()) / size)
+
+
+def sample_rows(
+    rows: Union[Iterable[T], ColumnarTable],
+    fraction: float,
+    seed: Optional[int] = None,
+) -> Tuple[Union[List[T], ColumnarTable], int]:
+    """Sample ``fraction`` of ``rows``; return the sample and the number of rows.
+
+    Sequences and tables are sampled without replacement.  Other iterables
+    are consumed once, keeping each row with probability ``fraction``.
+    """
+
+    if not 0 < fraction <= 1:
+        raise ValueError("sample_fraction must be in (0, 1]")
+    rng = random.Random(seed)
+    if isinstance(rows, ColumnarTable):
+        picks = set(rng.sample(range(len(rows)), _sample_count(len(rows), fraction)))
+        return rows.select([index in picks for index in range(len(rows))]), len(rows)
+    if isinstance(rows, Sequence):
+        picks = sorted(rng.sample(range(len(rows)), _sample_count(len(rows), fraction)))
+        return [rows[index] for index in picks], len(rows)
+
+    sample: List[T] = []
+    population = 0
+    for row in rows:
+        population += 1
+        if rng.random() < fraction:
+            sample.append(row)
+    return sample, population
+
+
+def _sample_count(population: int, fraction: float) -> int:
+    return min(population, max(1, round(population * fraction))) if population else 0
+
+
+def sample_csv(
+    path: str | Path,
+    size: int,
+    seed: Optional[int] = None,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> CsvSample:
+    """Draw about ``size`` rows from a CSV file, reading as little of it as possible."""
+
+    if size < 1 or block_rows < 1:
+        raise ValueError("size and block_rows must be positive")
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    rng = random.Random(seed)
+    if detect_compression(csv_path) is None:
+        sample = _sample_blocks(csv_path, size, block_rows, rng)
+        if sample is not None:
+            return sample
+
+    with open_text(csv_path) as handle:
+        rows, population = reservoir_sample(csv.DictReader(handle), size, rng)
+    return CsvSample(rows, population, exhaustive=population <= size)
+
+
+def _sample_blocks(path: Path, size: int, block_rows: int, rng: random.Random) -> Optional[CsvSample]:
+    """Block sample of a plain file, or ``None`` when a full read is needed."""
+
+    file_size = path.stat().st_size
+    with path.open("rb") as handle:
+        header_line = handle.readline()
+        data_start = handle.tell()
+        head = handle.read(_HEAD_BYTES)
+        head_rows = head.count(b"\n")
+        if head_rows == 0 or len(head) < _HEAD_BYTES:
+            return None
+        if (file_size - data_start) / (len(head) / head_rows) < _FULL_READ_FACTOR * size:
+            return None
+
+        lines: List[bytes] = []
+        block_lengths: List[float] = []
+        block_sizes: List[int] = []
+        blocks = math.ceil(size / block_rows)
+        for offset in sorted(rng.randrange(data_start, file_size) for _ in range(blocks)):
+            handle.seek(offset)
+            handle.readline()  # finish the record the offset fell into
+            block = list(islice(iter(handle.readline, b""), block_rows))
+            if any(line.count(b'"') & 1 for line in block):
+                return None  # possibly inside a quoted line break
+            if block:
+                lines.extend(block)
+                block_lengths.append(sum(map(len, block)) / len(block))
+                # csv skips blank lines, so they belong to no block.
+                block_sizes.append(sum(1 for line in block if line not in (b"\n", b"\r\n")))
+        if not lines:
+            return None
+
+    text = b"".join([header_line] + lines).decode("utf-8-sig")
+    rows = list(csv.DictReader(io.StringIO(text, newline="")))
+    # Rows = data bytes / mean row length.  Lengths within a block are
+    # correlated, so the error of the mean comes from the block means.
+    mean_length = sum(map(len, lines)) / len(lines)
+    population = max(round((file_size - data_start) / mean_length), len(rows))
+    count = len(block_lengths)
+    relative_error = stdev(block_lengths) / mean_length / math.sqrt(count) if count > 1 else 0.0
+    return CsvSample(
+        rows,
+        population,
+        exhaustive=False,
+        population_error=population * relative_error,
+        block_rows=block_sizes,
+    )
+
+
+def _z(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def _order_statistic_interval(ordered: Sequence[float], q: float, spread: float) -> Interval:
+    """The values ``spread`` ranks either side of the ``q`` quantile of ``ordered``."""
+
+    count = len(ordered)
+    lower = max(0, math.floor(count * q - spread) - 1)
+    upper = min(count - 1, math.ceil(count * q + spread))
+    return ordered[lower], ordered[upper]
+
+
+def _ratio_error(totals: Sequence[float], sizes: Sequence[float], correction: float) -> float:
+    """Standard error of ``sum(totals) / sum(sizes)`` estimated from one pair per sampled block."""
+
+    blocks = len(sizes)
+    total_size = math.fsum(sizes)
+    if blocks < 2 or not total_size:
+        return 0.0
+    ratio = math.fsum(totals) / total_size
+    residual = math.fsum((total - ratio * size) ** 2 for total, size in zip(totals, sizes))
+    return math.sqrt(correction * residual / (blocks * (blocks - 1))) / (total_size / blocks)
+
+
+def confidence_intervals(
+    values: List[float],
+    sampled_rows: int,
+    population_rows: int,
+    percentiles: Sequence[float] = (),
+    confidence: float = DEFAULT_CONFIDENCE,
+    population_error: float = 0.0,
+    block_rows: Sequence[int] = (),
+    value_blocks: Optional[Sequence[int]] = None,
+) -> Dict[str, Interval]:
+    """Intervals for the statistics of a column estimated from a row sample.
+
+    ``values`` are the column's values in the sample, which holds
+    ``sampled_rows`` of ``population_rows`` rows.  ``values`` is sorted in
+    place.  Keys follow :meth:`~python.dataset_summary.NumericSummary.as_dict`.
+    ``population_error`` is the standard error of an estimated
+    ``population_rows`` and widens the interval of the count.
+
+    For a sample of blocks of consecutive rows, ``block_rows`` holds the
+    number of rows of each block and ``value_blocks`` the block each value
+    came from, in the order of ``values``.  By default every row is a
+    block of its own.
+    """
+
+    z = _z(confidence)
+    count = len(values)
+    population_rows = max(population_rows, sampled_rows)
+    correction = (population_rows - sampled_rows) / (population_rows - 1) if population_rows > 1 else 0.0
+    if not block_rows:
+        block_rows, value_blocks = [1] * sampled_rows, range(count)
+    blocks = len(block_rows)
+    sizes = [0] * blocks
+    for block in value_blocks:
+        sizes[block] += 1
+    ordered_blocks = [block for _, block in sorted(zip(values, value_blocks))]
+    values.sort()
+
+    share = count / sampled_rows
+    share_error = _ratio_error(sizes, block_rows, correction)
+    count_error = z * math.hypot(population_rows * share_error, share * population_error)
+    estimate = share * population_rows
+    intervals: Dict[str, Interval] = {
+        "count": (max(estimate - count_error, float(count)), estimate + count_error),
+        "min": (None, values[0]),
+        "max": (values[-1], None),
+    }
+    if count > 1:
+        totals = [0.0] * blocks
+        for value, block in zip(values, ordered_blocks):
+            totals[block] += value
+        mean = math.fsum(totals) / count
+        mean_error = z * _ratio_error(totals, sizes, correction)
+        intervals["mean"] = (mean - mean_error, mean + mean_error)
+        squares = [0.0] * blocks
+        for value, block in zip(values, ordered_blocks):
+            squares[block] += (value - mean) ** 2
+        population_spread = math.sqrt(math.fsum(squares) / count)
+        # Delta method: the error of the variance over twice the deviation.
+        variance_error = _ratio_error(squares, sizes, correction)
+        stdev_error = z * variance_error / (2 * population_spread) if population_spread else 0.0
+        intervals["stdev"] = (max(population_spread - stdev_error, 0.0), population_spread + stdev_error)
+    else:
+        intervals["mean"] = intervals["stdev"] = (None, None)
+    for label, q in [("median", 0.5)] + [(percentile_label(p), p / 100) for p in percentiles]:
+        # Woodruff: the error of the share of values up to the estimate, in ranks.
+        below = [0] * blocks
+        for block in ordered_blocks[: min(count, math.floor(count * q) + 1)]:
+            below[block] += 1
+        intervals[label] = _order_statistic_interval(values, q, z * count * _ratio_error(below, sizes, correction))
+    return intervals
+
+
+def scaled_count(count: int, sampled_rows: int, population_rows: int) -> int:
+    """Estimate of the population count of a value seen ``count`` times in the sample."""
+
+    return round(count * max(population_rows, sampled_rows) / sampled_rows) if sampled_rows else 0
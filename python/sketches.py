@@ -0,0 +1,215 @@
+"""Bounded-memory sketches for text columns.
+
+Counting distinct values or finding the most frequent ones exactly needs
+a :class:`collections.Counter` holding every distinct value, which does
+not fit in memory for ID-like columns.  The sketches below keep a fixed
+amount of state per column instead and, like
+:class:`~python.streaming.NumericAccumulator`, can be merged so that
+chunks, files or processes are summarised independently.
+
+Error bounds
+------------
+* :class:`DistinctCounter` is exact while a column holds at most
+  ``exact_limit`` distinct values.  Beyond that it becomes a HyperLogLog
+  sketch with ``2 ** precision`` registers, whose standard error is
+  ``1.04 / sqrt(2 ** precision)`` (about 1.6% for the default precision
+  of 12).
+* :class:`FrequentItems` is the Misra-Gries summary.  Reported counts
+  never exceed the true counts and fall short by at most
+  :attr:`FrequentItems.error`, which is itself at most
+  ``total / (capacity + 1)``.  Every value occurring more often than that
+  is guaranteed to be kept.
+
+Values are hashed with BLAKE2b rather than :func:`hash`, whose string
+hashes differ between processes and would make merged sketches
+meaningless.
+"""
+
+from __future__ import annotations
+
+import math
+from hashlib import blake2b
+from typing import Dict, List, Optional, Set, Tuple
+
+DEFAULT_PRECISION = 12
+DEFAULT_EXACT_LIMIT = 1024
+DEFAULT_CAPACITY = 64
+
+_HASH_BITS = 64
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+class DistinctCounter:
+    """Distinct-value counter that switches from a set to HyperLogLog.
+
+    Hashes are kept exactly until there are more than ``exact_limit`` of
+    them.  They are then folded into ``2 ** precision`` one-byte registers,
+    each holding the longest run of leading zeros seen among the hashes
+    routed to it.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, exact_limit: int = DEFAULT_EXACT_LIMIT) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        if exact_limit < 0:
+            raise ValueError("exact_limit must be >= 0")
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self._exact: Optional[Set[int]] = set()
+        self._registers: Optional[bytearray] = None
+
+    @property
+    def is_exact(self) -> bool:
+        """``True`` while :meth:`estimate` is the exact distinct count."""
+
+        return self._exact is not None
+
+    def add(self, value: str) -> None:
+        self.add_hash(_hash(value))
+
+    def add_hash(self, hashed: int) -> None:
+        """Add a value already hashed to a 64-bit integer."""
+
+        if self._exact is not None:
+            self._exact.add(hashed)
+            if len(self._exact) > self.exact_limit:
+                self._to_registers()
+            return
+        self._update_register(hashed)
+
+    def merge(self, other: "DistinctCounter") -> "DistinctCounter":
+        """Combine ``other`` into this counter in place and return ``self``."""
+
+        if other.precision != self.precision:
+            raise ValueError("cannot merge counters with different precision")
+        if other._exact is not None:
+            for hashed in other._exact:
+                self.add_hash(hashed)
+            return self
+        if self._exact is not None:
+            self._to_registers()
+        assert self._registers is not None and other._registers is not None
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values added so far."""
+
+        if self._exact is not None:
+            return len(self._exact)
+        assert self._registers is not None
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / math.fsum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            # Linear counting is more accurate while many registers are empty.
+            raw = size * math.log(size / zeros)
+        return round(raw)
+
+    def _to_registers(self) -> None:
+        hashes, self._exact = self._exact, None
+        self._registers = bytearray(1 << self.precision)
+        for hashed in hashes or ():
+            self._update_register(hashed)
+
+    def _update_register(self, hashed: int) -> None:
+        width = _HASH_BITS - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        registers = self._registers
+        if rank > registers[index]:
+            registers[index] = rank
+
+
+class FrequentItems:
+    """Misra-Gries heavy hitters with at most ``2 * capacity`` counters.
+
+    When the counters overflow, the ``capacity + 1``-th largest count is
+    subtracted from all of them and the ones that drop to zero are
+    discarded.  Doing this in batches keeps the amortised cost per value
+    constant.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.total = 0
+        self.error = 0
+
+    @property
+    def is_exact(self) -> bool:
+        """``True`` while every count is exact."""
+
+        return self.error == 0
+
+    def add(self, value: str, weight: int = 1) -> None:
+        counts = self.counts
+        counts[value] = counts.get(value, 0) + weight
+        self.total += weight
+        if len(counts) > 2 * self.capacity:
+            self._reduce()
+
+    def merge(self, other: "FrequentItems") -> "FrequentItems":
+        """Combine ``other`` into this summary in place and return ``self``.
+
+        Counts are added and then reduced as usual, so the error bounds of
+        both sides add up (Agarwal et al., "Mergeable Summaries").
+        """
+
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.total += other.total
+        self.error += other.error
+        if len(self.counts) > 2 * self.capacity:
+            self._reduce()
+        return self
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """The ``n`` largest counts, ties broken by value."""
+
+        ordered = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return ordered if n is None else ordered[:n]
+
+    def _reduce(self) -> None:
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = {value: count - threshold for value, count in self.counts.items() if count > threshold}
+        self.error += threshold
+
+
+class CategoricalAccumulator:
+    """Single-pass count, distinct count and most frequent values of a column."""
+
+    def __init__(
+        self,
+        precision: int = DEFAULT_PRECISION,
+        exact_limit: int = DEFAULT_EXACT_LIMIT,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        self.count = 0
+        self.distinct = DistinctCounter(precision, exact_limit)
+        self.frequent = FrequentItems(capacity)
+
+    @property
+    def is_exact(self) -> bool:
+        return self.distinct.is_exact and self.frequent.is_exact
+
+    def add(self, value: str, weight: int = 1) -> None:
+        """Record ``weight`` occurrences of ``value``."""
+
+        self.count += weight
+        self.distinct.add(value)
+        self.frequent.add(value, weight)
+
+    def merge(self, other: "CategoricalAccumulator") -> "CategoricalAccumulator":
+        """Combine two partial results in place and return ``self``."""
+
+        self.count += other.count
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+        return self
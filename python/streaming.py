@@ -0,0 +1,388 @@
+"""Constant-memory accumulators for streaming numeric summaries.
+
+The helpers in :mod:`python.dataset_summary` collect every value into a
+list before calling :mod:`statistics`.  That is easy to read but needs the
+whole column in memory.  The classes below keep a fixed amount of state
+per column instead, so arbitrarily large iterators can be summarised in a
+single pass.
+
+Error bounds
+------------
+* ``count``, ``mean`` and ``stdev`` use Welford's online algorithm and match
+  :func:`statistics.mean` / :func:`statistics.pstdev` up to floating point
+  rounding.
+* The median is exact while a column holds at most ``exact_limit`` values.
+  Beyond that :class:`QuantileSketch` switches to logarithmic buckets and
+  every quantile it reports is within a *relative* error of
+  ``relative_accuracy`` (1% by default) of a true value at the requested
+  rank.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .quantiles import interpolate
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .histograms import Histogram
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_EXACT_LIMIT = 1024
+DEFAULT_MAX_BUCKETS = 2048
+
+# Bucket indices past every finite magnitude, for infinities and NaN.
+_INFINITE_BUCKET = 2**62
+_NAN_BUCKET = _INFINITE_BUCKET + 1
+
+_SKETCH_HEADER = struct.Struct("<dIIQ?Q")
+_SKETCH_BUCKETS = struct.Struct("<II")
+_BUCKET = struct.Struct("<qQ")
+_ACCUMULATOR_MAGIC = b"NACC"
+_ACCUMULATOR_VERSION = 1
+_ACCUMULATOR_HEADER = struct.Struct("<4sBQddddd")
+
+
+def _doubles_to_bytes(values: List[float]) -> bytes:
+    packed = array("d", values)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts only
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _doubles_from_bytes(data: bytes) -> List[float]:
+    packed = array("d")
+    packed.frombytes(data)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts only
+        packed.byteswap()
+    return packed.tolist()
+
+
+class QuantileSketch:
+    """Bounded-memory quantile estimator with a relative error guarantee.
+
+    Values are buffered exactly until ``exact_limit`` is reached.  After
+    that each value is mapped to a bucket ``ceil(log(|x|, gamma))`` where
+    ``gamma = (1 + a) / (1 - a)`` for relative accuracy ``a``.  Each side
+    of zero keeps at most ``max_buckets`` buckets; when that limit is hit
+    the buckets closest to zero are collapsed together, which only affects
+    quantiles that fall inside the collapsed range.  Infinities and NaN,
+    which have no logarithm, are counted in buckets of their own beyond
+    every finite one: ``-inf`` ranks first, ``inf`` and then NaN last.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        exact_limit: int = DEFAULT_EXACT_LIMIT,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if exact_limit < 0 or max_buckets < 1:
+            raise ValueError("exact_limit must be >= 0 and max_buckets >= 1")
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self._exact: Optional[List[float]] = []
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._zero = 0
+
+    @property
+    def is_exact(self) -> bool:
+        """``True`` while every value is still buffered verbatim."""
+
+        return self._exact is not None
+
+    def add(self, value: float) -> None:
+        """Record a single value."""
+
+        self.count += 1
+        if self._exact is not None:
+            self._exact.append(value)
+            if len(self._exact) > self.exact_limit:
+                buffered, self._exact = self._exact, None
+                for item in buffered:
+                    self._add_to_buckets(item)
+            return
+        self._add_to_buckets(value)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold ``other`` into this sketch in place and return ``self``."""
+
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+
+        if self._exact is not None and other._exact is not None:
+            for value in other._exact:
+                self.add(value)
+            return self
+
+        if self._exact is not None:
+            buffered, self._exact = self._exact, None
+            for item in buffered:
+                self._add_to_buckets(item)
+        self.count += other.count
+        if other._exact is not None:
+            for value in other._exact:
+                self._add_to_buckets(value)
+            return self
+        for store, incoming in ((self._positive, other._positive), (self._negative, other._negative)):
+            for index, count in incoming.items():
+                store[index] = store.get(index, 0) + count
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+        self._zero += other._zero
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Serialise the sketch into a compact, portable byte string."""
+
+        exact = self._exact is not None
+        parts = [
+            _SKETCH_HEADER.pack(
+                self.relative_accuracy,
+                self.exact_limit,
+                self.max_buckets,
+                self.count,
+                exact,
+                self._zero,
+            )
+        ]
+        if exact:
+            parts.append(_doubles_to_bytes(self._exact))
+        else:
+            parts.append(_SKETCH_BUCKETS.pack(len(self._positive), len(self._negative)))
+            for store in (self._positive, self._negative):
+                parts.extend(_BUCKET.pack(index, count) for index, count in store.items())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "QuantileSketch":
+        """Rebuild a sketch produced by :meth:`to_bytes`."""
+
+        sketch, _ = cls._unpack(memoryview(data))
+        return sketch
+
+    @classmethod
+    def _unpack(cls, data: memoryview) -> Tuple["QuantileSketch", int]:
+        accuracy, exact_limit, max_buckets, count, exact, zero = _SKETCH_HEADER.unpack_from(data)
+        sketch = cls(accuracy, exact_limit, max_buckets)
+        sketch.count = count
+        sketch._zero = zero
+        offset = _SKETCH_HEADER.size
+        if exact:
+            end = offset + 8 * count
+            sketch._exact = _doubles_from_bytes(data[offset:end])
+            return sketch, end
+
+        sketch._exact = None
+        positive, negative = _SKETCH_BUCKETS.unpack_from(data, offset)
+        offset += _SKETCH_BUCKETS.size
+        for store, size in ((sketch._positive, positive), (sketch._negative, negative)):
+            for _ in range(size):
+                index, bucket_count = _BUCKET.unpack_from(data, offset)
+                store[index] = bucket_count
+                offset += _BUCKET.size
+        return sketch, offset
+
+    def quantile(self, q: float) -> float:
+        """Return the value at quantile ``q`` using linear interpolation.
+
+        ``quantile(0.5)`` matches :func:`statistics.median` for exact
+        sketches: the two middle values are averaged for even counts.
+        """
+
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            raise ValueError("cannot compute a quantile of an empty sketch")
+
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        upper = math.ceil(rank)
+        if self._exact is not None:
+            ordered = sorted(self._exact)
+            low_value, high_value = ordered[lower], ordered[upper]
+        else:
+            low_value = self._value_at_rank(lower)
+            high_value = low_value if upper == lower else self._value_at_rank(upper)
+        return interpolate(low_value, high_value, rank - lower)
+
+    # Internal helpers ---------------------------------------------------------
+    def _add_to_buckets(self, value: float) -> None:
+        if value > 0:
+            self._increment(self._positive, _INFINITE_BUCKET if value == math.inf else self._bucket_index(value))
+        elif value < 0:
+            self._increment(self._negative, _INFINITE_BUCKET if value == -math.inf else self._bucket_index(-value))
+        elif value == 0:
+            self._zero += 1
+        else:
+            self._increment(self._positive, _NAN_BUCKET)
+
+    def _bucket_index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        if index >= _INFINITE_BUCKET:
+            return math.inf if index == _INFINITE_BUCKET else math.nan
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def _increment(self, store: Dict[int, int], index: int) -> None:
+        store[index] = store.get(index, 0) + 1
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        """Fold the buckets closest to zero together to respect ``max_buckets``."""
+
+        indices = sorted(index for index in store if index < _INFINITE_BUCKET)
+        overflow = min(len(store) - self.max_buckets + 1, len(indices) - 1)
+        if overflow <= 0:
+            return
+        target = indices[overflow]
+        for index in indices[:overflow]:
+            store[target] += store.pop(index)
+
+    def _value_at_rank(self, rank: int) -> float:
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._bucket_value(index)
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._bucket_value(index)
+        raise AssertionError("rank outside sketch bounds")  # pragma: no cover
+
+
+class NumericAccumulator:
+    """Single-pass count, mean, variance, min/max and median for one column.
+
+    The accumulator doubles as the mergeable partial state of a
+    :class:`~python.dataset_summary.NumericSummary`: results for different
+    shards can be combined with :meth:`merge` and stored with
+    :meth:`to_bytes` / :meth:`from_bytes` without revisiting raw rows.
+
+    An optional ``histogram`` (see :mod:`python.histograms`) is filled in
+    the same pass and merged along with the rest of the state.  It is not
+    part of the serialised form.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        exact_limit: int = DEFAULT_EXACT_LIMIT,
+        histogram: Optional["Histogram"] = None,
+    ) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy, exact_limit)
+        self.histogram = histogram
+
+    def add(self, value: float) -> None:
+        """Update the running statistics using Welford's algorithm."""
+
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.sketch.add(value)
+        if self.histogram is not None:
+            self.histogram.add(value)
+
+    def merge(self, other: "NumericAccumulator") -> "NumericAccumulator":
+        """Combine two partial results in place (Chan et al.) and return ``self``.
+
+        This lets chunks of a file be summarised independently, for example
+        in different processes, and reduced into one accumulator.
+        """
+
+        if other.histogram is not None:
+            if self.histogram is None:
+                self.histogram = copy.deepcopy(other.histogram)
+            else:
+                self.histogram.merge(other.histogram)
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.mean, self.m2 = other.mean, other.m2
+        else:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / total
+            self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Serialise the partial state, including its quantile sketch."""
+
+        header = _ACCUMULATOR_HEADER.pack(
+            _ACCUMULATOR_MAGIC,
+            _ACCUMULATOR_VERSION,
+            self.count,
+            self.total,
+            self.mean,
+            self.m2,
+            self.minimum,
+            self.maximum,
+        )
+        return header + self.sketch.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "NumericAccumulator":
+        """Rebuild an accumulator produced by :meth:`to_bytes`."""
+
+        view = memoryview(data)
+        magic, version, count, total, mean, m2, minimum, maximum = _ACCUMULATOR_HEADER.unpack_from(view)
+        if magic != _ACCUMULATOR_MAGIC or version != _ACCUMULATOR_VERSION:
+            raise ValueError("data is not a serialised NumericAccumulator")
+        accumulator = cls()
+        accumulator.count, accumulator.total = count, total
+        accumulator.mean, accumulator.m2 = mean, m2
+        accumulator.minimum, accumulator.maximum = minimum, maximum
+        accumulator.sketch, _ = QuantileSketch._unpack(view[_ACCUMULATOR_HEADER.size:])
+        return accumulator
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the values seen so far."""
+
+        return self.m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Population standard deviation, matching :func:`statistics.pstdev`."""
+
+        return math.sqrt(self.variance)
+
+    @property
+    def median(self) -> float:
+        return self.sketch.quantile(0.5)
@@ -0,0 +1,183 @@
+"""On-disk cache of dataset summaries keyed by a file fingerprint.
+
+Dashboards tend to summarise the same unchanged files over and over.  A
+:class:`FileFingerprint` (resolved path, size, modification time and an
+optional content hash) identifies one version of a file; together with the
+requested column and summary variant it names a small JSON entry in the
+cache directory.  Looking an entry up costs one ``stat`` call and one small
+read, regardless of the size of the original file.
+
+The cache is bounded by ``max_bytes``.  Entries are touched whenever they
+are read, so eviction removes the least recently used ones first.  The
+cache is only an optimisation: a directory that cannot be written, for
+example a read-only or full ``~/.cache``, turns it into a no-op.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .dataset_summary import NumericSummary
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_DIR_ENV = "LEARNING2025_CACHE_DIR"
+_HASH_BLOCK = 1 << 20
+
+
+def default_cache_dir() -> Path:
+    """Return ``$LEARNING2025_CACHE_DIR`` or a directory under ``~/.cache``."""
+
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "learning-2025" / "summaries"
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Identifies one version of a file on disk."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str] = None
+
+    @classmethod
+    def of(cls, path: str | Path, hash_content: bool = False) -> "FileFingerprint":
+        """Fingerprint ``path``; ``hash_content`` also hashes every byte."""
+
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        digest = _hash_file(resolved) if hash_content else None
+        return cls(str(resolved), stat.st_size, stat.st_mtime_ns, digest)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """A size-capped, least-recently-used store of summary results."""
+
+    def __init__(self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, fingerprint: FileFingerprint, column: Optional[str], variant: str) -> Path:
+        key = json.dumps([asdict(fingerprint), column, variant], sort_keys=True)
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(
+        self,
+        fingerprint: FileFingerprint,
+        column: Optional[str] = None,
+        variant: str = "exact",
+    ) -> Optional[Dict[str, NumericSummary]]:
+        """Return the cached summaries, or ``None`` on a miss."""
+
+        entry = self._entry_path(fingerprint, column, variant)
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return {name: NumericSummary.from_dict(values) for name, values in data.items()}
+
+    def put(
+        self,
+        fingerprint: FileFingerprint,
+        summaries: Dict[str, NumericSummary],
+        column: Optional[str] = None,
+        variant: str = "exact",
+    ) -> bool:
+        """Store ``summaries`` and evict old entries beyond ``max_bytes``.
+
+        Returns ``False`` when the entry could not be written.
+        """
+
+        payload = json.dumps({name: summary.as_dict() for name, summary in summaries.items()})
+        entry = self._entry_path(fingerprint, column, variant)
+        temporary = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry.
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "w", encoding="utf-8") as output:
+                output.write(payload)
+            os.replace(temporary, entry)
+        except OSError:
+            if temporary is not None:
+                Path(temporary).unlink(missing_ok=True)
+            return False
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = []
+        try:
+            listing = list(self.directory.glob("*.json"))
+        except OSError:
+            return
+        for entry in listing:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*.json"):
+            entry.unlink(missing_ok=True)
+
+
+def cached_summary(
+    path: str | Path,
+    compute: Callable[[], Dict[str, NumericSummary]],
+    *,
+    column: Optional[str] = None,
+    variant: str = "exact",
+    cache: Optional[SummaryCache] = None,
+    hash_content: bool = False,
+) -> Dict[str, NumericSummary]:
+    """Return cached summaries for ``path`` or compute and store them.
+
+    ``compute`` is only called on a miss; it usually wraps
+    :func:`~python.dataset_summary.summarise_dataset` or
+    :func:`~python.dataset_summary.compute_numeric_summary`.  ``variant``
+    separates results computed in different modes, for example exact and
+    streaming medians.
+    """
+
+    cache = cache if cache is not None else SummaryCache()
+    fingerprint = FileFingerprint.of(path, hash_content=hash_content)
+    summaries = cache.get(fingerprint, column, variant)
+    if summaries is None:
+        summaries = compute()
+        cache.put(fingerprint, summaries, column, variant)
+    return summaries
@@ -0,0 +1,105 @@
+"""Unit tests for the benchmark data generator and baseline comparison."""
+
+from __future__ import annotations
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+import python
+from python.benchmarks import bench_imports
+from python.benchmarks.bench_summary import compare
+from python.benchmarks.datagen import DatasetSpec, write_dataset
+from python.dataset_summary import load_csv, summarise_dataset
+
+
+class TestDatagen(unittest.TestCase):
+    def test_writes_requested_shape(self) -> None:
+        spec = DatasetSpec(rows=200, null_rate=0.1, extra_numeric_columns=2, extra_text_columns=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = write_dataset(Path(tmpdir) / "data.csv", spec)
+            with path.open(newline="", encoding="utf-8") as handle:
+                records = list(csv.reader(handle))
+            rows = load_csv(path)
+
+        self.assertEqual(records[0], spec.header())
+        self.assertEqual(len(records), 201)
+        self.assertTrue(any("" in record for record in records[1:]))
+        self.assertEqual(set(summarise_dataset(rows)), {"salary", "tenure_years", "metric_0", "metric_1"})
+
+    def test_is_deterministic(self) -> None:
+        spec = DatasetSpec(rows=50, null_rate=0.2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = write_dataset(Path(tmpdir) / "a.csv", spec).read_text(encoding="utf-8")
+            second = write_dataset(Path(tmpdir) / "b.csv", spec).read_text(encoding="utf-8")
+        self.assertEqual(first, second)
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_only_regressions_beyond_tolerance(self) -> None:
+        baseline = [
+            {"benchmark": "load_csv", "rows": 1000, "rows_per_sec": 100.0},
+            {"benchmark": "cli", "rows": 1000, "rows_per_sec": 100.0},
+        ]
+        results = [
+            {"benchmark": "load_csv", "rows": 1000, "rows_per_sec": 85.0},
+            {"benchmark": "cli", "rows": 1000, "rows_per_sec": 70.0},
+            {"benchmark": "summarise_dataset", "rows": 1000, "rows_per_sec": 1.0},
+        ]
+
+        regressions = compare(results, baseline, tolerance=0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("cli @ 1000 rows"))
+
+
+_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1000 |       1500 |     python.quantiles
+import time:       400 |       2020 |   python
+import time:      3000 |       5020 | python.cli
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_parses_importtime_output(self) -> None:
+        records = bench_imports.parse_importtime(_IMPORTTIME)
+
+        self.assertEqual([record.module for record in records], ["_io", "python.quantiles", "python", "python.cli"])
+        self.assertEqual([record.depth for record in records], [1, 2, 1, 0])
+        self.assertEqual((records[-1].self_us, records[-1].cumulative_us), (3000, 5020))
+
+    def test_check_and_compare(self) -> None:
+        results = [
+            {"module": "python.cli", "cumulative_ms": 80.0, "modules": ["python.cli", "numpy.linalg"]},
+            {"module": "python", "cumulative_ms": 5.0, "modules": ["python", "numpyish"]},
+        ]
+        baseline = [{"module": "python.cli", "cumulative_ms": 50.0}, {"module": "python", "cumulative_ms": 4.5}]
+
+        self.assertEqual(len(bench_imports.check(results, max_ms=60, forbidden=["numpy"])), 2)
+        self.assertEqual(bench_imports.check(results, max_ms=None, forbidden=[]), [])
+        regressions = bench_imports.compare(results, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("python.cli"))
+
+    def test_cli_start_up_skips_the_summary_code(self) -> None:
+        result = bench_imports.measure("python.cli", repeat=1)
+
+        self.assertEqual(result["module"], "python.cli")
+        self.assertEqual(bench_imports.check([result], max_ms=None), [])
+        self.assertNotIn("python.dataset_summary", result["modules"])
+
+    def test_package_attributes_load_lazily(self) -> None:
+        from python.dataset_summary import compute_numeric_summary
+
+        self.assertIs(python.compute_numeric_summary, compute_numeric_summary)
+        self.assertTrue(all(hasattr(python, name) for name in python.__all__))
+        self.assertIn("summarise_files", dir(python))
+        with self.assertRaises(AttributeError):
+            python.missing_name
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Unit tests for the columnar CSV loader."""
+
+from __future__ import annotations
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.columnar import CategoricalColumn, ColumnarTable, NumericColumn, load_columnar
+from python.dataset_summary import compute_numeric_summary, summarise_dataset
+from python.demo_data import small_employee_dataset
+
+
+class TestColumnarTable(unittest.TestCase):
+    def test_columns_are_typed(self) -> None:
+        table = ColumnarTable.from_rows(small_employee_dataset())
+
+        self.assertIsInstance(table["salary"], NumericColumn)
+        self.assertIsInstance(table["department"], CategoricalColumn)
+        self.assertEqual(table["department"].dictionary, ["Engineering", "Data", "Analytics"])
+        self.assertEqual(len(table), 5)
+
+    def test_summaries_match_dict_rows(self) -> None:
+        rows = small_employee_dataset()
+        table = ColumnarTable.from_rows(rows)
+
+        expected = summarise_dataset(rows)
+        self.assertEqual(summarise_dataset(table), expected)
+        self.assertEqual(compute_numeric_summary(table, "salary"), expected["salary"])
+
+    def test_load_columnar_handles_blanks_and_mixed_columns(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "data.csv"
+            path.write_text("a,b\n1,x\n,2\n3,\n", encoding="utf-8")
+            table = load_columnar(path)
+
+        self.assertEqual(list(table["a"].valid_values()), [1.0, 3.0])
+        self.assertIsInstance(table["b"], CategoricalColumn)
+        self.assertEqual(list(table.rows())[1], {"a": None, "b": "2"})
+
+        summaries = summarise_dataset(table)
+        self.assertEqual(summaries["b"].count, 1)
+        self.assertTrue(math.isclose(summaries["a"].mean, 2.0))
+        with self.assertRaises(ValueError):
+            compute_numeric_summary(table, "b")
+        with self.assertRaises(ValueError):
+            compute_numeric_summary(table, "missing")
+
+    def test_cells_come_back_as_written(self) -> None:
+        rows = [
+            {"zip": "2134", "price": "1.5", "id": "1234567890123456788", "code": "7"},
+            {"zip": "02134", "price": "3.50", "id": "1234567890123456789", "code": "007"},
+            {"zip": "", "price": "1e3", "id": "12", "code": "x"},
+        ]
+        table = ColumnarTable.from_rows(rows)
+
+        self.assertIsInstance(table["zip"], NumericColumn)
+        self.assertIsInstance(table["code"], CategoricalColumn)
+        self.assertEqual(table["code"].dictionary, ["7", "007", "x"])
+        self.assertEqual(list(table.rows()), [{**row, "zip": row["zip"] or None} for row in rows])
+        self.assertEqual(list(table.select([False, True, True]).rows())[0]["price"], "3.50")
+        self.assertEqual(list(table["price"].valid_values()), [1.5, 3.5, 1000.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
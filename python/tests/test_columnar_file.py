@@ -0,0 +1,108 @@
+"""Unit tests for the binary columnar file format."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.columnar import CategoricalColumn, ColumnarTable, NumericColumn, load_columnar
+from python.columnar_file import _read_footer, block_statistics, convert_csv, is_columnar_file, load_columnar_file
+from python.dataset_summary import load_csv, summarise_dataset
+
+
+class TestColumnarFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory.name)
+        self.csv = self.root / "data.csv"
+        lines = ["name,value,code"]
+        for index in range(50):
+            value = "" if index % 7 == 0 else str(index * 1.5)
+            # The first blocks look numeric; "x" in the last block demotes the column.
+            code = "x" if index == 45 else str(index)
+            lines.append(f"n{index},{value},{code}")
+            if index == 20:
+                lines.append("")
+        self.csv.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self.binary = self.root / "data.ncol"
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_round_trip_matches_csv(self) -> None:
+        self.assertEqual(convert_csv(self.csv, self.binary, block_rows=16), 50)
+        self.assertTrue(is_columnar_file(self.binary))
+        self.assertFalse(is_columnar_file(self.csv))
+
+        table = load_columnar_file(self.binary)
+        self.assertIsInstance(table["value"], NumericColumn)
+        self.assertIsInstance(table["code"], CategoricalColumn)
+        self.assertEqual(list(table.rows()), list(ColumnarTable.from_rows(load_csv(self.csv)).rows()))
+        self.assertEqual(summarise_dataset(table), summarise_dataset(load_csv(self.csv)))
+
+    def test_block_statistics_come_from_footer(self) -> None:
+        convert_csv(self.csv, self.binary, block_rows=16)
+        statistics = block_statistics(self.binary)
+
+        self.assertEqual(statistics["value"], {"count": 42, "min": 1.5, "max": 72.0})
+        self.assertEqual(statistics["code"], {"count": 50, "min": None, "max": None})
+
+    def test_footer_holds_no_strings_and_wide_files_convert(self) -> None:
+        convert_csv(self.csv, self.binary, block_rows=16)
+        with self.binary.open("rb") as handle:
+            footer = _read_footer(handle)
+        self.assertNotIn("n49", json.dumps(footer))
+
+        wide = self.root / "wide.csv"
+        names = [f"c{index}" for index in range(1500)]
+        wide.write_text(",".join(names) + "\n" + ",".join(["1", "x"] * 750) + "\n", encoding="utf-8")
+        self.assertEqual(convert_csv(wide, self.binary, block_rows=8), 1)
+        table = load_columnar_file(self.binary)
+        self.assertEqual((table["c1498"].value_at(0), table["c1499"].value_at(0)), ("1", "x"))
+
+    def test_cells_come_back_as_written(self) -> None:
+        source = self.root / "codes.csv"
+        lines = ["zip,code"]
+        for index in range(24):
+            # zip turns non-canonical in the second block, code turns to text in the third.
+            zip_code = f"0{index}" if index == 9 else str(index)
+            code = "x" if index == 20 else (f"{index}.50" if index == 3 else str(index))
+            lines.append(f"{zip_code},{code}")
+        source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        convert_csv(source, self.binary, block_rows=8)
+        table = load_columnar_file(self.binary)
+
+        self.assertIsInstance(table["zip"], NumericColumn)
+        self.assertIsInstance(table["code"], CategoricalColumn)
+        self.assertEqual(list(table.rows()), list(load_columnar(source).rows()))
+        self.assertEqual(list(table.rows())[9], {"zip": "09", "code": "9"})
+        self.assertEqual(list(table.rows())[3]["code"], "3.50")
+        self.assertEqual(block_statistics(self.binary)["zip"], {"count": 24, "min": 0.0, "max": 23.0})
+
+    def test_rejects_unaligned_blocks_and_foreign_files(self) -> None:
+        with self.assertRaises(ValueError):
+            convert_csv(self.csv, self.binary, block_rows=10)
+        with self.assertRaises(ValueError):
+            block_statistics(self.csv)
+
+    def test_cli_convert_then_summarise(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            main(["convert", str(self.csv), str(self.binary)])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--csv", str(self.binary), "--column", "value", "--no-cache"])
+        self.assertEqual(json.loads(output.getvalue())["value"]["count"], 42)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--csv", str(self.binary), "--block-stats", "--column", "value"])
+        self.assertEqual(json.loads(output.getvalue())["value"]["max"], 72.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Unit tests for transparent decompression of CSV inputs."""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.compression import _BackgroundReader, detect_compression, open_text
+from python.columnar import load_columnar
+from python.dataset_summary import compute_numeric_summary, iter_csv, load_csv
+from python.mmap_scanner import summarise_csv_mmap
+from python.parallel import summarise_csv_parallel
+
+_COMPRESSORS = {"gzip": (gzip.compress, ".gz"), "bz2": (bz2.compress, ".bz2"), "xz": (lzma.compress, ".xz")}
+
+
+class TestCompressedInput(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory.name)
+        lines = ["name,value"] + [f"n{index},{index}" for index in range(5000)]
+        self.data = ("\n".join(lines) + "\n").encode("utf-8")
+        self.plain = self.root / "data.csv"
+        self.plain.write_bytes(self.data)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _write(self, name: str, suffix: str = "") -> Path:
+        compress, extension = _COMPRESSORS[name]
+        path = self.root / f"data.csv{suffix or extension}"
+        path.write_bytes(compress(self.data))
+        return path
+
+    def test_detects_format_from_magic_bytes(self) -> None:
+        self.assertIsNone(detect_compression(self.plain))
+        for name in _COMPRESSORS:
+            # The suffix is deliberately misleading.
+            self.assertEqual(detect_compression(self._write(name, ".txt")), name)
+
+    def test_loaders_match_plain_file(self) -> None:
+        expected = compute_numeric_summary(load_csv(self.plain), "value")
+        for name in _COMPRESSORS:
+            path = self._write(name)
+            self.assertEqual(load_csv(path), load_csv(self.plain))
+            self.assertEqual(sum(1 for _ in iter_csv(path)), 5000)
+            self.assertEqual(compute_numeric_summary(load_columnar(path), "value"), expected)
+            self.assertEqual(summarise_csv_mmap(path, "value")["value"].count, 5000)
+            self.assertEqual(summarise_csv_parallel(path, "value", workers=2)["value"].count, 5000)
+
+    def test_corrupt_stream_raises_in_reader(self) -> None:
+        path = self.root / "broken.csv.gz"
+        path.write_bytes(gzip.compress(self.data)[:200])
+        with self.assertRaises(EOFError):
+            load_csv(path)
+
+    def test_early_close_stops_background_thread(self) -> None:
+        reader = _BackgroundReader(gzip.open(self._write("gzip"), "rb"), chunk_size=64, depth=1)
+        self.assertEqual(len(reader.read(10)), 10)
+        reader.close()
+        self.assertFalse(reader._thread.is_alive())
+
+    def test_open_text_reads_compressed_text(self) -> None:
+        with open_text(self._write("xz")) as handle:
+            self.assertEqual(handle.readline(), "name,value\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
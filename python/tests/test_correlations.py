@@ -0,0 +1,111 @@
+"""Unit tests for the streaming covariance and correlation matrix."""
+
+from __future__ import annotations
+
+import io
+import json
+import math
+import random
+import statistics
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.columnar import ColumnarTable
+from python.correlations import CoMoments
+from python.dataset_summary import correlation_matrix
+from python.demo_data import small_employee_dataset
+from python.parallel import correlate_csv_parallel
+
+
+def _rows(count: int, seed: int = 5):
+    generator = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        x = generator.gauss(1e8, 1.0)
+        row = {"x": x, "y": 3 * x + generator.gauss(0.0, 1.0), "z": generator.random()}
+        if generator.random() < 0.25:
+            del row["y"]
+        rows.append(row)
+    return rows
+
+
+class TestCoMoments(unittest.TestCase):
+    def test_matches_statistics_with_pairwise_deletion(self) -> None:
+        rows = _rows(2000)
+        moments = CoMoments()
+        for row in rows:
+            moments.add(row)
+
+        pairs = [(row["x"], row["y"]) for row in rows if "y" in row]
+        xs, ys = zip(*pairs)
+        self.assertEqual(moments.count("x", "y"), len(pairs))
+        self.assertEqual(moments.count("x", "x"), len(rows))
+        self.assertAlmostEqual(moments.correlation("y", "x"), statistics.correlation(xs, ys), places=6)
+        self.assertAlmostEqual(
+            moments.covariance("x", "y"),
+            statistics.covariance(xs, ys) * (len(xs) - 1) / len(xs),
+            places=5,
+        )
+        self.assertAlmostEqual(moments.covariance("x", "x"), statistics.pvariance([row["x"] for row in rows]), places=6)
+
+    def test_merge_equals_a_single_pass(self) -> None:
+        rows = _rows(900)
+        single, first, second = CoMoments(), CoMoments(), CoMoments()
+        for index, row in enumerate(rows):
+            single.add(row)
+            (first if index < 300 else second).add(row)
+
+        merged = first.merge(second)
+        for left in ("x", "y", "z"):
+            for right in ("x", "y", "z"):
+                self.assertEqual(merged.count(left, right), single.count(left, right))
+                self.assertTrue(math.isclose(merged.covariance(left, right), single.covariance(left, right), rel_tol=1e-6))
+
+    def test_constant_and_unknown_columns(self) -> None:
+        moments = CoMoments()
+        moments.add({"a": 1.0, "b": 2.0})
+        moments.add({"a": 1.0, "b": 3.0})
+
+        self.assertIsNone(moments.correlation("a", "b"))
+        self.assertIsNone(moments.covariance("a", "missing"))
+        self.assertEqual(moments.count("a", "missing"), 0)
+
+
+class TestCorrelationMatrix(unittest.TestCase):
+    def test_rows_tables_and_workers_agree(self) -> None:
+        rows = small_employee_dataset()
+        expected = correlation_matrix(rows)
+
+        self.assertEqual(expected.columns, ["salary", "tenure_years"])
+        self.assertAlmostEqual(correlation_matrix(ColumnarTable.from_rows(rows)).correlation("salary", "tenure_years"),
+                               expected.correlation("salary", "tenure_years"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "employees.csv"
+            lines = ["salary,tenure_years"] + [f"{row['salary']},{row['tenure_years']}" for row in rows * 40]
+            path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            parallel = correlate_csv_parallel(path, workers=3)
+
+        self.assertEqual(parallel.count("salary", "tenure_years"), 200)
+        self.assertAlmostEqual(parallel.correlation("salary", "tenure_years"), expected.correlation("salary", "tenure_years"))
+
+    def test_filter_is_applied(self) -> None:
+        moments = correlation_matrix(small_employee_dataset(), filter="department == 'Data'")
+        self.assertEqual(moments.count("salary", "tenure_years"), 2)
+
+    def test_cli_correlations_section(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--correlations"])
+
+        section = json.loads(output.getvalue())["tenure_years"]["correlations"]
+        self.assertEqual(set(section), {"salary", "tenure_years"})
+        self.assertEqual(section["tenure_years"]["correlation"], 1.0)
+        self.assertGreater(section["salary"]["correlation"], 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""Unit tests for the summary daemon and its thin client."""
+
+from __future__ import annotations
+
+import http.client
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.client import request
+from python.daemon import MemoryLRU, SummaryService, make_server, parse_serve_args
+from python.summary_cache import CACHE_DIR_ENV
+
+
+def _write(path: Path, rows: int, offset: int = 0) -> None:
+    lines = ["department,salary"] + [f"d{index % 3},{index + offset}" for index in range(rows)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _cli(argv) -> dict:
+    output = io.StringIO()
+    with redirect_stdout(output):
+        main(argv)
+    return json.loads(output.getvalue())
+
+
+class TestMemoryLRU(unittest.TestCase):
+    def test_evicts_least_recently_used_and_stale_entries(self) -> None:
+        cache = MemoryLRU(max_bytes=10)
+        cache.put("a", 1, "A", 4)
+        cache.put("b", 1, "B", 4)
+        self.assertEqual(cache.get("a", 1), "A")
+        cache.put("c", 1, "C", 4)
+
+        self.assertIsNone(cache.get("b", 1))
+        self.assertEqual((cache.get("a", 1), cache.get("c", 1), cache.size), ("A", "C", 8))
+        self.assertIsNone(cache.get("a", 2))
+        self.assertEqual((len(cache), cache.size), (1, 4))
+
+        cache.put("huge", 1, "H", 11)
+        self.assertIsNone(cache.get("huge", 1))
+
+
+class TestSummaryService(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name) / "salaries.csv"
+        _write(self.path, 30)
+        # Requests without --no-cache also use the on-disk summary cache.
+        patcher = unittest.mock.patch.dict(os.environ, {CACHE_DIR_ENV: str(Path(self.directory.name) / "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = SummaryService()
+
+    def test_answers_like_the_cli_and_caches_results(self) -> None:
+        argv = ["--csv", str(self.path), "--percentiles", "90", "--no-cache"]
+        first = self.service.handle({"argv": argv[:-1]})
+        again = self.service.handle({"argv": argv[:-1]})
+
+        self.assertEqual(first["result"], _cli(argv))
+        self.assertEqual((first["cached"], again["cached"]), (False, True))
+        self.assertEqual(again["result"], first["result"])
+
+    def test_reuses_the_parsed_table_and_refreshes_changed_files(self) -> None:
+        self.service.handle({"argv": ["--csv", str(self.path), "--no-cache"]})
+        tables = [key for key in self.service.cache._entries if key[0] == "table"]
+        self.assertEqual(len(tables), 1)
+
+        filtered = self.service.handle({"argv": ["--csv", str(self.path), "--where", "department == 'd0'"]})
+        self.assertEqual(filtered["result"]["salary"]["count"], 10)
+        self.assertEqual([key for key in self.service.cache._entries if key[0] == "table"], tables)
+
+        _write(self.path, 45, offset=1000)
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 10**9))
+        refreshed = self.service.handle({"argv": ["--csv", str(self.path), "--where", "department == 'd0'"]})
+        self.assertFalse(refreshed["cached"])
+        self.assertEqual(refreshed["result"]["salary"]["count"], 15)
+
+    def test_loads_what_the_cli_would_load(self) -> None:
+        self.path.write_text(
+            "team,level,salary\na,3.50,1\n,3.5,2\n,,4\nb,3.50,8\n", encoding="utf-8"
+        )
+        for extra in ([], ["--columnar"], ["--column", "salary"], ["--where", "level == '3.50'"]):
+            argv = ["--csv", str(self.path), "--group-by", "level", "--no-cache", *extra]
+            self.assertEqual(self.service.handle({"argv": argv})["result"], _cli(argv), extra)
+            argv[3] = "team"
+            self.assertEqual(self.service.handle({"argv": argv})["result"], _cli(argv), extra)
+
+        kinds = {key[1] for key in self.service.cache._entries if key[0] == "table"}
+        self.assertEqual(kinds, {"rows", "columnar"})
+
+    def test_errors(self) -> None:
+        usage = self.service.handle({"argv": ["--bins", "3"]})
+        self.assertEqual(usage["exit"], 2)
+        self.assertIn("--bins and --histogram-range need --histogram", usage["message"])
+
+        missing = self.service.handle({"argv": ["--csv", str(self.path), "--column", "nope"]})
+        self.assertEqual((missing["status"], missing["exit"]), ("error", 1))
+        self.assertEqual(self.service.handle({"argv": ["--profile"]})["exit"], 2)
+        self.assertEqual(self.service.handle({"argv": "--csv"})["exit"], 2)
+
+
+class TestServers(unittest.TestCase):
+    def _serve(self, **address):
+        server = make_server(SummaryService(), workers=3, **address)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+    def test_unix_socket_and_thin_client(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            address = str(Path(directory) / "summaries.sock")
+            self._serve(socket_path=address)
+            expected = _cli(["--column", "salary", "--percentiles", "25,75"])
+
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                responses = list(pool.map(
+                    lambda _: request(address, ["--column", "salary", "--percentiles", "25,75"], timeout=30),
+                    range(12),
+                ))
+            self.assertTrue(all(response["result"] == expected for response in responses))
+            self.assertEqual(_cli(["--connect", address, "--column", "salary", "--percentiles", "25,75"]), expected)
+            self.assertEqual(_cli(["--column", "salary", f"--connect={address}", "--percentiles", "25,75"]), expected)
+
+            with self.assertRaises(SystemExit) as raised:
+                with redirect_stdout(io.StringIO()), unittest.mock.patch("sys.stderr", io.StringIO()):
+                    main(["--connect", address, "--column", "nope"])
+            self.assertEqual(raised.exception.code, 1)
+
+    def test_http(self) -> None:
+        server = self._serve(port=0)
+        host, port = server.server_address[:2]
+        response = request(f"http://{host}:{port}", ["--categorical", "--top", "2"], timeout=30)
+
+        self.assertEqual(response["status"], "ok")
+        self.assertEqual(response["result"], _cli(["--categorical", "--top", "2"]))
+
+    def test_http_refuses_other_hosts_and_content_types(self) -> None:
+        with self.assertRaises(ValueError):
+            make_server(SummaryService(), host="0.0.0.0", port=0)
+        with self.assertRaises(SystemExit), unittest.mock.patch("sys.stderr", io.StringIO()):
+            parse_serve_args(["--port", "0", "--host", "192.168.1.10"])
+        self.assertEqual(parse_serve_args(["--port", "0", "--host", "::1"]).host, "::1")
+
+        server = self._serve(port=0)
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+        self.addCleanup(connection.close)
+        body = json.dumps({"argv": ["--column", "salary"]})
+        connection.request("POST", "/", body, {"Content-Type": "text/plain"})
+        response = connection.getresponse()
+        self.assertEqual((response.status, json.loads(response.read())["exit"]), (415, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
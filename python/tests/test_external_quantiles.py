@@ -0,0 +1,86 @@
+"""Unit tests for exact quantiles computed out of core."""
+
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.dataset_summary import compute_numeric_summary, summarise_csv_column
+from python.demo_data import small_employee_dataset
+from python.external_quantiles import ExternalQuantiles
+from python.quantiles import select_quantiles
+
+
+class TestExternalQuantiles(unittest.TestCase):
+    def test_spilled_runs_give_exact_quantiles(self) -> None:
+        generator = random.Random(11)
+        values = [generator.lognormvariate(0, 2) * generator.choice((-1, 1)) for _ in range(20001)]
+        values += [0.0] * 500
+
+        with ExternalQuantiles(memory_budget=40 * 2048) as spill:
+            spill.extend(values)
+            self.assertGreater(spill.spilled_runs, 5)
+            quantiles = [0.0, 0.01, 0.5, 0.9, 1.0]
+            self.assertEqual(spill.quantiles(quantiles), select_quantiles(list(values), quantiles))
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "needs /proc/self/fd")
+    def test_runs_share_one_file_between_queries(self) -> None:
+        generator = random.Random(5)
+        values = [generator.uniform(-1, 1) for _ in range(60 * 1024)]
+        open_before = len(os.listdir("/proc/self/fd"))
+
+        with ExternalQuantiles(memory_budget=1) as spill:
+            for index in range(0, len(values), 10 * 1024):
+                spill.extend(values[index : index + 10 * 1024])
+                # Querying maps the file; later spills append to it and remap.
+                self.assertEqual(spill.quantiles([0.5]), select_quantiles(values[: index + 10 * 1024], [0.5]))
+            self.assertEqual(spill.spilled_runs, 60)
+            # The spill file and the mapping's duplicate of its descriptor.
+            self.assertLessEqual(len(os.listdir("/proc/self/fd")), open_before + 2)
+        self.assertEqual(len(os.listdir("/proc/self/fd")), open_before)
+
+    def test_in_memory_values_and_duplicates(self) -> None:
+        with ExternalQuantiles() as spill:
+            spill.extend([3.0, 1.0, 3.0, 2.0])
+            self.assertEqual(spill.spilled_runs, 0)
+            self.assertEqual(spill.quantiles([0.5]), [statistics.median([3.0, 1.0, 3.0, 2.0])])
+            spill.add(-0.0)
+            self.assertEqual(spill.value_at(0), -0.0)
+            self.assertEqual([spill.value_at(rank) for rank in range(5)], [0.0, 1.0, 2.0, 3.0, 3.0])
+
+    def test_invalid_input(self) -> None:
+        with ExternalQuantiles() as spill:
+            with self.assertRaises(ValueError):
+                spill.add(float("nan"))
+            with self.assertRaises(ValueError):
+                spill.quantiles([0.5])
+
+
+class TestMemoryBudgetSummaries(unittest.TestCase):
+    def test_matches_the_in_memory_summary(self) -> None:
+        rows = small_employee_dataset()
+        expected = compute_numeric_summary(rows, "salary", percentiles=[90])
+        budgeted = compute_numeric_summary(rows, "salary", percentiles=[90], memory_budget=1)
+
+        self.assertEqual((budgeted.median, budgeted.percentiles), (expected.median, expected.percentiles))
+        self.assertEqual((budgeted.minimum, budgeted.maximum, budgeted.count), (expected.minimum, expected.maximum, expected.count))
+        self.assertAlmostEqual(budgeted.mean, expected.mean)
+
+    def test_csv_column_larger_than_the_budget(self) -> None:
+        generator = random.Random(2)
+        values = [round(generator.uniform(-50, 50), 3) for _ in range(5000)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "values.csv"
+            path.write_text("value\n" + "".join(f"{value}\n" for value in values), encoding="utf-8")
+            summary = summarise_csv_column(path, "value", percentiles=[25, 75], memory_budget=40 * 1024)
+
+        self.assertEqual(summary.median, statistics.median(values))
+        self.assertEqual(summary.percentiles, dict(zip([25, 75], select_quantiles(values, [0.25, 0.75]))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests for the row filter expression language."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.columnar import ColumnarTable
+from python.dataset_summary import compute_numeric_summary, summarise_csv_column, summarise_dataset
+from python.demo_data import small_employee_dataset
+from python.filters import RowFilter
+from python.grouping import summarise_grouped
+
+
+class TestRowFilter(unittest.TestCase):
+    def test_typed_comparisons_and_boolean_logic(self) -> None:
+        row_filter = RowFilter("department == 'Data' and tenure_years >= 3 or salary < -1")
+
+        self.assertTrue(row_filter({"department": "Data", "tenure_years": "4", "salary": "1"}))
+        # Numeric comparison, not string comparison: "10" >= 3 but "10" < "3".
+        self.assertTrue(row_filter({"department": "Data", "tenure_years": "10", "salary": "1"}))
+        self.assertFalse(row_filter({"department": "Data", "tenure_years": "", "salary": "1"}))
+        self.assertTrue(row_filter({"department": "Ops", "tenure_years": "1", "salary": "-5"}))
+
+    def test_membership_null_chains_and_backticks(self) -> None:
+        row_filter = RowFilter("`team name` in ('a', 'b') and not bonus is null and 1 <= level < 3")
+
+        self.assertEqual(row_filter.columns, ["team name", "bonus", "level"])
+        self.assertTrue(row_filter({"team name": "a", "bonus": "5", "level": "2"}))
+        self.assertFalse(row_filter({"team name": "a", "bonus": "", "level": "2"}))
+        self.assertFalse(row_filter({"team name": "a", "bonus": "5", "level": "3"}))
+
+    def test_rejects_unsafe_or_unknown_syntax(self) -> None:
+        for expression in ("__import__('os').system('true')", "salary + 1 > 2", "a == b", "salary >"):
+            with self.assertRaises(ValueError):
+                RowFilter(expression)
+        with self.assertRaisesRegex(ValueError, "Filter column 'missing'"):
+            RowFilter("missing == 1")({"salary": "1"})
+
+    def test_mask_matches_row_evaluation(self) -> None:
+        rows = small_employee_dataset()
+        table = ColumnarTable.from_rows(rows)
+        row_filter = RowFilter("department != 'Engineering' or salary > 80000")
+
+        self.assertEqual(row_filter.mask(table), [row_filter(row) for row in rows])
+
+    def test_string_literals_compare_the_cells_as_written(self) -> None:
+        numeric = [{"x": "3.50"}, {"x": "3.5"}, {"x": "02134"}, {"x": "1234567890123456789"}, {"x": ""}]
+        # "n/a" demotes the column to text.
+        mixed = numeric + [{"x": "n/a"}]
+        expressions = {
+            "x == '3.50'": [True, False, False, False, False],
+            "x == '2134'": [False, False, False, False, False],
+            "x in ('02134', 'n/a')": [False, False, True, False, False],
+            "x == '1234567890123456788'": [False, False, False, False, False],
+            "x != '3.5'": [True, False, True, True, False],
+            "x == 3.5": [True, True, False, False, False],
+        }
+        for rows in (numeric, mixed):
+            table = ColumnarTable.from_rows(rows)
+            for expression, expected in expressions.items():
+                row_filter = RowFilter(expression)
+                selected = [row_filter(row) for row in rows][: len(expected)]
+                self.assertEqual(selected, expected, expression)
+                self.assertEqual(row_filter.mask(table), [row_filter(row) for row in rows], expression)
+
+
+class TestFilteredSummaries(unittest.TestCase):
+    def test_summaries_respect_filter(self) -> None:
+        rows = small_employee_dataset()
+        expression = "department == 'Data'"
+        expected = compute_numeric_summary([row for row in rows if row["department"] == "Data"], "salary")
+
+        self.assertEqual(compute_numeric_summary(rows, "salary", filter=expression), expected)
+        self.assertEqual(compute_numeric_summary(ColumnarTable.from_rows(rows), "salary", filter=expression), expected)
+        self.assertEqual(summarise_dataset(iter(rows), streaming=True, filter=expression)["salary"].count, expected.count)
+        groups = summarise_grouped(rows, ["department"], filter=expression)
+        self.assertEqual(list(groups), [("Data",)])
+
+    def test_projected_csv_and_cli(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.csv"
+            path.write_text("department,salary\nData,10\nOps,20\nData,30\n", encoding="utf-8")
+
+            summary = summarise_csv_column(path, "salary", filter="department == 'Data'")
+            self.assertEqual((summary.count, summary.mean), (2, 20))
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(["--csv", str(path), "--where", "salary > 15", "--no-cache"])
+            self.assertEqual(json.loads(output.getvalue())["salary"]["count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unit tests for hash-aggregated group-by summaries."""
+
+from __future__ import annotations
+
+import io
+import json
+import math
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python import numpy_backend
+from python.cli import main
+from python.columnar import ColumnarTable
+from python.columnar_file import convert_csv
+from python.dataset_summary import compute_numeric_summary
+from python.demo_data import small_employee_dataset
+from python.grouping import summarise_grouped
+
+
+class TestSummariseGrouped(unittest.TestCase):
+    def test_matches_per_group_summaries(self) -> None:
+        rows = small_employee_dataset()
+        groups = summarise_grouped(iter(rows), by=["department"])
+
+        self.assertEqual(set(groups), {("Engineering",), ("Data",), ("Analytics",)})
+        data_rows = [row for row in rows if row["department"] == "Data"]
+        expected = compute_numeric_summary(data_rows, "salary")
+        actual = groups[("Data",)]["salary"]
+        self.assertEqual(actual.median, expected.median)
+        self.assertTrue(math.isclose(actual.stdev, expected.stdev))
+        self.assertEqual(set(groups[("Data",)]), {"salary", "tenure_years"})
+
+    def test_multi_column_keys_and_column_selection(self) -> None:
+        groups = summarise_grouped(small_employee_dataset(), by=["department", "tenure_years"], columns=["salary"])
+
+        self.assertEqual(groups[("Analytics", "3")]["salary"].count, 1)
+        self.assertEqual(len(groups), 5)
+        self.assertTrue(all(set(summaries) == {"salary"} for summaries in groups.values()))
+
+    def test_tables_key_blanks_like_rows_and_cells_as_written(self) -> None:
+        rows = [
+            {"team": "a", "level": "3.50", "value": "1"},
+            {"team": "", "level": "3.5", "value": "2"},
+            {"team": "", "level": "", "value": "4"},
+        ]
+        table = ColumnarTable.from_rows(rows)
+
+        self.assertEqual(set(summarise_grouped(table, by=["team"])), set(summarise_grouped(rows, by=["team"])))
+        self.assertEqual(set(summarise_grouped(rows, by=["level"])), {("3.50",), ("3.5",), ("",)})
+        grouped = summarise_grouped(table, by=["level"])
+        self.assertEqual(set(grouped), {("3.50",), ("3.5",), ("",)})
+        self.assertEqual(grouped[("3.5",)]["value"].count, 1)
+
+    def test_keys_are_the_cells_as_written_on_every_backend(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "data.csv"
+            path.write_text("zip,value\n2134,1\n02134,2\n2134,4\n2134.0,8\n,16\n", encoding="utf-8")
+            converted = Path(directory) / "data.ncol"
+            convert_csv(path, converted)
+            runs = [[str(path)], [str(path), "--columnar"], [str(converted)]]
+            if numpy_backend.is_available():
+                runs.append([str(path), "--backend", "numpy"])
+            keys = []
+            for source, *extra in runs:
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    main(["--csv", source, "--group-by", "zip", "--no-cache", *extra])
+                groups = json.loads(output.getvalue())["groups"]
+                keys.append({group["key"]["zip"]: group["summaries"]["value"]["count"] for group in groups})
+
+        self.assertEqual(keys[0], {"": 1, "02134": 1, "2134": 2, "2134.0": 1})
+        for grouped in keys[1:]:
+            self.assertEqual(grouped, keys[0])
+
+    def test_cardinality_cap_and_validation(self) -> None:
+        rows = small_employee_dataset()
+        with self.assertRaises(ValueError):
+            summarise_grouped(rows, by=["employee"], max_groups=3)
+        with self.assertRaises(ValueError):
+            summarise_grouped(rows, by=["missing"])
+        with self.assertRaises(ValueError):
+            summarise_grouped(rows, by=["department"], columns=["employee"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Unit tests for the streaming histograms."""
+
+from __future__ import annotations
+
+import io
+import json
+import math
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.columnar import ColumnarTable
+from python.dataset_summary import NumericSummary, compute_numeric_summary, iter_csv, summarise_dataset
+from python.demo_data import small_employee_dataset
+from python.histograms import FixedWidthHistogram, HistogramSpec, LogHistogram, histogram_from_dict, parse_bounds
+from python.parallel import summarise_csv_parallel
+
+
+class TestFixedWidthHistogram(unittest.TestCase):
+    def test_values_land_in_their_bins(self) -> None:
+        histogram = FixedWidthHistogram(0.0, 10.0, bins=5)
+        for value in (-1.0, 0.0, 1.9, 2.0, 9.99, 10.0, 11.0, math.nan):
+            histogram.add(value)
+
+        self.assertEqual(histogram.counts, [2, 1, 0, 0, 2])
+        self.assertEqual((histogram.underflow, histogram.overflow), (1, 2))
+        self.assertEqual(histogram.bins()[1], (2.0, 4.0, 1))
+
+    def test_merge_requires_identical_bins(self) -> None:
+        left, right = FixedWidthHistogram(0.0, 1.0, 2), FixedWidthHistogram(0.0, 1.0, 2)
+        left.add(0.1)
+        right.add(0.9)
+        right.add(0.2)
+
+        self.assertEqual(left.merge(right).counts, [2, 1])
+        with self.assertRaises(ValueError):
+            left.merge(FixedWidthHistogram(0.0, 2.0, 2))
+
+    def test_round_trip(self) -> None:
+        histogram = FixedWidthHistogram(-1.0, 1.0, 4)
+        for value in (-2.0, -0.5, 0.25, 0.3):
+            histogram.add(value)
+
+        restored = histogram_from_dict(json.loads(json.dumps(histogram.as_dict())))
+        self.assertEqual(restored.as_dict(), histogram.as_dict())
+
+
+class TestLogHistogram(unittest.TestCase):
+    def test_decades_and_signs(self) -> None:
+        histogram = LogHistogram(bins_per_decade=1)
+        for value in (0.0, 5.0, 50.0, 55.0, -5.0, math.inf):
+            histogram.add(value)
+
+        self.assertEqual(
+            histogram.bins(),
+            [(-10.0, -1.0, 1), (0.0, 0.0, 1), (1.0, 10.0, 1), (10.0, 100.0, 2)],
+        )
+        self.assertEqual(histogram.overflow, 1)
+
+    def test_merge_and_round_trip(self) -> None:
+        left, right = LogHistogram(), LogHistogram()
+        for value in (1.0, 20.0, -300.0):
+            left.add(value)
+        for value in (25.0, 0.0):
+            right.add(value)
+
+        merged = left.merge(right)
+        self.assertEqual(sum(count for _, _, count in merged.bins()), 5)
+        self.assertEqual(histogram_from_dict(merged.as_dict()).bins(), merged.bins())
+
+
+class TestHistogramSpec(unittest.TestCase):
+    def test_sampled_bounds_are_per_column(self) -> None:
+        spec = HistogramSpec(bins=2).sampled({"a": [1.0, 3.0], "b": [5.0, 5.0], "c": []})
+
+        self.assertFalse(spec.needs_sample)
+        self.assertEqual(spec.create("a").bins(), [(1.0, 2.0, 0), (2.0, 3.0, 0)])
+        self.assertEqual((spec.create("b").lower, spec.create("b").upper), (5.0, 6.0))
+        self.assertEqual((spec.create("c").lower, spec.create("c").upper), (0.0, 1.0))
+
+    def test_invalid_specs_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            HistogramSpec("cubic")
+        with self.assertRaises(ValueError):
+            HistogramSpec(bounds=(1.0, 1.0))
+        with self.assertRaises(ValueError):
+            parse_bounds("3")
+        for text in ("-inf:5", "0:inf", "nan:1"):
+            with self.assertRaises(ValueError):
+                parse_bounds(text)
+        self.assertEqual(parse_bounds("-1:2.5"), (-1.0, 2.5))
+
+
+class TestSummariesWithHistograms(unittest.TestCase):
+    def test_exact_streaming_and_columnar_summaries_agree(self) -> None:
+        rows = small_employee_dataset()
+        spec = HistogramSpec(bins=3, bounds=(60000.0, 90000.0))
+
+        exact = compute_numeric_summary(rows, "salary", histogram=spec)
+        streamed = compute_numeric_summary(iter(rows), "salary", streaming=True, histogram=spec)
+        columnar = summarise_dataset(ColumnarTable.from_rows(rows), histogram=spec)["salary"]
+
+        self.assertEqual(exact.histogram.counts, [1, 4, 0])
+        self.assertEqual(streamed.histogram.counts, exact.histogram.counts)
+        self.assertEqual(columnar.histogram.counts, exact.histogram.counts)
+
+    def test_summary_serialisation_keeps_the_histogram(self) -> None:
+        summary = compute_numeric_summary(small_employee_dataset(), "tenure_years", histogram=HistogramSpec("log"))
+
+        restored = NumericSummary.from_dict(summary.as_dict())
+        self.assertEqual(restored.histogram.bins(), summary.histogram.bins())
+
+    def test_workers_merge_histograms_with_shared_bounds(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "values.csv"
+            path.write_text("value\n" + "".join(f"{index % 97}\n" for index in range(5000)), encoding="utf-8")
+            spec = HistogramSpec(bins=4)
+
+            parallel = summarise_csv_parallel(path, "value", workers=3, histogram=spec)["value"]
+            streamed = summarise_dataset(iter_csv(path), streaming=True, histogram=spec)["value"]
+
+        self.assertEqual(parallel.histogram.as_dict(), streamed.histogram.as_dict())
+        self.assertEqual(sum(parallel.histogram.counts), 5000)
+
+    def test_constant_columns_beyond_float_integer_precision(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "values.csv"
+            path.write_text("value\n" + "1e17\n" * 20, encoding="utf-8")
+            for extra in ([], ["--streaming"]):
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    main(["--csv", str(path), "--histogram", "linear", "--bins", "2", "--no-cache", *extra])
+                histogram = json.loads(output.getvalue())["value"]["histogram"]
+                self.assertEqual(histogram["bins"][0]["lower"], 1e17)
+                self.assertEqual([entry["count"] for entry in histogram["bins"]], [20, 0])
+
+    def test_cli_histogram_section(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--column", "salary", "--histogram", "linear", "--bins", "2", "--histogram-range", "60000:80000"])
+
+        histogram = json.loads(output.getvalue())["salary"]["histogram"]
+        self.assertEqual([entry["count"] for entry in histogram["bins"]], [1, 4])
+
+    def test_cli_accepts_negative_range_as_separate_argument(self) -> None:
+        for arguments in (["--histogram-range", "-5:5"], ["--histogram-range=-5:5"]):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(["--column", "salary", "--histogram", "linear", "--bins", "2", *arguments])
+            histogram = json.loads(output.getvalue())["salary"]["histogram"]
+            self.assertEqual([(entry["lower"], entry["upper"]) for entry in histogram["bins"]], [(-5.0, 0.0), (0.0, 5.0)])
+            self.assertEqual(histogram["overflow"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
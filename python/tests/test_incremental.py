@@ -0,0 +1,73 @@
+"""Unit tests for incremental summaries of append-only files."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from python import incremental
+from python.dataset_summary import load_csv, summarise_dataset
+from python.incremental import IncrementalState, default_state_path, summarise_incremental
+
+
+class TestIncrementalSummary(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / "log.csv"
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def append(self, text: str) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(text)
+
+    def test_appended_rows_are_merged(self) -> None:
+        self.append("name,value\na,1\nb,2\n")
+        summarise_incremental(self.path)
+        state = IncrementalState.load(default_state_path(self.path))
+        self.assertEqual(state.offset, self.path.stat().st_size)
+
+        self.append('"c\nd",3\ne,x\nf,4')
+        with mock.patch.object(incremental, "_complete_records", wraps=incremental._complete_records) as spy:
+            result = summarise_incremental(self.path)
+        self.assertEqual(spy.call_args.args[1], state.offset)
+
+        expected = summarise_dataset(load_csv(self.path))
+        self.assertEqual(result["value"], expected["value"])
+        # The final row has no newline yet, so it is not committed.
+        committed = IncrementalState.load(default_state_path(self.path))
+        self.assertEqual(committed.accumulators["value"].count, 3)
+
+        with self.assertRaises(ValueError):
+            summarise_incremental(self.path, "value")
+
+    def test_rewritten_prefix_triggers_full_rescan(self) -> None:
+        self.append("name,value\na,1\nb,2\n")
+        summarise_incremental(self.path)
+        self.path.write_text("name,value\na,10\nb,20\nc,30\n", encoding="utf-8")
+
+        result = summarise_incremental(self.path, "value")
+        self.assertEqual(result["value"].count, 3)
+        self.assertEqual(result["value"].median, 20)
+
+    def test_tail_cut_inside_a_character_and_unique_temporary_files(self) -> None:
+        self.append("name,value\na,1\n")
+        with self.path.open("ab") as handle:
+            handle.write("é,2".encode("utf-8") + "ü".encode("utf-8")[:1])
+
+        with mock.patch("os.replace", wraps=incremental.os.replace) as replace:
+            summarise_incremental(self.path)
+            summarise_incremental(self.path)
+        result = summarise_incremental(self.path, "value")
+        self.assertEqual(result["value"].count, 2)
+
+        temporaries = {Path(call.args[0]).name for call in replace.call_args_list}
+        self.assertEqual(len(temporaries), 2)
+        self.assertEqual(sorted(entry.name for entry in self.path.parent.iterdir()), ["log.csv", default_state_path(self.path).name])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Unit tests for the memory-mapped CSV scanner."""
+
+from __future__ import annotations
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.dataset_summary import compute_numeric_summary, load_csv, summarise_dataset
+from python.mmap_scanner import scan_numeric_columns, summarise_csv_mmap
+
+
+class TestMmapScanner(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / "data.csv"
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def assertMatchesCsvModule(self) -> None:
+        expected = summarise_dataset(load_csv(self.path))
+        actual = summarise_csv_mmap(self.path)
+        self.assertEqual(set(actual), set(expected))
+        for column, summary in expected.items():
+            self.assertEqual(actual[column].count, summary.count)
+            self.assertTrue(math.isclose(actual[column].mean, summary.mean))
+            self.assertEqual(actual[column].median, summary.median)
+
+    def test_fast_path_matches_csv_module(self) -> None:
+        self.path.write_bytes(b"name,salary,tenure\r\nA,10,1\r\nB,,2\r\n\r\nC,30\r\nD,x,4")
+        self.assertMatchesCsvModule()
+
+    def test_quoted_and_bom_files_fall_back(self) -> None:
+        self.path.write_bytes('﻿name,salary\n"Smith, J",10\nB,20\n'.encode("utf-8"))
+        self.assertMatchesCsvModule()
+
+    def test_only_quoted_records_are_parsed_as_csv(self) -> None:
+        lines = ["name,salary,code"]
+        for index in range(1500):
+            name = f'"Smith, {index}\nJr."' if index % 100 == 7 else f"n{index}"
+            code = str(index) if index > 1200 else f"c{index}"  # text in the sampled rows, numbers later
+            salary = index * 2.5 if index % 2 else ""  # few enough values for exact medians
+            lines.append(f"{name},{salary},{code}")
+        self.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        self.assertMatchesCsvModule()
+        self.assertEqual(summarise_csv_mmap(self.path)["code"].count, 299)
+
+    def test_unquoted_quote_marks_and_byte_order_marks(self) -> None:
+        self.path.write_bytes(b'\xef\xbb\xbfa,size,b\n1,12" long,2\n3,"x\ny",4\n5,6",8\n')
+        self.assertMatchesCsvModule()
+        self.assertEqual(summarise_csv_mmap(self.path, "a")["a"].count, 3)
+        self.assertEqual(summarise_csv_mmap(self.path, "b")["b"].mean, 14 / 3)
+
+    def test_projection_and_strict_mode(self) -> None:
+        self.path.write_bytes(b"name,salary,tenure\nA,10,1\nB,20,x\n")
+
+        self.assertEqual(list(scan_numeric_columns(self.path, ["salary"])), ["salary"])
+        summary = summarise_csv_mmap(self.path, "salary")["salary"]
+        self.assertEqual(summary, compute_numeric_summary(load_csv(self.path), "salary", streaming=True))
+        with self.assertRaises(ValueError):
+            summarise_csv_mmap(self.path, "tenure")
+        with self.assertRaises(ValueError):
+            summarise_csv_mmap(self.path, "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
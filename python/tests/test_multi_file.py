@@ -0,0 +1,104 @@
+"""Unit tests for concurrent multi-file summaries."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import math
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from python import multi_file
+from python.cli import main
+from python.dataset_summary import load_csv, summarise_dataset
+from python.multi_file import expand_paths, is_pattern, summarise_files
+
+
+def _exit_worker(path: str, column):
+    os._exit(1)
+
+
+class TestSummariseFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory.name)
+        for day, offset in (("2026-10-01", 0), ("2026-10-02", 100)):
+            (self.root / day).mkdir()
+            lines = ["name,value"] + [f"n{index},{offset + index}" for index in range(100)]
+            (self.root / day / "part-0.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_expand_paths_sorts_matches_and_keeps_missing_paths(self) -> None:
+        missing = str(self.root / "missing.csv")
+        paths = expand_paths([str(self.root / "2026-10-*" / "part-*.csv"), missing])
+
+        self.assertEqual([path.parent.name for path in paths[:2]], ["2026-10-01", "2026-10-02"])
+        self.assertEqual(str(paths[2]), missing)
+
+    def test_existing_paths_with_wildcard_characters_are_literal(self) -> None:
+        literal = self.root / "data[2024].csv"
+        literal.write_text("value\n1\n", encoding="utf-8")
+
+        self.assertFalse(is_pattern(str(literal)))
+        self.assertEqual(expand_paths([str(literal)]), [literal])
+        self.assertTrue(is_pattern(str(self.root / "data[0-9].csv")))
+
+    def test_combined_matches_concatenated_rows(self) -> None:
+        paths = expand_paths([str(self.root / "*" / "*.csv")])
+        result = summarise_files(paths, workers=2)
+
+        rows = [row for path in paths for row in load_csv(path)]
+        expected = summarise_dataset(rows)["value"]
+        combined = result.combined["value"]
+        self.assertEqual(combined.count, 200)
+        self.assertEqual(combined.median, expected.median)
+        self.assertTrue(math.isclose(combined.stdev, expected.stdev))
+        self.assertEqual(result.files[1].summaries["value"].minimum, 100)
+
+    def test_bad_file_becomes_error_entry(self) -> None:
+        bad = self.root / "bad.csv"
+        bad.write_text("name,value\nx,oops\n", encoding="utf-8")
+        paths = expand_paths([str(self.root / "2026-10-01" / "part-0.csv"), str(bad), str(self.root / "gone.csv")])
+
+        result = summarise_files(paths, column="value")
+
+        self.assertIsNone(result.files[0].error)
+        self.assertIn("oops", result.files[1].error)
+        self.assertIn("not found", result.files[2].error)
+        self.assertEqual(result.combined["value"].count, 100)
+
+    def test_truncated_archives_and_dead_workers_become_error_entries(self) -> None:
+        truncated = self.root / "truncated.csv.gz"
+        data = gzip.compress(("value\n" + "".join(f"{index}\n" for index in range(5000))).encode("utf-8"))
+        truncated.write_bytes(data[: len(data) // 2])
+        good = self.root / "2026-10-01" / "part-0.csv"
+
+        result = summarise_files([good, truncated], column="value", workers=2)
+        self.assertIsNone(result.files[0].error)
+        self.assertIn("end-of-stream", result.files[1].error)
+        self.assertEqual(result.combined["value"].count, 100)
+
+        with mock.patch.object(multi_file, "_accumulate_file", _exit_worker):
+            result = summarise_files([good, truncated], column="value", workers=2)
+        self.assertTrue(all(entry.error for entry in result.files))
+        self.assertEqual(result.combined, {})
+
+    def test_cli_reports_files_and_combined(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--csv", str(self.root / "*" / "*.csv"), "--column", "value", "--workers", "2"])
+        report = json.loads(output.getvalue())
+
+        self.assertEqual(len(report["files"]), 2)
+        self.assertEqual(report["combined"]["value"]["count"], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Unit tests for the optional NumPy backend."""
+
+from __future__ import annotations
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from python import numpy_backend
+from python.columnar import ColumnarTable, load_columnar
+from python.dataset_summary import compute_numeric_summary, summarise_dataset
+from python.demo_data import small_employee_dataset
+
+
+def assert_summaries_close(case: unittest.TestCase, actual, expected) -> None:
+    case.assertEqual(set(actual), set(expected))
+    for column, summary in expected.items():
+        case.assertEqual(actual[column].count, summary.count)
+        case.assertTrue(math.isclose(actual[column].mean, summary.mean))
+        case.assertTrue(math.isclose(actual[column].stdev, summary.stdev))
+        case.assertEqual(actual[column].median, summary.median)
+
+
+@unittest.skipUnless(numpy_backend.is_available(), "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    def test_dict_rows_match_pure_backend(self) -> None:
+        rows = small_employee_dataset() + [{"employee": "Finn", "salary": "", "tenure_years": "n/a"}]
+        expected = summarise_dataset(rows)
+
+        assert_summaries_close(self, summarise_dataset(rows, backend="numpy"), expected)
+        with self.assertRaises(ValueError):
+            compute_numeric_summary(rows, "tenure_years", backend="numpy")
+        with self.assertRaises(ValueError):
+            compute_numeric_summary(rows, "department", backend="numpy")
+
+    def test_text_columns_are_screened_before_conversion(self) -> None:
+        rows = [{"name": f"n{index}", "code": f"c{index}" if index < 1500 else str(index)} for index in range(2000)]
+        expected = summarise_dataset(rows)
+
+        assert_summaries_close(self, summarise_dataset(iter(rows), backend="numpy"), expected)
+        self.assertEqual(set(numpy_backend.dataset_arrays(iter(rows))), {"code"})
+
+    def test_tables_match_pure_backend(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "data.csv"
+            path.write_text("a,b,c\n1,x,\n,2,5\n3,4,6\n\n8,y,7\n", encoding="utf-8")
+            expected = summarise_dataset(load_columnar(path))
+            table = numpy_backend.load_table(path, chunk_rows=2)
+
+        self.assertEqual(len(table), 4)
+        assert_summaries_close(self, summarise_dataset(table, backend="numpy"), expected)
+        summary = compute_numeric_summary(table, "a", backend="numpy")
+        self.assertEqual(summary.median, 3.0)
+
+    def test_tables_keep_the_cells_as_written(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "data.csv"
+            path.write_text(
+                "zip,price,code\n2134,1.5,7\n02134,3.50,007\n,0.1,7\n99,2.25,x\n", encoding="utf-8"
+            )
+            expected = list(load_columnar(path).rows())
+            table = numpy_backend.load_table(path, chunk_rows=2)
+
+        self.assertEqual(list(table.rows()), expected)
+        self.assertEqual(expected[1], {"zip": "02134", "price": "3.50", "code": "007"})
+        self.assertEqual(summarise_dataset(table, backend="numpy")["zip"].count, 3)
+
+
+class TestBackendSelection(unittest.TestCase):
+    def test_unknown_backend_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            summarise_dataset(small_employee_dataset(), backend="fortran")
+
+    def test_even_length_median(self) -> None:
+        table = ColumnarTable.from_rows(small_employee_dataset()[:4])
+        summary = compute_numeric_summary(table, "salary", backend="numpy")
+        self.assertEqual(summary.median, 73500)
+
+
+if __name__ == "__main__":
+    unittest.main()
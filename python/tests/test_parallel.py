@@ -0,0 +1,83 @@
+"""Unit tests for the multi-process CSV summaries."""
+
+from __future__ import annotations
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.dataset_summary import load_csv, summarise_dataset
+from python.parallel import _chunk_rows, find_record_boundaries, plan_chunks, summarise_csv_parallel
+from python.streaming import NumericAccumulator
+
+
+class TestChunkPlanning(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / "data.csv"
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_boundaries_skip_quoted_newlines(self) -> None:
+        self.path.write_bytes(b'name,value\n"a\nb",1\nc,2\n')
+
+        self.assertEqual(find_record_boundaries(self.path, [0, 12]), [11, 19])
+
+    def test_parallel_matches_sequential(self) -> None:
+        lines = ["note,value,other"]
+        for index in range(500):
+            lines.append(f'"line {index}\nwith, comma",{index * 1.5},{index % 7}')
+        self.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        header, ranges = plan_chunks(self.path, 1000)
+        self.assertEqual(header, ["note", "value", "other"])
+        self.assertGreater(len(ranges), 10)
+
+        expected = summarise_dataset(load_csv(self.path))
+        actual = summarise_csv_parallel(self.path, workers=4, chunk_bytes=1000)
+        self.assertEqual(set(actual), {"value", "other"})
+        for column, summary in expected.items():
+            self.assertEqual(actual[column].count, summary.count)
+            self.assertTrue(math.isclose(actual[column].mean, summary.mean))
+            self.assertTrue(math.isclose(actual[column].stdev, summary.stdev))
+            self.assertEqual(actual[column].median, summary.median)
+
+        with self.assertRaises(ValueError):
+            summarise_csv_parallel(self.path, column="note", workers=2)
+
+    def test_every_record_is_read_once_whatever_the_chunk_size(self) -> None:
+        notes = ['plain', '"quoted, comma"', '"two\nlines"', '""', '"say ""hi""\nthen"', '""""', '","', '"a,\n"']
+        lines = ["note,value"] + [f"{notes[index % len(notes)]},{index}" for index in range(300)]
+        self.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        expected = load_csv(self.path)
+
+        for chunk_bytes in (1, 7, 64, 333, 10_000):
+            header, ranges = plan_chunks(self.path, chunk_bytes)
+            rows = [
+                dict(row)
+                for index, (start, end) in enumerate(ranges)
+                for row in _chunk_rows(str(self.path), header, start, end, index == 0)
+            ]
+            self.assertEqual(rows, expected, chunk_bytes)
+
+
+class TestAccumulatorMerge(unittest.TestCase):
+    def test_merge_matches_single_pass(self) -> None:
+        values = [float(value) for value in range(-50, 150, 3)]
+        whole, left, right = NumericAccumulator(), NumericAccumulator(), NumericAccumulator()
+        for index, value in enumerate(values):
+            whole.add(value)
+            (left if index % 3 else right).add(value)
+
+        left.merge(right)
+        self.assertEqual(left.count, whole.count)
+        self.assertTrue(math.isclose(left.mean, whole.mean))
+        self.assertTrue(math.isclose(left.m2, whole.m2))
+        self.assertEqual(left.median, whole.median)
+        self.assertEqual((left.minimum, left.maximum), (whole.minimum, whole.maximum))
+
+
+if __name__ == "__main__":
+    unittest.main()
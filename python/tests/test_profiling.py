@@ -0,0 +1,71 @@
+"""Unit tests for per-stage profiling."""
+
+from __future__ import annotations
+
+import io
+import json
+import pstats
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from python import profiling
+from python.cli import main
+from python.dataset_summary import iter_csv, load_csv, profile, summarise_dataset
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory.name)
+        self.path = self.root / "data.csv"
+        lines = ["name,value,other"] + [f"n{index},{index},{index * 2}" for index in range(300)]
+        self.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_stages_record_rows_and_bytes(self) -> None:
+        with profile() as profiler:
+            summarise_dataset(load_csv(self.path))
+        report = profiler.report()
+
+        self.assertEqual(report["stages"]["parse"]["rows"], 300)
+        self.assertEqual(report["stages"]["parse"]["bytes"], self.path.stat().st_size)
+        self.assertEqual(report["stages"]["convert"]["rows"], 600)
+        stage_wall = sum(stage["wall_seconds"] for stage in report["stages"].values())
+        self.assertLessEqual(stage_wall, report["wall_seconds"] + 1e-6)
+        self.assertGreater(report["peak_rss_bytes"], 0)
+
+    def test_streaming_stages_are_exclusive(self) -> None:
+        with profile() as profiler:
+            summarise_dataset(iter_csv(self.path), streaming=True)
+
+        self.assertEqual(set(profiler.stages), {"open", "parse", "convert", "aggregate"})
+        self.assertIn("parse", profiler.format())
+
+    def test_inactive_hooks_are_transparent(self) -> None:
+        items = [1, 2, 3]
+        self.assertIs(profiling.track("parse", items), items)
+        with profiling.stage("parse"):
+            pass
+        self.assertIsNone(profiling.active())
+
+    def test_cli_writes_profile_json_and_pstats(self) -> None:
+        report_path = self.root / "profile.json"
+        dump_path = self.root / "summary.pstats"
+        stderr = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+            main([
+                "--csv", str(self.path), "--no-cache", "--profile",
+                "--profile-output", str(report_path), "--profile-dump", str(dump_path),
+            ])
+
+        self.assertIn("serialise", json.loads(report_path.read_text(encoding="utf-8"))["stages"])
+        self.assertIn("peak RSS", stderr.getvalue())
+        self.assertGreater(pstats.Stats(str(dump_path)).total_calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
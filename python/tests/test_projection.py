@@ -0,0 +1,65 @@
+"""Unit tests for reading a subset of CSV columns."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from python.columnar import load_columnar
+from python.dataset_summary import compute_numeric_summary, load_csv, summarise_csv_column
+from python.projection import iter_projected
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / "data.csv"
+        self.path.write_text(
+            'id,note,value,extra\r\n'
+            '1,plain,10,x\r\n'
+            '\r\n'
+            '2,"quoted, with comma",20,y\r\n'
+            '3,"spans\r\ntwo lines",30,z\r\n'
+            '4,short\r\n'
+            '5,"say ""hi""",,w\r\n',
+            encoding="utf-8",
+        )
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_matches_dict_reader(self) -> None:
+        expected = [(row["note"], row["value"] or "") for row in load_csv(self.path)]
+
+        self.assertEqual(list(iter_projected(self.path, ["note", "value"])), expected)
+
+    def test_unquoted_quote_marks_are_kept(self) -> None:
+        self.path.write_text('id,size,value\n1,12" long,10\n2,"a ""b""",20\n3,6",30\n', encoding="utf-8")
+        expected = [(row["size"], row["value"]) for row in load_csv(self.path)]
+
+        self.assertEqual(expected[0], ('12" long', "10"))
+        self.assertEqual(list(iter_projected(self.path, ["size", "value"])), expected)
+        self.assertEqual(list(iter_projected(self.path, ["id"])), [("1",), ("2",), ("3",)])
+
+    def test_unknown_column_lists_header(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Available columns: extra, id, note, value"):
+            list(iter_projected(self.path, ["missing"]))
+
+    def test_column_summary_matches_full_load(self) -> None:
+        expected = compute_numeric_summary(load_csv(self.path), "value")
+
+        self.assertEqual(summarise_csv_column(self.path, "value"), expected)
+        self.assertEqual(summarise_csv_column(self.path, "value", streaming=True).median, expected.median)
+        with self.assertRaisesRegex(ValueError, "Non-numeric value 'plain'"):
+            summarise_csv_column(self.path, "note")
+
+    def test_columnar_projection_keeps_only_requested_columns(self) -> None:
+        table = load_columnar(self.path, ["value"])
+
+        self.assertEqual(table.column_names, ["value"])
+        self.assertEqual(len(table), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
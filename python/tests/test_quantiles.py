@@ -0,0 +1,63 @@
+"""Unit tests for exact quantiles and configurable percentiles."""
+
+from __future__ import annotations
+
+import random
+import statistics
+import unittest
+
+from python.dataset_summary import NumericSummary, compute_numeric_summary, summarise_dataset
+from python.demo_data import small_employee_dataset
+from python.quantiles import parse_percentiles, select_quantiles
+
+
+def reference_quantile(values, q):
+    ordered = sorted(values)
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class TestSelectQuantiles(unittest.TestCase):
+    def test_matches_sorting_reference(self) -> None:
+        generator = random.Random(3)
+        for size in (1, 2, 7, 100, 5000):
+            values = [generator.choice([generator.random(), 1.0, -2.0]) for _ in range(size)]
+            quantiles = [0.0, 0.5, 0.9, 0.99, 1.0]
+            expected = [reference_quantile(values, q) for q in quantiles]
+            buffer = list(values)
+
+            actual = select_quantiles(buffer, quantiles)
+            for got, want in zip(actual, expected):
+                self.assertAlmostEqual(got, want)
+            self.assertEqual(sorted(buffer), sorted(values))
+            self.assertEqual(actual[1], statistics.median(values))
+
+    def test_parse_percentiles(self) -> None:
+        self.assertEqual(parse_percentiles("50, 90,99.9"), [50.0, 90.0, 99.9])
+        with self.assertRaises(ValueError):
+            parse_percentiles("50,101")
+
+
+class TestSummaryPercentiles(unittest.TestCase):
+    def test_percentiles_min_and_max_are_reported(self) -> None:
+        summary = compute_numeric_summary(small_employee_dataset(), "salary", percentiles=[50, 90])
+
+        self.assertEqual((summary.minimum, summary.maximum), (68000, 77000))
+        self.assertEqual(summary.percentiles, {50: 72000, 90: 76200})
+        data = summary.as_dict()
+        self.assertEqual((data["min"], data["max"], data["p90"]), (68000, 77000, 76200))
+        self.assertEqual(NumericSummary.from_dict(data), summary)
+
+    def test_streaming_percentiles_match_exact_for_small_inputs(self) -> None:
+        rows = small_employee_dataset()
+        exact = summarise_dataset(rows, percentiles=[25, 75])
+        streamed = summarise_dataset(iter(rows), streaming=True, percentiles=[25, 75])
+
+        self.assertEqual(streamed["salary"].percentiles, exact["salary"].percentiles)
+        self.assertEqual(streamed["tenure_years"].maximum, exact["tenure_years"].maximum)
+
+
+if __name__ == "__main__":
+    unittest.main()
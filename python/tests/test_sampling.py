@@ -0,0 +1,159 @@
+"""Unit tests for sampled, approximate summaries."""
+
+from __future__ import annotations
+
+import io
+import json
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.columnar import ColumnarTable
+from python.dataset_summary import NumericSummary, load_csv, summarise_dataset, summarise_sample
+from python.demo_data import small_employee_dataset
+from python.sampling import confidence_intervals, reservoir_sample, sample_csv, sample_rows
+
+
+def _rows(count: int, seed: int = 4):
+    generator = random.Random(seed)
+    return [
+        {"value": str(generator.gauss(100, 15)), "sparse": str(generator.random()) if generator.random() < 0.3 else ""}
+        for _ in range(count)
+    ]
+
+
+class TestSampling(unittest.TestCase):
+    def test_reservoir_is_uniform_and_counts_everything(self) -> None:
+        generator = random.Random(1)
+        hits = [0] * 20
+        for _ in range(2000):
+            sample, seen = reservoir_sample(range(20), 5, generator)
+            self.assertEqual((len(sample), seen), (5, 20))
+            for item in sample:
+                hits[item] += 1
+        self.assertTrue(all(400 < count < 600 for count in hits))
+
+        self.assertEqual(reservoir_sample(range(3), 5, generator), ([0, 1, 2], 3))
+
+    def test_sample_rows_of_sequences_tables_and_iterators(self) -> None:
+        rows = _rows(1000)
+        sample, population = sample_rows(rows, 0.1, seed=3)
+        self.assertEqual((len(sample), population), (100, 1000))
+        self.assertEqual(sample, sample_rows(rows, 0.1, seed=3)[0])
+
+        table, population = sample_rows(ColumnarTable.from_rows(rows), 0.05, seed=3)
+        self.assertEqual((len(table), population), (50, 1000))
+
+        streamed, population = sample_rows(iter(rows), 0.2, seed=3)
+        self.assertEqual(population, 1000)
+        self.assertTrue(150 < len(streamed) < 250)
+
+        with self.assertRaises(ValueError):
+            sample_rows(rows, 0)
+
+    def test_interval_bounds(self) -> None:
+        intervals = confidence_intervals([float(value) for value in range(100, 0, -1)], 200, 10_000, [90])
+
+        self.assertEqual(intervals["min"], (None, 1.0))
+        self.assertEqual(intervals["max"], (100.0, None))
+        low, high = intervals["count"]
+        self.assertTrue(low < 5000 < high)
+        self.assertTrue(intervals["median"][0] < 50.5 < intervals["median"][1])
+        self.assertTrue(intervals["p90"][0] < 90.1 < intervals["p90"][1])
+
+
+class TestApproximateSummaries(unittest.TestCase):
+    def test_intervals_cover_the_exact_statistics(self) -> None:
+        rows = _rows(40_000)
+        exact = summarise_dataset(rows, percentiles=[90])
+        approximate = summarise_dataset(rows, percentiles=[90], sample_fraction=0.05, seed=0)
+
+        for column in ("value", "sparse"):
+            summary = approximate[column]
+            self.assertEqual(summary.approximation.sampled_rows, 2000)
+            self.assertEqual(summary.approximation.population_rows, 40_000)
+            data, truth = summary.as_dict(), exact[column].as_dict()
+            self.assertTrue(data["approximate"])
+            for name in ("count", "mean", "median", "stdev", "p90"):
+                low, high = data["sample"]["intervals"][name]
+                self.assertTrue(low <= truth[name] <= high, (column, name, low, truth[name], high))
+            self.assertEqual(NumericSummary.from_dict(json.loads(json.dumps(data))).as_dict(), data)
+
+    def test_a_complete_sample_is_exact(self) -> None:
+        rows = small_employee_dataset()
+        summary = summarise_dataset(rows, sample_fraction=1.0)["salary"]
+
+        self.assertIsNone(summary.approximation)
+        self.assertEqual(summary.as_dict(), summarise_dataset(rows)["salary"].as_dict())
+
+    def test_filter_applies_to_the_sample(self) -> None:
+        rows = [{"group": "a" if index % 4 else "b", "value": str(index)} for index in range(8000)]
+        summary = summarise_dataset(rows, sample_fraction=0.25, seed=2, filter="group == 'b'")["value"]
+        low, high = summary.approximation.intervals["count"]
+
+        self.assertTrue(low <= 2000 <= high)
+
+
+class TestCsvSampling(unittest.TestCase):
+    def test_block_sample_reads_part_of_a_large_file(self) -> None:
+        generator = random.Random(6)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "values.csv"
+            lines = [f"{generator.randint(0, 999)},{'x' * generator.randint(1, 20)}\n" for _ in range(60_000)]
+            path.write_text("value,label\n" + "".join(lines), encoding="utf-8")
+            sample = sample_csv(path, 800, seed=1)
+
+        self.assertFalse(sample.exhaustive)
+        self.assertTrue(780 <= len(sample.rows) <= 800)
+        self.assertEqual(set(sample.rows[0]), {"value", "label"})
+        self.assertTrue(abs(sample.population - 60_000) < 4 * sample.population_error + 1)
+
+    def test_block_sample_intervals_cover_a_sorted_column(self) -> None:
+        generator = random.Random(8)
+        values = sorted(generator.gauss(100, 15) for _ in range(30_000))
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "sorted.csv"
+            path.write_text("value\n" + "".join(f"{value:.4f}\n" for value in values), encoding="utf-8")
+            exact = summarise_dataset(load_csv(path))["value"].as_dict()
+            covered = {name: 0 for name in ("mean", "median", "stdev")}
+            for seed in range(100):
+                sample = sample_csv(path, 400, seed=seed)
+                self.assertEqual(sum(sample.block_rows), len(sample.rows))
+                intervals = summarise_sample(
+                    sample.rows, sample.population, block_rows=sample.block_rows
+                )["value"].approximation.intervals
+                for name in covered:
+                    low, high = intervals[name]
+                    covered[name] += low <= exact[name] <= high
+
+        # Nominally 95%; treating the rows of a block as independent covers under half.
+        self.assertTrue(all(hits >= 85 for hits in covered.values()), covered)
+
+    def test_small_and_quoted_files_are_read_in_full(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            small = Path(directory) / "small.csv"
+            small.write_text("value\n1\n2\n3\n", encoding="utf-8")
+            self.assertEqual(sample_csv(small, 10), sample_csv(small, 10, seed=5))
+            self.assertTrue(sample_csv(small, 10).exhaustive)
+
+            quoted = Path(directory) / "quoted.csv"
+            quoted.write_text("value,note\n" + '1,"two\nlines"\n' * 20_000, encoding="utf-8")
+            sample = sample_csv(quoted, 100, seed=5)
+            self.assertEqual(sample.population, 20_000)
+            self.assertEqual(sample.rows[0]["note"], "two\nlines")
+
+    def test_cli_reports_an_approximate_summary(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--sample", "3", "--seed", "1", "--column", "salary"])
+
+        summary = json.loads(output.getvalue())["salary"]
+        self.assertTrue(summary["approximate"])
+        self.assertEqual((summary["sample"]["sampled_rows"], summary["sample"]["population_rows"]), (3, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Unit tests for sample-based schema inference."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from python.dataset_summary import summarise_dataset
+from python.demo_data import small_employee_dataset
+from python.schema import MIXED, NUMERIC, TEXT, Schema, infer_schema, looks_numeric
+
+
+class TestSchemaInference(unittest.TestCase):
+    def test_infers_demo_dataset_types(self) -> None:
+        schema = infer_schema(small_employee_dataset())
+
+        self.assertEqual(
+            schema.to_dict(),
+            {"employee": TEXT, "department": TEXT, "salary": NUMERIC, "tenure_years": NUMERIC},
+        )
+        self.assertEqual(Schema.from_dict(schema.to_dict()), schema)
+
+    def test_looks_numeric_accepts_everything_float_does(self) -> None:
+        for value in ("12", " -3.5", ".5", "+1e3", "NaN", "-inf", "Infinity", "1_000"):
+            self.assertTrue(looks_numeric(value), value)
+        for value in ("Alicia", "Data", "n/a"):
+            self.assertFalse(looks_numeric(value), value)
+
+    def test_text_columns_skip_float_conversion(self) -> None:
+        rows = small_employee_dataset() * 200
+        with mock.patch("python.dataset_summary.looks_numeric", wraps=looks_numeric) as screen:
+            summaries = summarise_dataset(iter(rows))
+
+        self.assertEqual(set(summaries), {"salary", "tenure_years"})
+        # Only the two text columns are screened, never the numeric ones.
+        self.assertEqual(screen.call_count, 2 * len(rows))
+
+    def test_values_outside_the_sample_are_rechecked(self) -> None:
+        rows = [{"code": "A", "value": "1"} for _ in range(20)]
+        rows.append({"code": "7", "value": "oops"})
+        schema = infer_schema(rows, sample_size=5, reservoir_size=0)
+
+        summaries = summarise_dataset(rows, schema=schema)
+        self.assertEqual(summaries["code"].count, 1)
+        self.assertEqual(summaries["value"].count, 20)
+        self.assertEqual(schema.columns, {"code": MIXED, "value": MIXED})
+
+
+if __name__ == "__main__":
+    unittest.main()
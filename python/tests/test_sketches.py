@@ -0,0 +1,152 @@
+"""Unit tests for the distinct-count and frequent-value sketches."""
+
+from __future__ import annotations
+
+import io
+import json
+import random
+import tempfile
+import unittest
+from collections import Counter
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from python.cli import main
+from python.columnar import ColumnarTable
+from python.dataset_summary import summarise_categorical
+from python.demo_data import small_employee_dataset
+from python.sketches import CategoricalAccumulator, DistinctCounter, FrequentItems
+
+
+class TestDistinctCounter(unittest.TestCase):
+    def test_small_inputs_are_exact(self) -> None:
+        counter = DistinctCounter()
+        for value in ("a", "b", "a", "c", "b"):
+            counter.add(value)
+
+        self.assertTrue(counter.is_exact)
+        self.assertEqual(counter.estimate(), 3)
+
+    def test_large_inputs_respect_standard_error(self) -> None:
+        counter = DistinctCounter(precision=12, exact_limit=100)
+        for index in range(50000):
+            counter.add(f"id-{index}")
+            counter.add(f"id-{index // 2}")
+
+        self.assertFalse(counter.is_exact)
+        # Four standard errors of 1.04 / sqrt(4096).
+        self.assertAlmostEqual(counter.estimate() / 50000, 1.0, delta=0.065)
+
+    def test_merge_counts_the_union(self) -> None:
+        left, right, both = DistinctCounter(exact_limit=100), DistinctCounter(exact_limit=100), DistinctCounter(exact_limit=100)
+        for index in range(20000):
+            left.add(str(index))
+            both.add(str(index))
+        for index in range(10000, 30000):
+            right.add(str(index))
+            both.add(str(index))
+
+        self.assertEqual(left.merge(right).estimate(), both.estimate())
+
+    def test_merge_of_exact_counters_stays_exact(self) -> None:
+        left, right = DistinctCounter(), DistinctCounter()
+        left.add("a")
+        right.add("a")
+        right.add("b")
+
+        merged = left.merge(right)
+        self.assertTrue(merged.is_exact)
+        self.assertEqual(merged.estimate(), 2)
+
+
+class TestFrequentItems(unittest.TestCase):
+    def test_counts_are_exact_below_capacity(self) -> None:
+        items = FrequentItems(capacity=4)
+        for value in "abracadabra":
+            items.add(value)
+
+        self.assertTrue(items.is_exact)
+        self.assertEqual(items.most_common(2), [("a", 5), ("b", 2)])
+
+    def test_heavy_hitters_survive_with_bounded_error(self) -> None:
+        generator = random.Random(3)
+        values = [str(int(generator.paretovariate(1.5))) if generator.random() < 0.5 else f"u{index}" for index in range(20000)]
+        items = FrequentItems(capacity=16)
+        for value in values:
+            items.add(value)
+
+        exact = Counter(values)
+        self.assertLessEqual(items.error, len(values) / 17)
+        self.assertEqual(items.most_common(1)[0][0], "1")
+        for value, count in items.counts.items():
+            self.assertLessEqual(count, exact[value])
+            self.assertGreaterEqual(count, exact[value] - items.error)
+
+    def test_merge_matches_a_single_pass_bound(self) -> None:
+        values = [str(index % 7) for index in range(700)] + [f"x{index}" for index in range(300)]
+        left, right = FrequentItems(capacity=8), FrequentItems(capacity=8)
+        for index, value in enumerate(values):
+            (left if index % 2 else right).add(value)
+
+        merged = left.merge(right)
+        self.assertEqual(merged.total, len(values))
+        self.assertLessEqual(merged.error, len(values) / 9)
+        self.assertEqual({value for value, _ in merged.most_common(7)}, {str(index) for index in range(7)})
+
+
+class TestSummariseCategorical(unittest.TestCase):
+    def test_text_columns_are_summarised(self) -> None:
+        summaries = summarise_categorical(small_employee_dataset(), top=1)
+
+        self.assertEqual(set(summaries), {"employee", "department"})
+        department = summaries["department"]
+        self.assertEqual((department.count, department.distinct), (5, 3))
+        self.assertEqual(department.top, [("Data", 2)])
+        self.assertTrue(department.exact)
+
+    def test_columnar_tables_match_rows(self) -> None:
+        rows = small_employee_dataset()
+        table = ColumnarTable.from_rows(rows)
+
+        self.assertEqual(
+            summarise_categorical(table, ["department", "salary"]),
+            summarise_categorical(rows, ["department", "salary"]),
+        )
+
+    def test_filter_and_missing_columns(self) -> None:
+        summaries = summarise_categorical(small_employee_dataset(), filter="salary >= 75000")
+        self.assertEqual(summaries["department"].count, 2)
+
+        with self.assertRaises(ValueError):
+            summarise_categorical(small_employee_dataset(), ["unknown"])
+
+    def test_accumulators_merge_across_chunks(self) -> None:
+        rows = small_employee_dataset()
+        first, second = CategoricalAccumulator(), CategoricalAccumulator()
+        for row in rows[:2]:
+            first.add(row["department"])
+        for row in rows[2:]:
+            second.add(row["department"])
+
+        merged = first.merge(second)
+        self.assertEqual(merged.count, 5)
+        self.assertEqual(merged.distinct.estimate(), 3)
+
+    def test_cli_reports_text_columns_alongside_numeric_ones(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "people.csv"
+            path.write_text("name,team,score,code\nA,red,1,7\nB,blue,2,x\nC,red,,7\n", encoding="utf-8")
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(["--csv", str(path), "--categorical", "--no-cache", "--top", "1"])
+
+        result = json.loads(output.getvalue())
+        self.assertEqual(result["score"]["count"], 2)
+        self.assertEqual(result["team"], {"count": 3, "distinct": 2, "exact": True, "top": [{"value": "red", "count": 2}]})
+        # A mixed column keeps its numeric summary.
+        self.assertEqual(result["code"]["count"], 2)
+        self.assertEqual(result["code"]["categorical"]["top"], [{"value": "7", "count": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
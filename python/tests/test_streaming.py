@@ -0,0 +1,123 @@
+"""Unit tests for the single-pass streaming accumulators."""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+import unittest
+
+from python.dataset_summary import NumericSummary, compute_numeric_summary, summarise_dataset
+from python.demo_data import small_employee_dataset
+from python.streaming import NumericAccumulator, QuantileSketch
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_small_inputs_are_exact(self) -> None:
+        sketch = QuantileSketch()
+        for value in (5.0, 1.0, 4.0, 2.0):
+            sketch.add(value)
+
+        self.assertTrue(sketch.is_exact)
+        self.assertEqual(sketch.quantile(0.5), statistics.median([5.0, 1.0, 4.0, 2.0]))
+
+    def test_large_inputs_respect_relative_error(self) -> None:
+        generator = random.Random(7)
+        values = [generator.lognormvariate(10, 1) for _ in range(20000)]
+        values += [-value for value in values[:5000]] + [0.0] * 100
+        sketch = QuantileSketch(relative_accuracy=0.01, exact_limit=100)
+        for value in values:
+            sketch.add(value)
+
+        self.assertFalse(sketch.is_exact)
+        ordered = sorted(values)
+        for q in (0.1, 0.5, 0.9):
+            expected = ordered[round(q * (len(ordered) - 1))]
+            self.assertTrue(math.isclose(sketch.quantile(q), expected, rel_tol=0.03))
+
+    def test_infinities_and_nan_rank_beyond_finite_values(self) -> None:
+        values = [float(value) for value in range(1, 21)] + [math.inf, -math.inf, math.nan]
+        sketch = QuantileSketch(exact_limit=4, max_buckets=4)
+        for value in values:
+            sketch.add(value)
+
+        self.assertFalse(sketch.is_exact)
+        self.assertEqual(sketch.quantile(0), -math.inf)
+        self.assertEqual(sketch.quantile(21 / 22), math.inf)
+        self.assertTrue(math.isnan(sketch.quantile(1)))
+        self.assertTrue(math.isfinite(sketch.quantile(0.5)))
+        restored = QuantileSketch.from_bytes(sketch.to_bytes()).merge(sketch)
+        self.assertEqual((restored.count, restored.quantile(0)), (46, -math.inf))
+        self.assertTrue(math.isnan(restored.quantile(1)))
+
+
+class TestSerialisation(unittest.TestCase):
+    def test_round_trip_preserves_state(self) -> None:
+        for exact_limit in (1024, 10):
+            accumulator = NumericAccumulator(exact_limit=exact_limit)
+            for value in range(-20, 80):
+                accumulator.add(value * 1.25)
+
+            restored = NumericAccumulator.from_bytes(accumulator.to_bytes())
+            self.assertEqual(restored.count, accumulator.count)
+            self.assertEqual(restored.total, accumulator.total)
+            self.assertEqual(restored.m2, accumulator.m2)
+            self.assertEqual(restored.median, accumulator.median)
+            self.assertEqual(restored.sketch.is_exact, accumulator.sketch.is_exact)
+
+    def test_merging_restored_shards(self) -> None:
+        shards = []
+        whole = NumericAccumulator()
+        for shard in range(3):
+            accumulator = NumericAccumulator()
+            for value in range(shard * 10, shard * 10 + 10):
+                accumulator.add(float(value))
+                whole.add(float(value))
+            shards.append(accumulator.to_bytes())
+
+        merged = NumericAccumulator()
+        for data in shards:
+            merged.merge(NumericAccumulator.from_bytes(data))
+        summary = NumericSummary.from_accumulator(merged)
+
+        self.assertEqual(merged.total, whole.total)
+        self.assertEqual(summary.median, 14.5)
+        self.assertTrue(math.isclose(summary.stdev, whole.stdev))
+
+    def test_rejects_foreign_bytes(self) -> None:
+        with self.assertRaises(ValueError):
+            NumericAccumulator.from_bytes(b"x" * 64)
+
+
+class TestStreamingSummary(unittest.TestCase):
+    def test_accumulator_matches_statistics(self) -> None:
+        values = [3.5, -1.0, 8.25, 4.0, 4.0, 10.5]
+        accumulator = NumericAccumulator()
+        for value in values:
+            accumulator.add(value)
+
+        self.assertTrue(math.isclose(accumulator.mean, statistics.mean(values)))
+        self.assertTrue(math.isclose(accumulator.stdev, statistics.pstdev(values)))
+        self.assertEqual(accumulator.median, statistics.median(values))
+        self.assertEqual((accumulator.minimum, accumulator.maximum), (-1.0, 10.5))
+
+    def test_streaming_matches_list_based_summary(self) -> None:
+        rows = small_employee_dataset()
+        expected = summarise_dataset(rows)
+        actual = summarise_dataset(iter(rows), streaming=True)
+
+        self.assertEqual(set(actual), set(expected))
+        for column, summary in expected.items():
+            self.assertEqual(actual[column].count, summary.count)
+            self.assertTrue(math.isclose(actual[column].mean, summary.mean))
+            self.assertTrue(math.isclose(actual[column].stdev, summary.stdev))
+            self.assertEqual(actual[column].median, summary.median)
+
+    def test_streaming_column_validation(self) -> None:
+        rows = [dict(row, salary="n/a") for row in small_employee_dataset()]
+        with self.assertRaises(ValueError):
+            compute_numeric_summary(iter(rows), "salary", streaming=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
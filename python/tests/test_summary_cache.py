@@ -0,0 +1,75 @@
+"""Unit tests for the persistent summary cache."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from python.dataset_summary import NumericSummary
+from python.summary_cache import FileFingerprint, SummaryCache, cached_summary
+
+
+class TestSummaryCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        root = Path(self._directory.name)
+        self.path = root / "data.csv"
+        self.path.write_text("a\n1\n2\n", encoding="utf-8")
+        self.cache = SummaryCache(root / "cache")
+        self.calls = 0
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def compute(self) -> dict:
+        self.calls += 1
+        return {"a": NumericSummary(count=2, mean=1.5, median=1.5, stdev=0.5)}
+
+    def test_repeat_calls_hit_the_cache(self) -> None:
+        first = cached_summary(self.path, self.compute, cache=self.cache)
+        second = cached_summary(self.path, self.compute, cache=self.cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, 1)
+        cached_summary(self.path, self.compute, column="a", cache=self.cache)
+        self.assertEqual(self.calls, 2)
+
+    def test_changed_file_invalidates_entry(self) -> None:
+        cached_summary(self.path, self.compute, cache=self.cache)
+        self.path.write_text("a\n1\n2\n3\n", encoding="utf-8")
+        cached_summary(self.path, self.compute, cache=self.cache)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_unwritable_cache_directory_is_ignored(self) -> None:
+        blocker = Path(self._directory.name) / "file"
+        blocker.write_text("not a directory", encoding="utf-8")
+        cache = SummaryCache(blocker / "cache")
+
+        self.assertEqual(cached_summary(self.path, self.compute, cache=cache), self.compute())
+        self.assertFalse(cache.put(FileFingerprint.of(self.path), self.compute()))
+
+        with unittest.mock.patch("os.replace", side_effect=OSError(28, "No space left on device")):
+            self.assertFalse(self.cache.put(FileFingerprint.of(self.path), self.compute()))
+        self.assertEqual(list(self.cache.directory.iterdir()), [])
+
+    def test_eviction_removes_least_recently_used(self) -> None:
+        summaries = self.compute()
+        fingerprints = [FileFingerprint(f"/data/{index}.csv", 1, index) for index in range(3)]
+        for index, fingerprint in enumerate(fingerprints):
+            self.cache.put(fingerprint, summaries)
+            entry = self.cache._entry_path(fingerprint, None, "exact")
+            os.utime(entry, ns=(index * 10**9, index * 10**9))
+        entry_size = entry.stat().st_size
+
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.evict()
+        self.assertIsNone(self.cache.get(fingerprints[0]))
+        self.assertIsNotNone(self.cache.get(fingerprints[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()